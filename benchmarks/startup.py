@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Startup-time regression benchmark for cli.py.
+
+Runs a few non-interactive invocations and checks two things:
+
+  1. Import hygiene — `python -X importtime` must show that none of the
+     heavy interactive/UI packages (Rich, InquirerPy, prompt_toolkit), nor
+     NumPy, are loaded.  This is deterministic and catches most regressions on its own.
+  2. Wall-clock cold start — the fastest of N fresh interpreter launches
+     must stay under the scenario's budget.  The minimum, not the median, is
+     gated: other processes can only add to a launch's time, so the fastest
+     one is the best estimate of what the CLI itself costs, and a busy
+     machine does not turn the gate red.  The median is printed alongside.
+
+Budgets: `--help` and `--version` only parse arguments, 50 ms.  The command
+scenario also imports its command module and `dataclasses` (which imports
+`inspect`, about 10 ms on its own), loads the target, runs one round, and
+writes JSON — about 20 ms more than `--help` on the same machine — so it
+gets 80 ms.
+
+Usage:
+    python benchmarks/startup.py                  # default: 15 runs, per-scenario budgets
+    python benchmarks/startup.py --runs 30 --budget-ms 40   # one budget for every scenario
+
+Exits with status 1 if any scenario fails, so it can gate CI.  This is a
+standalone developer tool, not part of the application, so it prints plain
+text and never imports from the project.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(ROOT, "cli.py")
+
+# Each scenario is (argv passed to cli.py, budget in ms for the fastest launch).
+SCENARIOS = [
+    (["--help"], 50.0),
+    (["--version"], 50.0),
+    (["action-two", "os:getpid", "--format", "json", "--rounds", "1", "--warmup", "0", "--loops", "1",
+      "--no-history"], 80.0),
+]
+
+# Top-level packages that must never be imported by the scenarios above.
+FORBIDDEN = ("rich", "InquirerPy", "prompt_toolkit", "pygments", "numpy")
+
+
+def imported_packages(argv: list[str]) -> set[str]:
+    """Return the top-level package names imported while running *argv*."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", CLI, *argv],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+    )
+    packages = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        name = line.rsplit("|", 1)[-1].strip()
+        packages.add(name.split(".", 1)[0])
+    return packages
+
+
+def cold_start_ms(argv: list[str], runs: int) -> tuple[float, float]:
+    """Return the (fastest, median) wall-clock time of *runs* fresh launches, in ms."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, CLI, *argv],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            cwd=ROOT,
+        )
+        samples.append((time.perf_counter() - start) * 1000)
+    return min(samples), statistics.median(samples)
+
+
+def bare_interpreter_ms(runs: int) -> float:
+    """Return the median launch time of `python -c pass`, the floor for any scenario."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"])
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=15, help="Launches per scenario (default: 15)")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="Budget for the fastest launch of every scenario (default: per scenario)")
+    args = parser.parse_args()
+
+    print(f"bare interpreter: {bare_interpreter_ms(args.runs):.1f} ms (for reference)")
+
+    failed = False
+    for argv, budget in SCENARIOS:
+        if args.budget_ms is not None:
+            budget = args.budget_ms
+        label = " ".join(argv)
+        leaked = sorted(imported_packages(argv) & set(FORBIDDEN))
+        fastest, median = cold_start_ms(argv, args.runs)
+        ok = not leaked and fastest <= budget
+        failed |= not ok
+        status = "ok  " if ok else "FAIL"
+        detail = f"  imported: {', '.join(leaked)}" if leaked else ""
+        print(f"{status} {fastest:6.1f} ms (median {median:.1f}, budget {budget:.0f})  "
+              f"clisoft {label}{detail}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,192 +1,378 @@
 #!/usr/bin/env python3
 """Entry point for the CLI visual boilerplate.
 
+Subcommands are not hard-coded here: `build_parser()` and `main()` are driven
+by the `CommandSpec` list in `commands/registry.py`, which is also what the
+interactive menu is built from.
+
 How to add a new subcommand:
-  1. Create `commands/action_N.py` with `run_action_N(target, option)` and a
-     result dataclass that has `error: str | None`.
-  2. Add a new `add_parser` block in `build_parser()` below.
-  3. Add an `elif args.command == "action-N":` branch in `main()` below.
-  4. Add a matching `_flow_action_N` function in `prompts/interactive.py` and
-     register it in the `_ACTIONS` dict there.
+  1. Create `commands/action_N.py` with `run_action_N(target, option)` (a
+     plain function, or an `async def` for I/O-bound work), a result
+     dataclass that has `error: str | None`, and a `table_view(result)`
+     function returning a `TableView`.
+  2. Add a `CommandSpec` for it to `BUILTIN_COMMANDS` in `commands/registry.py`
+     — or, from another package, expose the spec through a "clisoft.commands"
+     entry point.  Nothing in this file or in `prompts/` needs to change.
 """
 
 import argparse
+import contextlib
+import os
 import sys
 
-from exceptions import CLISoftError, CommandError, PromptAbortedError
+from exceptions import CLISoftError, CommandError, MissingArgumentError, PromptAbortedError
 
 
 def build_parser() -> argparse.ArgumentParser:
     """Build and return the top-level argument parser with all subcommands."""
+    from commands.registry import iter_commands
+
     parser = argparse.ArgumentParser(
         prog="clisoft",
         description="CLI Visual Boilerplate — Rich + InquirerPy template.",
     )
     parser.add_argument("--version", action="version", version="%(prog)s 0.1.0")
+    parser.add_argument(
+        "--answers",
+        metavar="JSON|PATH",
+        help="Run the interactive menu headless, answering its prompts from a "
+             "JSON array (inline, a file, or '-' for stdin), and print a timing "
+             "report at the end",
+    )
+    parser.add_argument(
+        "--record-answers",
+        metavar="PATH",
+        help="Save the answers given in the interactive menu to PATH for --answers",
+    )
     subparsers = parser.add_subparsers(dest="command")
 
-    # ── action-one subcommand ──────────────────────────────────────────────────
-    # Rename "action-one" and update help text to reflect the real purpose.
-    action_one_parser = subparsers.add_parser(
-        "action-one",
-        help="Run a simulated tabular data flow (template for action one)",
+    # ── Options shared by every subcommand ─────────────────────────────────────
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--format",
+        choices=["table", "json", "ndjson", "csv"],
+        default="table",
+        help="Output format; anything but 'table' writes plain text to stdout "
+             "without Rich (default: table)",
     )
-    action_one_parser.add_argument(
-        "target",
-        nargs="?",
-        default="target",
-        help="Arbitrary target label passed to action one",
+    common.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always re-run the command instead of reusing a cached result",
     )
-
-    # ── action-two subcommand ──────────────────────────────────────────────────
-    # Rename "action-two" and update help text to reflect the real purpose.
-    action_two_parser = subparsers.add_parser(
-        "action-two",
-        help="Run a simulated metrics/timing flow (template for action two)",
+    common.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Do not record this run in the run history (see the history command)",
     )
-    action_two_parser.add_argument(
-        "target",
-        nargs="?",
-        default="target",
-        help="Arbitrary target label passed to action two",
+    common.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Stop the command after SECONDS, keeping any partial results; "
+             "it then runs in a supervised subprocess (default: the "
+             "command's own limit, usually none; 0 disables)",
     )
-
-    # ── action-three subcommand ────────────────────────────────────────────────
-    # Rename "action-three" and update help text to reflect the real purpose.
-    action_three_parser = subparsers.add_parser(
-        "action-three",
-        help="Run a simulated item-list flow (template for action three)",
+    common.add_argument(
+        "--isolate",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Run the command in a separate interpreter so the CLI's own "
+             "imports and allocations stay out of the numbers "
+             "(default: the command's own setting; on for action-three)",
+    )
+    batch = common.add_argument_group("batch mode")
+    batch.add_argument(
+        "--targets-file",
+        metavar="PATH",
+        help="Run the command on every target listed in PATH, one per line "
+             "('-' reads stdin); replaces the positional target",
     )
-    action_three_parser.add_argument(
-        "target",
-        nargs="?",
-        default="target",
-        help="Arbitrary target label passed to action three",
+    batch.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Targets run concurrently in batch mode "
+             "(default: usable CPUs; 32 with --executor async)",
     )
+    batch.add_argument(
+        "--executor",
+        choices=["process", "thread", "async"],
+        default="process",
+        help="Worker pool used in batch mode; 'async' overlaps async commands "
+             "on one event loop (default: process)",
+    )
+
+    # ── One subparser per registered command ───────────────────────────────────
+    for spec in iter_commands():
+        sub = subparsers.add_parser(spec.name, parents=[common], help=spec.help)
+        sub.add_argument("target", nargs="?", help=spec.target_help)
+        for argument in spec.arguments:
+            argument.add_to(sub)
 
     return parser
 
 
-def _handle_clisofterror(exc: CLISoftError) -> None:
+def _handle_clisofterror(exc: CLISoftError, plain: bool = False) -> None:
     """Print a CLISoftError message and exit with code 1.
 
     Extracted as a helper so both the `except CLISoftError` handler and the
     `except Exception` fallback funnel through the same code path without
-    requiring nested try/except blocks.
+    requiring nested try/except blocks.  With *plain* set (machine-readable
+    output formats) the message goes to stderr without loading Rich.
     """
-    from ui.output import print_error
-    print_error(exc.message)
+    _print_error(exc.message, plain)
     sys.exit(1)
 
 
+def _print_error(msg: str, plain: bool) -> None:
+    """Route an error message to Rich, or to plain stderr for machine formats."""
+    if plain:
+        from ui.formats import write_error
+        write_error(msg)
+    else:
+        from ui.output import print_error
+        print_error(msg)
+
+
+@contextlib.contextmanager
+def _progress(args: argparse.Namespace, message: str):
+    """Show the live progress dashboard for table output; yield its callback.
+
+    For machine-readable formats there is no dashboard (None is yielded);
+    instead anything the target prints is redirected to stderr so stdout
+    stays parseable.
+    """
+    if args.format != "table":
+        with contextlib.redirect_stdout(sys.stderr):
+            yield None
+        return
+    from ui.output import live_progress
+    with live_progress(message) as progress:
+        yield progress
+
+
+@contextlib.asynccontextmanager
+async def _progress_async(args: argparse.Namespace, message: str):
+    """`_progress` for async commands: the dashboard is redrawn by the event loop."""
+    if args.format != "table":
+        with contextlib.redirect_stdout(sys.stderr):
+            yield None
+        return
+    from ui.output import live_progress_async
+    async with live_progress_async(message) as progress:
+        yield progress
+
+
+def _finish(args: argparse.Namespace, result, rows_field: str) -> bool:
+    """Handle the error and machine-format paths shared by every subcommand.
+
+    Exits with code 1 when `result.error` is set.  For `--format json|ndjson|csv`
+    the result is streamed to stdout and True is returned so the caller skips
+    its Rich table; for `--format table` nothing is written and False is returned.
+    """
+    if result.error:
+        _print_error(result.error, plain=args.format != "table")
+        sys.exit(1)
+    if args.format == "table":
+        return False
+    from ui.formats import write_result
+    write_result(result, args.format, rows_field, args.command, args.target)
+    return True
+
+
+def _run_command(args: argparse.Namespace) -> None:
+    """Run the registered command named by `args.command` and render its result."""
+    from commands.registry import get_command
+
+    spec = get_command(args.command)
+    kwargs = {argument.dest: getattr(args, argument.dest) for argument in spec.arguments}
+
+    if args.targets_file is not None:
+        _run_batch(args, spec, kwargs)
+        return
+    if args.target is None:
+        raise MissingArgumentError(argument="target")
+
+    message = f"Running {spec.title} on '{args.target}'..."
+    if spec.is_async():
+        import asyncio
+        result, cache_hit = asyncio.run(_run_async(args, spec, kwargs, message))
+    else:
+        with _progress(args, message) as progress:
+            result, cache_hit = _run(args, spec, kwargs, progress)
+    if not (cache_hit or args.no_history):
+        from commands.history import record_run
+        record_run(spec, args.target, kwargs, result)
+
+    if not _finish(args, result, spec.rows_field):
+        from ui.output import print_view
+
+        view = spec.build_view(result)
+        print_view(f"{spec.title} — {args.target}", view, " (cached)" if cache_hit else "")
+
+    # A successful result can still ask for a non-zero status, e.g. a
+    # benchmark that regressed against its baseline (see ActionTwoResult).
+    exit_code = getattr(result, "exit_code", 0)
+    if exit_code:
+        sys.exit(exit_code)
+
+
+def _run(args: argparse.Namespace, spec, kwargs: dict, progress) -> tuple[object, bool]:
+    """Run *spec* on `args.target`, through the cache only when it can be used.
+
+    Returns (result, cache hit).  Skipping `commands.cache` for a
+    non-cacheable spec or `--no-cache` keeps its hashing, pickling, and
+    import scanning out of the command's startup.
+    """
+    if spec.cacheable and not args.no_cache:
+        from commands.cache import run_cached
+        return run_cached(spec, args.target, kwargs, progress=progress,
+                          timeout=args.timeout, isolate=args.isolate)
+    from commands.runner import run_command
+    return run_command(spec, args.target, kwargs, progress=progress,
+                       timeout=args.timeout, isolate=args.isolate), False
+
+
+async def _run_async(args: argparse.Namespace, spec, kwargs: dict, message: str):
+    """Run an `async def` command and its progress dashboard on one event loop."""
+    async with _progress_async(args, message) as progress:
+        if spec.cacheable and not args.no_cache:
+            from commands.cache import run_cached_async
+            return await run_cached_async(spec, args.target, kwargs, progress=progress,
+                                          timeout=args.timeout, isolate=args.isolate)
+        from commands.runner import run_command_async
+        return await run_command_async(spec, args.target, kwargs, progress=progress,
+                                       timeout=args.timeout, isolate=args.isolate), False
+
+
+def _run_batch(args: argparse.Namespace, spec, kwargs: dict) -> None:
+    """Run *spec* over every target in `--targets-file`, rendering results as they finish.
+
+    Table mode shows a progress bar with each target's table printed above it;
+    machine formats stream one result per target to stdout (CSV writes its
+    header once, and NDJSON/CSV rows carry a "target" field).  A failing
+    target is reported and skipped; the exit code is 1 if any target failed,
+    otherwise the highest `exit_code` any result asked for.
+    """
+    from commands.batch import read_targets, run_batch
+
+    targets = read_targets(args.targets_file)
+    if args.targets_file != "-":
+        targets = list(targets)  # a known total gives the progress bar an ETA
+    plain = args.format != "table"
+    items = run_batch(
+        spec, targets, kwargs,
+        jobs=args.jobs,
+        executor=args.executor,
+        use_cache=not args.no_cache,
+        quiet=plain,
+        timeout=args.timeout,
+        isolate=args.isolate,
+    )
+    if not args.no_history:
+        items = _recorded(items, spec, kwargs)
+
+    failed = 0
+    exit_code = 0
+    if plain:
+        from ui.formats import write_result
+
+        # Thread workers share sys.stdout with us, so swap it for stderr while
+        # the batch runs and write results to the real stdout explicitly.
+        out = sys.stdout
+        first = True
+        with contextlib.redirect_stdout(sys.stderr):
+            for item in items:
+                if item.error:
+                    failed += 1
+                    _print_error(f"{item.target}: {item.error}", plain=True)
+                    continue
+                write_result(item.result, args.format, spec.rows_field, args.command,
+                             item.target, stream=out, header=first, tag_rows=True)
+                out.flush()
+                first = False
+                exit_code = max(exit_code, getattr(item.result, "exit_code", 0))
+    else:
+        from ui.output import print_error, print_view, progress_bar
+
+        total = len(targets) if isinstance(targets, list) else None
+        with progress_bar(f"Running {spec.title}", total=total) as advance:
+            for item in items:
+                advance()
+                if item.error:
+                    failed += 1
+                    print_error(f"{item.target}: {item.error}")
+                    continue
+                view = spec.build_view(item.result)
+                print_view(f"{spec.title} — {item.target}", view,
+                           " (cached)" if item.cache_hit else "", pager=False)
+                exit_code = max(exit_code, getattr(item.result, "exit_code", 0))
+
+    if failed:
+        _print_error(f"{failed} target(s) failed", plain)
+        sys.exit(1)
+    if exit_code:
+        sys.exit(exit_code)
+
+
+def _recorded(items, spec, kwargs: dict):
+    """Pass batch *items* through, recording each fresh result in the run history.
+
+    Results are buffered and written in batched transactions; the rest is
+    flushed when the batch ends or is interrupted (the generator closes).
+    """
+    from commands.history import HistoryWriter
+
+    with HistoryWriter() as history:
+        for item in items:
+            if not item.cache_hit and item.result is not None:
+                history.add(spec, item.target, kwargs, item.result)
+            yield item
+
+
 def main() -> None:
     """Parse arguments and dispatch to the appropriate command or interactive mode."""
     parser = build_parser()
     args = parser.parse_args()
+    plain = getattr(args, "format", "table") != "table"
+    if args.command is not None and (args.answers or args.record_answers):
+        parser.error("--answers and --record-answers only apply to the interactive menu")
 
     try:
-        if args.command == "action-one":
-            from commands.action_one import run_action_one
-            from ui.output import print_error, print_success, print_table, spinner
-
-            with spinner(f"Running Action One on '{args.target}'..."):
-                result = run_action_one(args.target)
-
-            if result.error:
-                print_error(result.error)
-                sys.exit(1)
-
-            # Customize: update column headers and row mapping to match your dataclass fields.
-            print_table(
-                f"Action One — {args.target}",
-                [
-                    ("Calls",    "bold cyan"),
-                    ("TotTime",  "white"),
-                    ("CumTime",  "white"),
-                    ("PerCall",  "dim"),
-                    ("Filename", "dim"),
-                ],
-                [
-                    [r["label"], r["value_a"], r["value_b"], r["value_c"], r["identifier"]]
-                    for r in result.rows
-                ],
-            )
-            print_success(f"Done — {result.total_count:,} calls, {result.total_time:.4f}s total")
-
-        elif args.command == "action-two":
-            from commands.action_two import run_action_two
-            from ui.output import print_error, print_success, print_table, spinner
-
-            with spinner(f"Running Action Two on '{args.target}'..."):
-                result = run_action_two(args.target)
-
-            if result.error:
-                print_error(result.error)
-                sys.exit(1)
-
-            # Customize: update metric labels and value formatting to match your dataclass fields.
-            print_table(
-                f"Action Two — {args.target}",
-                [
-                    ("Metric", "bold cyan"),
-                    ("Value",  "white"),
-                ],
-                [
-                    ["Iterations", str(result.iterations)],
-                    ["Total",      f"{result.total_value:.4f}"],
-                    ["Average",    f"{result.avg_value:.6f}"],
-                    ["Min",        f"{result.min_value:.4f}"],
-                    ["Max",        f"{result.max_value:.4f}"],
-                ],
-            )
-            print_success(f"Done — {result.iterations} iterations on '{args.target}'")
-
-        elif args.command == "action-three":
-            from commands.action_three import run_action_three
-            from ui.output import print_error, print_success, print_table, spinner
-
-            with spinner(f"Running Action Three on '{args.target}'..."):
-                result = run_action_three(args.target)
-
-            if result.error:
-                print_error(result.error)
-                sys.exit(1)
-
-            # Customize: update column headers and item field access to match your dataclass fields.
-            print_table(
-                f"Action Three — {args.target}",
-                [
-                    ("Source",    "bold cyan"),
-                    ("Line",      "white"),
-                    ("Size (KB)", "white"),
-                    ("Count",     "dim"),
-                ],
-                [
-                    [item.source, str(item.position), f"{item.size_kb:.2f}", str(item.count)]
-                    for item in result.items
-                ],
-            )
-            print_success(
-                f"Done — peak {result.peak_value:.2f} KB, current {result.current_value:.2f} KB"
-            )
-
+        if args.command is not None:
+            _run_command(args)
         else:
             # No subcommand provided — fall through to interactive mode.
             from prompts.interactive import start_interactive
-            start_interactive()
+            answers = None
+            if args.answers is not None:
+                from prompts.answers import load_answers
+                answers = load_answers(args.answers)
+            start_interactive(answers=answers, record=args.record_answers)
 
     except PromptAbortedError:
         from ui.output import print_warn
         print_warn("Action cancelled.")
         sys.exit(0)
     except CommandError as exc:
-        _handle_clisofterror(exc)
+        _handle_clisofterror(exc, plain)
     except CLISoftError as exc:
-        _handle_clisofterror(exc)
+        _handle_clisofterror(exc, plain)
     except KeyboardInterrupt:
-        from ui.output import console
-        console.print("\n[dim]Interrupted. Goodbye![/dim]")
+        if plain:
+            sys.stderr.write("Interrupted.\n")
+        else:
+            from ui.output import get_console
+            get_console().print("\n[dim]Interrupted. Goodbye![/dim]")
         sys.exit(0)
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head -1`).  Point stdout at /dev/null
+        # so the interpreter's final flush cannot fail again, as Rich does.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
     except Exception as exc:
         # Wrap any unhandled exception as a CLISoftError and route it through
         # the unified handler.  `raise ... from exc` is NOT used here because
@@ -198,7 +384,7 @@ def main() -> None:
             layer="cli",
         )
         wrapped.__cause__ = exc
-        _handle_clisofterror(wrapped)
+        _handle_clisofterror(wrapped, plain)
 
 
 if __name__ == "__main__":
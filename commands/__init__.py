@@ -7,9 +7,38 @@ modules are renamed when adapting the boilerplate.
     from commands import run_action_one, ActionOneResult
 """
 
-from commands.action_one import run_action_one, ActionOneResult
-from commands.action_two import run_action_two, ActionTwoResult
-from commands.action_three import run_action_three, ActionThreeItem, ActionThreeResult
+# Submodules are imported on first attribute access (PEP 562) rather than
+# here, so `from commands.action_two import ...` does not also pay for the
+# cProfile / tracemalloc imports of the other actions.
+_EXPORTS = {
+    "run_action_one":    "commands.action_one",
+    "ActionOneResult":   "commands.action_one",
+    "run_action_two":    "commands.action_two",
+    "ActionTwoResult":   "commands.action_two",
+    "run_action_three":  "commands.action_three",
+    "ActionThreeItem":   "commands.action_three",
+    "ActionThreeResult": "commands.action_three",
+    "run_history":       "commands.history",
+    "HistoryResult":     "commands.history",
+    "Argument":          "commands.registry",
+    "CommandSpec":       "commands.registry",
+    "TableView":         "commands.registry",
+    "get_command":       "commands.registry",
+    "iter_commands":     "commands.registry",
+    "ProgressUpdate":    "commands.progress",
+}
+
+
+def __getattr__(name: str):
+    """Import the submodule that defines *name* on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'commands' has no attribute '{name}'")
+    import importlib
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # cache so the next access skips __getattr__
+    return value
+
 
 __all__ = [
     "run_action_one",
@@ -19,4 +48,12 @@ __all__ = [
     "run_action_three",
     "ActionThreeItem",
     "ActionThreeResult",
+    "run_history",
+    "HistoryResult",
+    "Argument",
+    "CommandSpec",
+    "TableView",
+    "get_command",
+    "iter_commands",
+    "ProgressUpdate",
 ]
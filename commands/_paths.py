@@ -0,0 +1,60 @@
+"""Filesystem locations used by the command layer.
+
+Disposable data (result cache, plugin manifest) lives under one cache
+directory:
+
+    $CLISOFT_CACHE_DIR              if set
+    $XDG_CACHE_HOME/clisoft         if XDG_CACHE_HOME is set
+    ~/.cache/clisoft                otherwise
+
+Per-user data that must outlive the cache and not depend on the working
+directory (the run history) lives under one data directory:
+
+    $CLISOFT_DATA_DIR               if set
+    $XDG_DATA_HOME/clisoft          if XDG_DATA_HOME is set
+    ~/.local/share/clisoft          otherwise
+
+Data worth keeping with a project (benchmark baselines) lives in a results
+directory relative to the working directory, so CI jobs and teammates can
+share it:
+
+    $CLISOFT_RESULTS_DIR            if set
+    ./.clisoft                      otherwise
+
+Directories are created on demand by `cache_dir()`, `data_dir()`, and
+`results_dir()`.
+"""
+
+from __future__ import annotations
+
+import os
+
+
+def cache_dir(*parts: str) -> str:
+    """Return (and create) the cache directory, or a subdirectory of it."""
+    root = os.environ.get("CLISOFT_CACHE_DIR")
+    if not root:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        root = os.path.join(base, "clisoft")
+    path = os.path.join(root, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def data_dir(*parts: str) -> str:
+    """Return (and create) the per-user data directory, or a subdirectory of it."""
+    root = os.environ.get("CLISOFT_DATA_DIR")
+    if not root:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+        root = os.path.join(base, "clisoft")
+    path = os.path.join(root, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def results_dir(*parts: str) -> str:
+    """Return (and create) the project-local results directory, or a subdirectory of it."""
+    root = os.environ.get("CLISOFT_RESULTS_DIR") or ".clisoft"
+    path = os.path.join(root, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,259 @@
+"""Summary statistics, significance tests, and duration formatting.
+
+Pure functions over plain sequences of floats — no I/O, no UI.  Percentiles
+use linear interpolation between closest ranks (the same definition as
+`statistics.quantiles(method="inclusive")` and NumPy's default), so numbers
+match what users get from other tools.
+
+Sample sets are usually `array('d')` buffers (8 bytes per sample).  Above
+`NUMPY_MIN_SAMPLES` samples, and when NumPy is installed, `summarize`,
+`median` and `mann_whitney_u` view such a buffer without copying and do
+their work in vectorized passes — 10 million samples summarize in well
+under a second.  Smaller sets, or any set without NumPy, go through the
+pure-Python path (one sort, then O(1) lookups): importing NumPy alone costs
+more than sorting a thousand samples, and a short benchmark should not pay
+for it.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Sequence
+
+
+# Tukey's fences: samples further than this many IQRs outside Q1/Q3 are
+# treated as outliers (scheduler hiccups, page faults, GC in other threads).
+OUTLIER_IQR_FACTOR = 1.5
+
+# Sample sets at most this long never import NumPy (as `ui/output._log_buckets`).
+NUMPY_MIN_SAMPLES = 1024
+
+
+@dataclass
+class Summary:
+    """Descriptive statistics for one sample set.
+
+    Fields:
+        count:    Number of samples kept after outlier rejection.
+        total:    Sum of the kept samples.
+        mean:     Arithmetic mean of the kept samples.
+        minimum:  Smallest kept sample.
+        maximum:  Largest kept sample.
+        median:   50th percentile of the kept samples.
+        stddev:   Sample standard deviation (n - 1) of the kept samples.
+        iqr:      Interquartile range (Q3 - Q1) of the kept samples.
+        p50:      50th percentile (same as median, kept for table symmetry).
+        p95:      95th percentile.
+        p99:      99th percentile.
+        p999:     99.9th percentile.
+        outliers: Number of samples rejected by Tukey's fences.
+    """
+
+    count: int = 0
+    total: float = 0.0
+    mean: float = 0.0
+    minimum: float = 0.0
+    maximum: float = 0.0
+    median: float = 0.0
+    stddev: float = 0.0
+    iqr: float = 0.0
+    p50: float = 0.0
+    p95: float = 0.0
+    p99: float = 0.0
+    p999: float = 0.0
+    outliers: int = 0
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Return the *q*-th percentile (0–100) of an already sorted sequence."""
+    n = len(sorted_values)
+    if n == 0:
+        return 0.0
+    pos = (n - 1) * q / 100.0
+    lo = math.floor(pos)
+    hi = min(lo + 1, n - 1)
+    frac = pos - lo
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * frac
+
+
+def summarize(values: Sequence[float], reject_outliers: bool = True) -> Summary:
+    """Compute a `Summary` of *values*, optionally dropping Tukey outliers first.
+
+    Vectorized with NumPy for large sets when it is installed; otherwise
+    sorts once, and every order statistic is then an O(1) lookup.
+    """
+    if not len(values):
+        return Summary()
+    np = _numpy(len(values))
+    if np is not None:
+        return _summarize_numpy(np, _as_ndarray(np, values), reject_outliers)
+    ordered = sorted(values)
+    outliers = 0
+    if reject_outliers and len(ordered) >= 4:
+        q1 = percentile(ordered, 25)
+        q3 = percentile(ordered, 75)
+        fence = (q3 - q1) * OUTLIER_IQR_FACTOR
+        # Sorted, so the kept samples are one contiguous slice.
+        lo = bisect_left(ordered, q1 - fence)
+        hi = bisect_right(ordered, q3 + fence)
+        outliers = len(ordered) - (hi - lo)
+        ordered = ordered[lo:hi]
+
+    n = len(ordered)
+    total = math.fsum(ordered)
+    mean = total / n
+    stddev = math.sqrt(math.fsum((v - mean) ** 2 for v in ordered) / (n - 1)) if n > 1 else 0.0
+    median = percentile(ordered, 50)
+    return Summary(
+        count=n,
+        total=total,
+        mean=mean,
+        minimum=ordered[0],
+        maximum=ordered[-1],
+        median=median,
+        stddev=stddev,
+        iqr=percentile(ordered, 75) - percentile(ordered, 25),
+        p50=median,
+        p95=percentile(ordered, 95),
+        p99=percentile(ordered, 99),
+        p999=percentile(ordered, 99.9),
+        outliers=outliers,
+    )
+
+
+def median(values: Sequence[float]) -> float:
+    """Return the median of *values* (unsorted), vectorized for large sets when NumPy is available."""
+    if not len(values):
+        return 0.0
+    np = _numpy(len(values))
+    if np is not None:
+        return float(np.median(_as_ndarray(np, values)))
+    return percentile(sorted(values), 50)
+
+
+def _summarize_numpy(np, a, reject_outliers: bool) -> Summary:
+    """NumPy implementation of `summarize` over a float64 ndarray *a*.
+
+    Percentiles go through `np.percentile`, which partitions instead of
+    sorting (O(n)) and uses the same linear interpolation as `percentile`.
+    """
+    outliers = 0
+    if reject_outliers and a.size >= 4:
+        q1, q3 = np.percentile(a, [25, 75])
+        fence = (q3 - q1) * OUTLIER_IQR_FACTOR
+        kept = a[(a >= q1 - fence) & (a <= q3 + fence)]
+        outliers = int(a.size - kept.size)
+        a = kept
+    n = int(a.size)
+    p25, p50, p75, p95, p99, p999 = (
+        float(v) for v in np.percentile(a, [25, 50, 75, 95, 99, 99.9])
+    )
+    total = float(a.sum())
+    return Summary(
+        count=n,
+        total=total,
+        mean=total / n,
+        minimum=float(a.min()),
+        maximum=float(a.max()),
+        median=p50,
+        stddev=float(a.std(ddof=1)) if n > 1 else 0.0,
+        iqr=p75 - p25,
+        p50=p50,
+        p95=p95,
+        p99=p99,
+        p999=p999,
+        outliers=outliers,
+    )
+
+
+def mann_whitney_u(sample: Sequence[float], reference: Sequence[float]) -> tuple[float, float]:
+    """One-sided Mann–Whitney U test: does *sample* tend to be larger than *reference*?
+
+    Rank-based, so it needs no normality assumption and is insensitive to
+    the long right tail timing samples usually have.  Uses the normal
+    approximation with tie and continuity corrections (accurate from ~8
+    samples per side).
+
+    Returns:
+        (U statistic of *sample*, one-sided p-value).  A small p-value means
+        *sample* is significantly larger (slower, for timings).
+    """
+    n1, n2 = len(sample), len(reference)
+    if n1 == 0 or n2 == 0:
+        return 0.0, 1.0
+    n = n1 + n2
+    np = _numpy(n)
+    if np is not None:
+        combined = np.concatenate([_as_ndarray(np, sample), _as_ndarray(np, reference)])
+        _, inverse, counts = np.unique(combined, return_inverse=True, return_counts=True)
+        avg_ranks = np.cumsum(counts) - (counts - 1) / 2.0  # 1-based, ties averaged
+        rank_sum = float(avg_ranks[inverse[:n1]].sum())
+        counts = counts.astype(np.float64)
+        tie_term = float((counts ** 3 - counts).sum())
+    else:
+        combined = sorted([(v, 0) for v in sample] + [(v, 1) for v in reference])
+        rank_sum = 0.0
+        tie_term = 0.0
+        i = 0
+        while i < n:
+            j = i
+            while j + 1 < n and combined[j + 1][0] == combined[i][0]:
+                j += 1
+            ties = j - i + 1
+            avg_rank = (i + j) / 2.0 + 1.0
+            rank_sum += avg_rank * sum(1 for k in range(i, j + 1) if combined[k][1] == 0)
+            tie_term += ties ** 3 - ties
+            i = j + 1
+    u = rank_sum - n1 * (n1 + 1) / 2.0
+    mean = n1 * n2 / 2.0
+    variance = n1 * n2 / 12.0 * ((n + 1) - tie_term / (n * (n - 1))) if n > 1 else 0.0
+    if variance <= 0:
+        return u, 1.0 if u <= mean else 0.0
+    z = (u - mean - 0.5) / math.sqrt(variance)
+    return u, 0.5 * math.erfc(z / math.sqrt(2.0))
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration in seconds using the largest unit that keeps it >= 1.
+
+    Example: 0.000000123 -> "123.0 ns", 0.0421 -> "42.10 ms".
+    """
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("µs", 1e-6)):
+        if abs(seconds) >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds * 1e9:.1f} ns"
+
+
+# ── Optional NumPy backend ────────────────────────────────────────────────────
+
+_np_module = None
+_np_checked = False
+
+
+def _numpy(size: int):
+    """Return the numpy module for a set of *size* samples, or None to stay in pure Python.
+
+    None below `NUMPY_MIN_SAMPLES`, without importing anything, and when
+    NumPy is not installed (checked once).
+    """
+    global _np_module, _np_checked
+    if size <= NUMPY_MIN_SAMPLES:
+        return None
+    if not _np_checked:
+        _np_checked = True
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _np_module = numpy
+    return _np_module
+
+
+def _as_ndarray(np, values: Sequence[float]):
+    """View *values* as a float64 ndarray — zero-copy for `array('d')` buffers."""
+    if isinstance(values, array) and values.typecode == "d":
+        return np.frombuffer(values, dtype=np.float64)
+    return np.asarray(values, dtype=np.float64)
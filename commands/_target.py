@@ -0,0 +1,220 @@
+"""Target resolution shared by the command modules.
+
+A *target* is the string the user passes on the command line.  Three shapes
+are accepted:
+
+    path/to/script.py     executed as __main__ (like `python script.py`)
+    package.module        executed as __main__ (like `python -m package.module`)
+    package.module:func   imported, then `func()` is called with no arguments
+
+`load_target` resolves the string once and returns a zero-argument callable,
+so commands that run the target repeatedly (benchmarks) only pay the import
+cost on the first call.
+
+Errors are raised, not returned — the calling `run_action_*` function wraps
+them into its result dataclass.
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import os
+import re
+import runpy
+import sys
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+# Local modules followed by `target_files`, at most.
+MAX_TARGET_FILES = 1000
+
+# `import a.b, c as d` and `from .a import (b, c)`; a line-based scan is
+# ~25x faster than `ast.parse`, and a false hit in a string only costs a
+# few stat calls.
+_IMPORT_RE = re.compile(
+    r"^[ \t]*(?:from[ \t]+(\.*[\w.]*)[ \t]+import[ \t]*(\([^)]*\)|[^#\n]*)|import[ \t]+([^#\n]*))",
+    re.MULTILINE,
+)
+
+
+def load_target(target: str) -> Callable[[], object]:
+    """Resolve *target* into a zero-argument callable.
+
+    Raises:
+        FileNotFoundError: A `.py` path was given but does not exist.
+        ImportError:       The module (or the module part of `mod:func`) is missing.
+        AttributeError:    `mod:func` names an attribute the module lacks.
+        TypeError:         `mod:func` names something that is not callable.
+    """
+    if os.path.isfile(target) or target.endswith(".py"):
+        path = os.path.abspath(target)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"No such script: '{target}'")
+        return lambda: _run_as_main(path, runpy.run_path, path, run_name="__main__")
+
+    if ":" in target:
+        module_name, _, attr = target.partition(":")
+        module = importlib.import_module(module_name)
+        func = module
+        for part in attr.split("."):
+            func = getattr(func, part)
+        if not callable(func):
+            raise TypeError(f"'{target}' is not callable")
+        return func
+
+    if importlib.util.find_spec(target) is None:
+        raise ImportError(f"No module named '{target}'")
+    return lambda: _run_as_main(target, runpy.run_module, target, run_name="__main__", alter_sys=True)
+
+
+def target_files(target: str) -> list[str]:
+    """Return the source files that define *target*, for cache fingerprinting.
+
+    A script yields its own path; a module (or the module part of
+    `module:func`) yields its origin file, or every `.py` file below it when
+    it is a package.  Then every local module those files import, directly
+    or not, is added (see `_local_imports`), so editing a helper next to the
+    script changes the fingerprint too.  Unresolvable targets yield an
+    empty list rather than raising.
+    """
+    if os.path.isfile(target):
+        path = os.path.abspath(target)
+        return _local_imports([path], [os.path.dirname(path)])
+    module_name = target.partition(":")[0]
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return []
+    if spec is None or not spec.origin or not os.path.isfile(spec.origin):
+        return []
+    if not spec.submodule_search_locations:
+        return _local_imports([spec.origin], [])
+    files = []
+    for root in spec.submodule_search_locations:
+        for dirpath, _dirnames, filenames in os.walk(root):
+            files.extend(os.path.join(dirpath, f) for f in filenames if f.endswith(".py"))
+    return _local_imports(sorted(files), [])
+
+
+def _local_imports(files: list[str], roots: list[str]) -> list[str]:
+    """*files* plus the local modules they import, transitively, sorted.
+
+    Imports are resolved by path, without importing anything, against
+    *roots* followed by the `sys.path` directories outside the standard
+    library and site-packages — the modules a user edits.  Relative imports
+    resolve against the importing file's package.  Stops after
+    `MAX_TARGET_FILES` files.
+    """
+    import sysconfig
+
+    paths = sysconfig.get_paths()
+    installed = tuple(
+        os.path.normpath(paths[key]) + os.sep
+        for key in ("stdlib", "platstdlib", "purelib", "platlib")
+    )
+    roots = [
+        root for root in dict.fromkeys(
+            os.path.abspath(entry or ".") for entry in (*roots, *sys.path)
+        )
+        if os.path.isdir(root) and not (root + os.sep).startswith(installed)
+    ]
+    seen = dict.fromkeys(files)
+    todo = list(files)
+    while todo and len(seen) < MAX_TARGET_FILES:
+        path = todo.pop()
+        try:
+            with open(path, encoding="utf-8", errors="replace") as fh:
+                source = fh.read()
+        except OSError:
+            continue
+        for found in _imported_files(path, source, roots):
+            if found not in seen and not found.startswith(installed):
+                seen[found] = None
+                todo.append(found)
+    return sorted(seen)
+
+
+def _imported_files(path: str, source: str, roots: list[str]) -> Iterator[str]:
+    """Files of the modules *source* (the text of *path*) imports, where they resolve."""
+    for match in _IMPORT_RE.finditer(source):
+        base, names, modules = match.groups()
+        if modules is not None:
+            for name in modules.replace("\\", " ").split(","):
+                words = name.split()  # "a.b as c" -> "a.b"
+                if words:
+                    yield from _module_files(words[0], roots)
+            continue
+        dots = len(base) - len(base.lstrip("."))
+        module = base[dots:]
+        if dots:
+            package = os.path.dirname(os.path.abspath(path))
+            for _ in range(dots - 1):
+                package = os.path.dirname(package)
+            search = [package]
+        else:
+            search = roots
+        if module:
+            yield from _module_files(module, search)
+        for name in names.strip().strip("()").replace("\\", " ").split(","):
+            words = name.split()  # a name may be a submodule: `from pkg import mod`
+            if words and words[0] != "*":
+                yield from _module_files(f"{module}.{words[0]}" if module else words[0], search)
+
+
+def _module_files(name: str, roots: list[str]) -> list[str]:
+    """The `__init__.py` of each package in dotted *name* and the module's own file.
+
+    The first root holding the top-level name wins, as on `sys.path`; a
+    name that does not resolve (a class, or a module not under *roots*)
+    yields what was found before it.
+    """
+    parts = name.split(".")
+    for root in roots:
+        top = os.path.join(root, parts[0])
+        if not (os.path.isdir(top) or os.path.isfile(top + ".py")):
+            continue
+        files = []
+        path = root
+        for part in parts:
+            path = os.path.join(path, part)
+            init = os.path.join(path, "__init__.py")
+            if os.path.isfile(init):
+                files.append(init)
+            elif os.path.isfile(path + ".py"):
+                files.append(path + ".py")
+                break
+            elif not os.path.isdir(path):
+                break
+        return files
+    return []
+
+
+def _run_as_main(argv0: str, runner: Callable, *args, **kwargs) -> None:
+    """Call *runner* with `sys.argv` / `sys.path` set up like the interpreter would.
+
+    `SystemExit(0)` / `SystemExit(None)` are treated as a normal return so
+    scripts that end with `sys.exit(main())` can be profiled; any other exit
+    status becomes a RuntimeError.
+    """
+    with _main_context(argv0):
+        try:
+            runner(*args, **kwargs)
+        except SystemExit as exc:
+            if exc.code not in (0, None):
+                raise RuntimeError(f"target exited with status {exc.code}") from exc
+
+
+@contextmanager
+def _main_context(argv0: str) -> Iterator[None]:
+    """Temporarily replace `sys.argv` and prepend the script directory to `sys.path`."""
+    saved_argv = sys.argv[:]
+    saved_path = sys.path[:]
+    sys.argv = [argv0]
+    if os.path.isfile(argv0):
+        sys.path.insert(0, os.path.dirname(argv0))
+    try:
+        yield
+    finally:
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
@@ -1,13 +1,33 @@
-"""Template action one — simulated tabular data with row items and summary scalars.
+"""Action one — CPU profiler with a deterministic and a sampling engine.
 
-This module is intentionally generic. To adapt it to a real project:
+Runs *target* (a script path, a module name, or a `module:function` spec —
+see `commands/_target.py`) and reports the top-N functions.  Two modes:
 
-  1. Rename `ActionOneResult` and `run_action_one` to something meaningful
-     (e.g. `ScanResult` / `run_scan`).
-  2. Replace the TODO block below with your actual logic.
-  3. Update the dataclass fields to match what your logic produces.
-  4. Remove the `time.sleep(1.5)` line once real I/O provides natural delay.
-  5. Mirror any field renames in `prompts/interactive.py` and `cli.py`.
+  cprofile  `cProfile.Profile` traces every call and return.  Exact call
+            counts, but the tracing overhead (often 2-5x on call-heavy code)
+            skews the timings of hot paths.
+  sample    A background thread reads the target's stack with
+            `sys._current_frames()` `rate` times per second.  No call counts,
+            but the target runs at nearly full speed: a sample costs one
+            stack walk, so the default 100 Hz stays far below a 5% overhead
+            (raise `rate` for short targets, at a proportional cost).  Samples
+            are folded into the same row shape — cumulative and self sample
+            counts per function, converted to seconds by the mean sampling
+            interval.
+
+Under a timeout (see `commands/supervisor.py`) the target is interrupted
+at the deadline and the profile gathered up to that point is ranked and
+exported as usual, with `timed_out` set.
+
+Either mode can also `export` the full call tree — collapsed stacks,
+speedscope JSON, or a flame graph SVG (see `commands/flamegraph.py`) — to
+`output_file`.
+
+Post-processing reads `Profile.getstats()` directly instead of building a
+`pstats.Stats` object: every entry is streamed through a generator into
+`heapq.nlargest`, so only `option` rows are ever materialized and the cost is
+O(n log option) rather than a full sort plus the callers dictionaries pstats
+builds.  Profiles with 100k+ functions post-process in milliseconds.
 
 Return contract (never break this):
   - Always return an `ActionOneResult` instance.
@@ -15,25 +35,46 @@ Return contract (never break this):
   - Never print or raise inside this function — the caller handles UI.
 """
 
-import random
+import cProfile
+import heapq
+import os
+import re
+import sys
+import threading
 import time
+from collections import Counter
 from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Callable, Iterator
+
+from commands import _target, supervisor
+from commands._target import load_target
+from commands.flamegraph import EXPORT_FORMATS, SUFFIXES, write_export
+from commands.progress import ProgressCallback, report
+from commands.registry import TableView
+from commands.supervisor import EXIT_TIMEOUT, call_until_timeout
+from exceptions import CommandExecutionError, CommandTimeoutError
+
+
+# Maps the user-facing sort name to the index of the matching value in the
+# (calls, prim_calls, tottime, cumtime, identifier) tuples built below.
+# Mirrors the pstats sort keys of the same name.
+# In sample mode the tuples are (samples, self_samples, self_s, cum_s,
+# identifier), so "calls" ranks by cumulative sample count.
+SORT_KEYS = {
+    "cumulative": 3,
+    "tottime":    2,
+    "calls":      0,
+}
 
+MODES = ("cprofile", "sample")
 
-# Placeholder row labels used to fill the simulated table.
-# Replace with real identifiers (file paths, function names, endpoint names, etc.)
-_PLACEHOLDER_ITEMS = [
-    "module/core.py:42(process_request)",
-    "module/db.py:118(fetch_records)",
-    "module/utils.py:77(serialize)",
-    "module/cache.py:31(lookup)",
-    "module/pipeline.py:204(transform)",
-    "lib/parser.py:88(parse_tokens)",
-    "lib/encoder.py:55(encode_utf8)",
-    "{built-in method builtins.exec}",
-    "{method 'acquire' of '_thread.lock' objects}",
-    "{built-in method posix.read}",
-]
+# Sample mode reports progress once per this many samples.
+_REPORT_EVERY = 100
+
+# Frames from these files wrap the target (the script/module launcher and
+# the timeout guard) and are hidden from every report.
+_LAUNCHER_FILES = frozenset({_target.__file__, supervisor.__file__, "<frozen runpy>"})
 
 
 @dataclass
@@ -41,11 +82,21 @@ class ActionOneResult:
     """Result returned by `run_action_one`.
 
     Fields:
-        rows:        List of dicts, one per table row.
-                     Keys: label, value_a, value_b, value_c, identifier.
-        total_count: Integer summary scalar (e.g. total calls, total records).
-        total_time:  Float summary scalar (e.g. elapsed seconds).
+        rows:        List of dicts, one per profiled function (top-N only).
+                     Keys: label (calls, "total/primitive" when recursive;
+                     cumulative samples in sample mode), value_a (tottime),
+                     value_b (cumtime), value_c (cumtime per primitive call;
+                     share of all samples in sample mode), identifier
+                     ("file:line(function)").
+        total_count: Total function calls recorded by the profiler (samples
+                     taken in sample mode).
+        total_time:  Sum of the internal time of every profiled function (s);
+                     wall time of the target in sample mode.
         output_file: Optional path if the action writes a file; otherwise None.
+        mode:        The engine that produced this result.
+        timed_out:   True if the target was stopped by a timeout; the
+                     profile covers only the time before it.
+        exit_code:   `EXIT_TIMEOUT` for a timed-out result, else 0.
         error:       Non-None string if the action failed; None on success.
     """
 
@@ -53,84 +104,352 @@ class ActionOneResult:
     total_count: int = 0
     total_time: float = 0.0
     output_file: str | None = None
+    mode: str = "cprofile"
+    timed_out: bool = False
+    exit_code: int = 0
     error: str | None = None
 
 
-def run_action_one(target: str, option: int = 10) -> ActionOneResult:
-    """Execute action one against *target* and return the result.
+def run_action_one(
+    target: str,
+    option: int = 10,
+    sort: str = "cumulative",
+    mode: str = "cprofile",
+    rate: float = 100.0,
+    export: str | None = None,
+    output: str | None = None,
+    progress: ProgressCallback | None = None,
+) -> ActionOneResult:
+    """Profile *target* and return the top *option* functions.
 
     Args:
-        target: Arbitrary string label that identifies what to act on.
-                In a real implementation this might be a file path, URL,
-                module name, etc.
-        option: Integer tuning parameter (e.g. max rows to return).
+        target:   Script path, module name, or `module:function` to profile.
+        option:   Maximum number of rows to return.
+        sort:     Ranking key — one of `SORT_KEYS` ("cumulative", "tottime", "calls").
+        mode:     "cprofile" or "sample" (see module docstring).
+        rate:     Samples per second in sample mode.
+        export:   Also write the full call tree in this format — one of
+                  `commands.flamegraph.EXPORT_FORMATS` — and set `output_file`.
+        output:   Path of the export; defaults to the target's name plus a
+                  format-specific suffix, in the current directory.
+        progress: Optional `commands.progress` callback; told when profiling
+                  starts and when ranking starts, and of the running sample
+                  count in sample mode.
 
     Returns:
         ActionOneResult populated with either data or an error message.
     """
-    # Simulate work so the spinner is visible during the demo.
-    # Remove or replace this line with real I/O / computation.
-    time.sleep(1.5)
-
-    # ── TODO: replace this block with real logic ──────────────────────────────
-    # Example shape of real logic:
-    #
-    #   from exceptions import CommandExecutionError
-    #   try:
-    #       data = your_library.run(target, limit=option)
-    #   except Exception as exc_raw:
-    #       e = CommandExecutionError(
-    #           str(exc_raw), command_name="action-one", original=exc_raw
-    #       )
-    #       return ActionOneResult(error=e.message)
-    #
-    # Alternatively, use the plain string form if you prefer not to raise:
-    #
-    #   except YourError as exc:
-    #       return ActionOneResult(error=str(exc))
-    #
-    #   rows = [
-    #       {
-    #           "label":      item.name,
-    #           "value_a":    str(item.calls),
-    #           "value_b":    f"{item.time:.4f}",
-    #           "value_c":    f"{item.cumtime:.4f}",
-    #           "identifier": item.location,
-    #       }
-    #       for item in data.items
-    #   ]
-    #   return ActionOneResult(
-    #       rows=rows,
-    #       total_count=data.total_calls,
-    #       total_time=data.elapsed,
-    #       error=None,
-    #   )
-    #
-    # Until then, random values keep the visual demo functional:
-
-    total_count = random.randint(8_000, 120_000)
-    total_time = round(random.uniform(0.4, 3.2), 4)
-
-    sample = random.sample(_PLACEHOLDER_ITEMS, k=min(option, len(_PLACEHOLDER_ITEMS)))
-    rows = []
-    for item in sample:
-        value_a = random.randint(1, 5_000)
-        value_b = round(random.uniform(0.001, 0.4), 4)
-        value_c = round(value_b + random.uniform(0.0, 0.3), 4)
-        value_ratio = round(value_c / value_a, 6)
-        rows.append({
-            "label":      str(value_a),
-            "value_a":    f"{value_b:.4f}",
-            "value_b":    f"{value_c:.4f}",
-            "value_c":    f"{value_ratio:.6f}",
-            "identifier": item,
-        })
-    # ── end TODO ──────────────────────────────────────────────────────────────
-
-    return ActionOneResult(
+    if option <= 0:
+        return ActionOneResult(error=f"option must be a positive integer, got {option}")
+    if sort not in SORT_KEYS:
+        return ActionOneResult(
+            error=f"sort must be one of {', '.join(SORT_KEYS)}, got '{sort}'"
+        )
+    if mode not in MODES:
+        return ActionOneResult(error=f"mode must be one of {', '.join(MODES)}, got '{mode}'")
+    if rate <= 0:
+        return ActionOneResult(error=f"rate must be positive, got {rate}")
+    if export is not None and export not in EXPORT_FORMATS:
+        return ActionOneResult(
+            error=f"export must be one of {', '.join(EXPORT_FORMATS)}, got '{export}'"
+        )
+
+    try:
+        func = load_target(target)
+    except CommandTimeoutError as exc:
+        return ActionOneResult(error=exc.message)
+    except Exception as exc_raw:
+        e = CommandExecutionError(
+            f"Cannot load target '{target}': {exc_raw}",
+            command_name="action-one",
+            original=exc_raw,
+        )
+        return ActionOneResult(error=e.message)
+
+    report(progress, "profiling" if mode == "cprofile" else "sampling")
+    try:
+        if mode == "sample":
+            stacks, wall, timed_out = _sample(func, rate, progress)
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                timed_out = call_until_timeout(func)
+            finally:
+                profiler.disable()
+    except Exception as exc_raw:
+        e = CommandExecutionError(
+            f"Target '{target}' raised {type(exc_raw).__name__}: {exc_raw}",
+            command_name="action-one",
+            original=exc_raw,
+        )
+        return ActionOneResult(error=e.message)
+
+    report(progress, "ranking")
+    key = itemgetter(SORT_KEYS[sort])
+    if mode == "sample":
+        total = sum(stacks.values())
+        top = heapq.nlargest(option, _fold_samples(stacks, wall), key=key)
+        result = ActionOneResult(
+            rows=[_format_sample_row(*entry, total) for entry in top],
+            total_count=total,
+            total_time=round(wall, 6),
+            output_file=None,
+            mode=mode,
+            timed_out=timed_out,
+            exit_code=EXIT_TIMEOUT if timed_out else 0,
+            error=None,
+        )
+    else:
+        totals = [0, 0.0]
+        top = heapq.nlargest(option, _iter_entries(profiler, totals), key=key)
+        result = ActionOneResult(
+            rows=[_format_row(*entry) for entry in top],
+            total_count=totals[0],
+            total_time=round(totals[1], 6),
+            output_file=None,
+            mode=mode,
+            timed_out=timed_out,
+            exit_code=EXIT_TIMEOUT if timed_out else 0,
+            error=None,
+        )
+
+    if export is not None:
+        report(progress, "exporting", metrics={"format": export})
+        path = output or _default_output(target, export)
+        if mode == "sample":
+            pairs, unit = _sampled_stacks(stacks), "samples"
+        else:
+            pairs, unit = _cprofile_stacks(profiler), "microseconds"
+        try:
+            with open(path, "w", encoding="utf-8") as fh:
+                write_export(export, pairs, fh, title=f"clisoft action-one {target}", unit=unit)
+        except OSError as exc_raw:
+            e = CommandExecutionError(
+                f"Cannot write export '{path}': {exc_raw}",
+                command_name="action-one",
+                original=exc_raw,
+            )
+            return ActionOneResult(error=e.message)
+        result.output_file = path
+    return result
+
+
+def table_view(result: ActionOneResult) -> TableView:
+    """Table-mode presentation of an `ActionOneResult` (see `commands/registry.py`).
+
+    Sample-mode results get sample-oriented column headers.
+    """
+    rows = (
+        [r["label"], r["value_a"], r["value_b"], r["value_c"], r["identifier"]]
+        for r in result.rows
+    )
+    written = f" — wrote {result.output_file}" if result.output_file else ""
+    done = "Timed out, partial profile" if result.timed_out else "Done"
+    if result.mode == "sample":
+        return TableView(
+            rows=rows,
+            message=f"{done} — {result.total_count:,} samples over {result.total_time:.4f}s{written}",
+            columns=[
+                ("Samples",  "bold cyan"),
+                ("Self (s)", "white"),
+                ("Cum (s)",  "white"),
+                ("Cum %",    "dim"),
+                ("Filename", "dim"),
+            ],
+        )
+    return TableView(
         rows=rows,
-        total_count=total_count,
-        total_time=total_time,
-        output_file=None,
-        error=None,
+        message=f"{done} — {result.total_count:,} calls, {result.total_time:.4f}s total{written}",
     )
+
+
+def _sample(
+    func: Callable[[], object], rate: float, progress: ProgressCallback | None
+) -> tuple[Counter, float, bool]:
+    """Call *func* while a background thread samples this thread's stack.
+
+    Returns a Counter of stacks — tuples of code objects, innermost first,
+    cut at the first launcher frame — the wall time of the call, and
+    whether a timeout cut the call short.
+    The sampler only appends to the Counter; folding into per-function
+    counts happens afterwards, so each sample costs one stack walk.
+    """
+    stacks: Counter = Counter()
+    main = threading.get_ident()
+    stop = threading.Event()
+    interval = 1.0 / rate
+    guard = call_until_timeout.__code__
+
+    def sampler() -> None:
+        taken = 0
+        while not stop.wait(interval):
+            frame = sys._current_frames().get(main)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                if code is guard or code.co_filename in _LAUNCHER_FILES:
+                    break
+                stack.append(code)
+                frame = frame.f_back
+            if frame is None or not stack:
+                continue  # not inside the target (yet, or any more)
+            stacks[tuple(stack)] += 1
+            taken += 1
+            if taken % _REPORT_EVERY == 0:
+                report(progress, "sampling", metrics={"samples": f"{taken:,}"})
+
+    thread = threading.Thread(target=sampler, name="clisoft-sampler", daemon=True)
+    start = time.perf_counter()
+    thread.start()
+    try:
+        timed_out = call_until_timeout(func)
+    finally:
+        wall = time.perf_counter() - start
+        stop.set()
+        thread.join()
+    return stacks, wall, timed_out
+
+
+def _fold_samples(stacks: Counter, wall: float) -> Iterator[tuple]:
+    """Yield one (samples, self_samples, self_s, cum_s, code) tuple per function.
+
+    A function appearing several times in one stack (recursion) counts once
+    towards its cumulative samples.  Seconds are samples times the mean
+    interval actually achieved, which can be longer than 1 / rate when the
+    target holds the GIL.
+    """
+    total = sum(stacks.values())
+    per_sample = wall / total if total else 0.0
+    own: Counter = Counter()
+    cum: Counter = Counter()
+    for stack, count in stacks.items():
+        own[stack[0]] += count
+        for code in set(stack):
+            cum[code] += count
+    for code, samples in cum.items():
+        yield (samples, own[code], own[code] * per_sample, samples * per_sample, code)
+
+
+def _iter_entries(profiler: cProfile.Profile, totals: list) -> Iterator[tuple]:
+    """Yield one (calls, prim_calls, tottime, cumtime, identifier) tuple per entry.
+
+    *totals* is a two-item list updated in place with the running call count
+    and internal time, so the caller gets the summary scalars from the same
+    single pass that feeds the heap.  Launcher frames (`_LAUNCHER_FILES`)
+    are skipped.
+    """
+    for entry in profiler.getstats():
+        if getattr(entry.code, "co_filename", None) in _LAUNCHER_FILES:
+            continue
+        calls = entry.callcount
+        totals[0] += calls
+        totals[1] += entry.inlinetime
+        yield (
+            calls,
+            calls - entry.reccallcount,
+            entry.inlinetime,
+            entry.totaltime,
+            entry.code,
+        )
+
+
+def _format_row(calls: int, prim_calls: int, tottime: float, cumtime: float, code) -> dict:
+    """Turn one heap survivor into the display dict stored in `ActionOneResult.rows`."""
+    return {
+        "label":      str(calls) if calls == prim_calls else f"{calls}/{prim_calls}",
+        "value_a":    f"{tottime:.4f}",
+        "value_b":    f"{cumtime:.4f}",
+        "value_c":    f"{cumtime / prim_calls:.6f}" if prim_calls else "0.000000",
+        "identifier": _identifier(code),
+    }
+
+
+# ── Call-tree export (see commands/flamegraph.py) ───────────────────────────
+
+def _default_output(target: str, export: str) -> str:
+    """Derive an export file name from *target*, e.g. "app.py" -> "app.svg"."""
+    name = os.path.basename(target.rstrip("/\\")) or "profile"
+    if name.endswith(".py"):
+        name = name[:-3]
+    return re.sub(r"[^\w.-]+", "_", name) + SUFFIXES[export]
+
+
+def _frame_name(code) -> str:
+    """Flame graph frame label: "function (file:line)", or "{builtin}"."""
+    if isinstance(code, str):
+        return "{%s}" % code.strip("<>")
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+def _sampled_stacks(stacks: Counter) -> Iterator[tuple[tuple[str, ...], int]]:
+    """Yield (root-first frame names, sample count) for every distinct sampled stack."""
+    names: dict = {}
+    for stack, count in stacks.items():
+        yield tuple(
+            names.get(code) or names.setdefault(code, _frame_name(code))
+            for code in reversed(stack)
+        ), count
+
+
+def _cprofile_stacks(profiler: cProfile.Profile) -> Iterator[tuple[tuple[str, ...], int]]:
+    """Yield (root-first frame names, self microseconds) by walking the caller graph.
+
+    cProfile records caller -> callee edges, not whole stacks, so paths are
+    rebuilt depth-first from the functions nobody (but the launcher) called.
+    At each step a node's time budget is split like the profiler split it:
+    its own share (`inlinetime / totaltime`) is emitted for the path, and the
+    rest flows to each callee in proportion to that edge's `totaltime`.
+    Recursive edges are folded into the ancestor, and branches worth less
+    than a microsecond are pruned, so the walk visits each significant path
+    once and emits it as soon as it is reached.
+    """
+    entries = {entry.code: entry for entry in profiler.getstats()}
+    launcher = {code for code in entries if getattr(code, "co_filename", None) in _LAUNCHER_FILES}
+    called = {
+        sub.code
+        for code, entry in entries.items() if code not in launcher
+        for sub in entry.calls or ()
+    }
+    names: dict = {}
+    todo = [
+        ((code,), entries[code].totaltime * 1e6)
+        for code in entries if code not in launcher and code not in called
+    ]
+    while todo:
+        path, budget = todo.pop()
+        entry = entries.get(path[-1])
+        if entry is None or entry.totaltime <= 0:
+            own, scale = budget, 0.0
+        else:
+            scale = budget / (entry.totaltime * 1e6)
+            own = entry.inlinetime * 1e6 * scale
+        if own >= 1:
+            yield tuple(names.get(c) or names.setdefault(c, _frame_name(c)) for c in path), int(own)
+        if entry is None or not scale:
+            continue
+        for sub in entry.calls or ():
+            weight = sub.totaltime * 1e6 * scale
+            if weight >= 1 and sub.code not in path:
+                todo.append((path + (sub.code,), weight))
+
+
+def _format_sample_row(
+    samples: int, self_samples: int, self_s: float, cum_s: float, code, total: int
+) -> dict:
+    """Sample-mode counterpart of `_format_row`."""
+    return {
+        "label":      str(samples),
+        "value_a":    f"{self_s:.4f}",
+        "value_b":    f"{cum_s:.4f}",
+        "value_c":    f"{100.0 * samples / total:.1f}%" if total else "0.0%",
+        "identifier": _identifier(code),
+    }
+
+
+def _identifier(code) -> str:
+    """Format a profiler code entry like `pstats.func_std_string` does."""
+    if isinstance(code, str):
+        # Built-ins are reported as plain strings, e.g. "<built-in method time.sleep>".
+        return "{%s}" % code.strip("<>")
+    return f"{code.co_filename}:{code.co_firstlineno}({code.co_name})"
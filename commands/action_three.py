@@ -1,14 +1,52 @@
-"""Template action three — simulated item list with size/count metadata.
+"""Action three — tracemalloc memory profiler with snapshot diffing.
 
-This module is intentionally generic. To adapt it to a real project:
+Runs *target* (a script path, a module name, or a `module:function` spec —
+see `commands/_target.py`) with `tracemalloc` enabled.  Modes:
 
-  1. Rename `ActionThreeItem`, `ActionThreeResult`, and `run_action_three`
-     to something meaningful (e.g. `Allocation` / `MemoryResult` / `run_memory`,
-     or `LogEntry` / `LogReport` / `run_log_scan`).
-  2. Replace the TODO block below with your actual logic.
-  3. Update the dataclass fields to match what your logic produces.
-  4. Remove the `time.sleep(1.5)` line once real I/O provides natural delay.
-  5. Mirror any field renames in `prompts/interactive.py` and `cli.py`.
+  snapshot  One snapshot when the target finishes; items are the top
+            allocation sites by size, plus peak/current traced memory.
+  diff      A background thread takes a snapshot every `interval` seconds
+            while the target runs.  Only the last `keep` snapshots are held,
+            in a bounded `deque`, so the profiler's own memory stays flat no
+            matter how long the target runs.  Items are the `compare_to`
+            deltas between the oldest and newest snapshot in the ring, ranked
+            by growth, with a KB/s growth-rate column — the lines that keep
+            growing across the window are the leak candidates.
+  attach    *target* is the id of a process that is already running (e.g. a
+            worker up for days): nothing is launched or traced.  Its RSS,
+            PSS, USS, and swap are read from /proc every `interval` seconds
+            (10 ms is fine, see `commands/procmem.py`) for `duration`
+            seconds or until it exits.  Items are one row per metric with
+            current, peak, change, and KB/s growth; peak/current are RSS.
+            Linux only, and never cached.
+  census    Counts live objects by type (`commands/census.py`) before and
+            after the target runs, with the cycle collector saving every
+            object it frees meanwhile (`gc.DEBUG_SAVEALL`).  Items are one
+            row per type, ranked by shallow-size growth, with the number of
+            its instances that were only freed by breaking reference
+            cycles.  peak/current are the census totals, KB.
+
+With `frames` > 1 tracemalloc records that many frames per allocation and
+items are grouped by the whole call chain instead of the allocating line,
+so two callers leaking through one helper show up as two rows, each with
+its `chain`.  Traces are grouped by allocation site in `_SiteGrouper`:
+traces allocated by the profiler itself are dropped, and in
+the default "user" scope each trace is attributed to its most recent
+recorded frame outside the standard library (site-packages is kept).  With
+`frames` of 4 or more, `json.loads` called from the target counts against
+the target's line; with fewer, all of its recorded frames are in the
+stdlib, so it gets no row and is totalled in `unattributed_kb` instead
+(the table's "unattributed (stdlib, raise --frames)" line).  Recording
+extra frames is not automatic because tracemalloc resolves a line number
+for every frame of every allocation, which can make a shallow target
+several times slower.
+Grouping waits until tracing has stopped: while it is on, every int the
+totals allocate is traced too, which made grouping a large heap over ten
+times slower.
+
+Under a timeout (see `commands/supervisor.py`) the target is interrupted
+at the deadline and the final snapshot is taken right there, so the result
+shows what was allocated — and growing — up to that point.
 
 Return contract (never break this):
   - Always return an `ActionThreeResult` instance.
@@ -16,42 +54,213 @@ Return contract (never break this):
   - Never print or raise inside this function — the caller handles UI.
 """
 
-import random
+import fnmatch
+import gc
+import heapq
+import itertools
+import os
+import sys
+import threading
 import time
+import tracemalloc
+from collections import deque
 from dataclasses import dataclass, field
 
+from commands import _target, supervisor
+from commands._target import load_target
+from commands.census import census_of, diff_census, saving_cycles, take_census
+from commands.procmem import ProcMemReader
+from commands.progress import ProgressCallback, report
+from commands.registry import TableView
+from commands.supervisor import EXIT_TIMEOUT, call_until_timeout
+from exceptions import CommandExecutionError, CommandTimeoutError
+
+
+MODES = ("snapshot", "diff", "attach", "census")
+SCOPES = ("user", "all")
+
+# Attach-mode rows: (MemSample field, label).  "hwm" is folded into RSS's peak.
+_PROC_METRICS = (("rss", "RSS"), ("pss", "PSS"), ("uss", "USS"), ("swap", "Swap"))
+
+# Frames that run the target rather than belong to it; a call chain is cut
+# at the first of these.
+_LAUNCHER_FILES = frozenset({_target.__file__, supervisor.__file__, "<frozen runpy>"})
+
+# The CLI's own code, relative to the directory holding `cli.py`.
+_CLI_PATHS = ("cli.py", "commands", "exceptions", "prompts", "ui")
+
+# `_SiteGrouper` frame kinds.
+_KEEP, _SKIP, _DROP = 0, 1, 2
+
+# `_SiteGrouper` site of a trace whose recorded frames are all skipped.
+_UNATTRIBUTED = ("unattributed",)
+
+
+def _self_patterns() -> tuple[str, ...]:
+    """Filename patterns of allocations that belong to the profiler, not the target.
+
+    tracemalloc's own allocations are never interesting, and neither are
+    those of the CLI itself (`_CLI_PATHS`: the command layer's snapshots,
+    ring buffer, and target loader, exceptions it builds, the menu and the
+    output helpers), of a progress display rendering in this process while
+    the target runs (Rich, when the caller has already imported it), or of
+    the pipe relaying progress to the parent when running under
+    `commands.supervisor`.
+    """
+    root = os.path.dirname(os.path.dirname(__file__))
+    patterns = [tracemalloc.__file__]
+    for path in _CLI_PATHS:
+        path = os.path.join(root, path)
+        patterns.append(path if path.endswith(".py") else os.path.join(path, "*"))
+    rich = sys.modules.get("rich")
+    if rich is not None and getattr(rich, "__file__", None):
+        patterns.append(os.path.join(os.path.dirname(rich.__file__), "*"))
+    mp = sys.modules.get("multiprocessing")
+    if mp is not None and mp.parent_process() is not None:
+        from multiprocessing import connection
+        patterns.append(connection.__file__)
+    return tuple(patterns)
+
+
+def _stdlib_patterns() -> tuple[str, ...]:
+    """Filename patterns of standard-library frames, frozen modules included.
+
+    In a virtualenv site-packages lives elsewhere and one "<stdlib>/*"
+    pattern does; in a system or pyenv install it sits inside the stdlib
+    directory, and since fnmatch has no negation the pattern is spelled out
+    as "differs from 'site-packages' at character i", one per character.
+    """
+    import sysconfig
+
+    paths = sysconfig.get_paths()
+    site_dirs = {os.path.normpath(paths[key]) for key in ("purelib", "platlib")}
+    patterns = ["<frozen *>"]
+    for root in {os.path.normpath(paths[key]) for key in ("stdlib", "platstdlib")}:
+        inside = sorted(os.path.basename(d) for d in site_dirs if os.path.dirname(d) == root)
+        if not inside:
+            patterns.append(os.path.join(root, "*"))
+            continue
+        child = inside[0]
+        patterns.extend(
+            os.path.join(root, child[:i] + f"[!{child[i]}]*") for i in range(len(child))
+        )
+    return tuple(patterns)
+
+
+class _SiteGrouper:
+    """Totals a snapshot's traces by allocation site.
+
+    A trace's site is its most recent frame whose file matches no *skip*
+    pattern, followed by up to `frames` - 1 of its callers (cut at the first
+    launcher frame).  A trace whose site frame would match a *drop* pattern
+    or be a launcher frame is left out; one whose frames all match *skip*
+    is left out too, but its size is totalled as unattributed.
+
+    A heap holds millions of traces but only a few thousand distinct
+    tracebacks and hundreds of filenames, so the traces are first totalled
+    per traceback by `Snapshot.statistics("traceback")`; sites are then
+    worked out once per traceback and patterns matched once per filename,
+    across every snapshot of a run.
+    """
+
+    def __init__(self, drop: tuple[str, ...], skip: tuple[str, ...], frames: int):
+        self._drop = drop
+        self._skip = skip
+        self._frames = frames
+        self._kinds: dict[str, int] = {}
+        self._sites: dict[tracemalloc.Traceback, tuple | None] = {}
+
+    def group(self, snapshot: tracemalloc.Snapshot) -> tuple[dict[tuple, list[int]], int]:
+        """Map each site, a tuple of (filename, lineno) frames, to its [size, count].
 
-# Placeholder source paths used to fill the simulated table.
-# Replace with real identifiers (file paths, queue names, table names, etc.)
-_PLACEHOLDER_SOURCES = [
-    "module/models.py",
-    "module/serializer.py",
-    "lib/query.py",
-    "lib/cache.py",
-    "module/views.py",
-    "lib/middleware.py",
-    "module/tasks.py",
-    "lib/utils.py",
-    "module/validators.py",
-    "lib/codec.py",
-]
+        Returns (that map, bytes held by traces with only *skip* frames).
+        """
+        groups: dict[tuple, list[int]] = {}
+        unattributed = 0
+        sites = self._sites
+        for stat in snapshot.statistics("traceback"):
+            try:
+                site = sites[stat.traceback]
+            except KeyError:
+                site = sites[stat.traceback] = self._site(stat.traceback)
+            if site is None:
+                continue
+            if site is _UNATTRIBUTED:
+                unattributed += stat.size
+                continue
+            total = groups.get(site)
+            if total is None:
+                groups[site] = [stat.size, stat.count]
+            else:
+                total[0] += stat.size
+                total[1] += stat.count
+        return groups, unattributed
+
+    def _site(self, traceback: tracemalloc.Traceback) -> tuple | None:
+        frames = list(traceback)  # oldest first
+        for i in range(len(frames) - 1, -1, -1):
+            kind = self._kind(frames[i].filename)
+            if kind == _SKIP:
+                continue
+            if kind == _DROP:
+                return None
+            site = []
+            for frame in frames[i::-1]:
+                if frame.filename in _LAUNCHER_FILES or len(site) == self._frames:
+                    break
+                site.append((frame.filename, frame.lineno))
+            return tuple(site) or None  # allocated by a launcher frame
+        return _UNATTRIBUTED
+
+    def _kind(self, filename: str) -> int:
+        kind = self._kinds.get(filename)
+        if kind is None:
+            if any(fnmatch.fnmatch(filename, p) for p in self._drop):
+                kind = _DROP
+            elif any(fnmatch.fnmatch(filename, p) for p in self._skip):
+                kind = _SKIP
+            else:
+                kind = _KEEP
+            self._kinds[filename] = kind
+        return kind
 
 
 @dataclass
 class ActionThreeItem:
-    """A single item in the ActionThreeResult list.
+    """A single allocation site in the ActionThreeResult list.
 
     Fields:
-        source:    Where this item originates (file, queue, table name, etc.).
-        position:  Line number, offset, index, or other positional reference.
-        size_kb:   Magnitude of the item (KB, MB, rows, bytes — your choice).
-        count:     Number of sub-items, occurrences, or objects.
+        source:       File that allocated the memory.
+        position:     Line number of the allocating statement.
+        size_kb:      Memory held by this site (at the newest snapshot), KB.
+        count:        Number of live blocks allocated by this site.
+        size_diff_kb: Size change across the snapshot window, KB (diff mode).
+        count_diff:   Block-count change across the window (diff mode).
+        growth_kb_s:  `size_diff_kb` divided by the window length (diff mode).
+        peak_kb:      Highest value seen while sampling, KB (attach mode).
+        chain:        The allocating call chain as "file:line" strings, most
+                      recent call first (*source*:*position* is the first);
+                      up to `frames` long, cut where the profiler's own
+                      launcher frames begin.
+        cycles:       Instances found in reference-cycle garbage (census mode).
+
+    In attach mode *source* names a metric ("RSS", "PSS", "USS", "Swap"),
+    *position* is 0, *count* is the number of samples, and the diff fields
+    compare the last sample with the first.  In census mode *source* is a
+    type name, *position* is 0, and the size/count fields are the type's
+    shallow size and instance count after the run, and their change.
     """
 
     source: str
     position: int
     size_kb: float
     count: int
+    size_diff_kb: float = 0.0
+    count_diff: int = 0
+    growth_kb_s: float = 0.0
+    peak_kb: float = 0.0
+    chain: list[str] = field(default_factory=list)
+    cycles: int = 0
 
 
 @dataclass
@@ -59,88 +268,516 @@ class ActionThreeResult:
     """Result returned by `run_action_three`.
 
     Fields:
-        peak_value:    Largest observed scalar (e.g. peak memory KB, max latency).
-        current_value: Current / final scalar (e.g. current memory KB, last value).
-        items:         Sorted list of ActionThreeItem instances (desc by size_kb).
+        peak_value:    Peak traced memory while the target ran, KB (attach
+                       mode: the kernel's RSS high-water mark, i.e. the
+                       peak since the process started).
+        current_value: Traced memory when the target finished, KB (attach
+                       mode: RSS at the last sample).
+        items:         ActionThreeItem list — desc by size_kb in snapshot
+                       mode, desc by size_diff_kb in diff mode, one row per
+                       metric in attach mode.
+        mode:          The mode that produced this result.
+        snapshots:     Snapshots taken (diff mode may take more than it
+                       keeps), or /proc samples in attach mode.
+        window_s:      Seconds between the compared snapshots (diff mode),
+                       or from the first to the last sample (attach mode).
+        frames:        Frames recorded per allocation; above 1, items are
+                       grouped by call chain rather than by line.
+        scope:         "user" if standard-library allocations were hidden,
+                       "all" if they were kept.
+        unattributed_kb: Memory held at the newest snapshot by allocations
+                       whose recorded frames are all in the standard library,
+                       KB ("user" scope): they have no row, and a larger
+                       `frames` would reach the caller they belong to.
+        cycle_objects: Objects the cycle collector freed while the target ran
+                       (census mode).
+        pid:           The process sampled in attach mode, else 0.
+        exited:        True if that process exited while being sampled.
+        timed_out:     True if the target was stopped by a timeout; the last
+                       snapshot was taken at that moment.
+        exit_code:     `EXIT_TIMEOUT` for a timed-out result, else 0.
         error:         Non-None string if the action failed; None on success.
     """
 
     peak_value: float = 0.0
     current_value: float = 0.0
     items: list[ActionThreeItem] = field(default_factory=list)
+    mode: str = "snapshot"
+    snapshots: int = 0
+    window_s: float = 0.0
+    frames: int = 1
+    scope: str = "user"
+    unattributed_kb: float = 0.0
+    cycle_objects: int = 0
+    pid: int = 0
+    exited: bool = False
+    timed_out: bool = False
+    exit_code: int = 0
     error: str | None = None
 
+    @property
+    def cacheable(self) -> bool:
+        """False in attach mode: a live process's memory does not follow from any source file."""
+        return self.mode != "attach"
 
-def run_action_three(target: str, option: int = 10) -> ActionThreeResult:
-    """Execute action three against *target* and return the result.
+
+def run_action_three(
+    target: str,
+    option: int = 10,
+    mode: str = "snapshot",
+    interval: float = 1.0,
+    keep: int = 5,
+    duration: float = 10.0,
+    frames: int = 1,
+    scope: str = "user",
+    progress: ProgressCallback | None = None,
+) -> ActionThreeResult:
+    """Trace the memory allocations of *target* and return the top sites.
 
     Args:
-        target: Arbitrary string label that identifies what to act on.
-                In a real implementation this might be a process name, module,
-                service name, etc.
-        option: Integer tuning parameter (e.g. max items to return).
+        target:   Script path, module name, or `module:function` to trace;
+                  a process id ("1234" or "pid:1234") in attach mode.
+        option:   Maximum number of items to return.
+        mode:     "snapshot", "diff", "attach", or "census" (see module docstring).
+        interval: Seconds between periodic snapshots (diff mode) or /proc
+                  samples (attach mode).
+        keep:     Snapshots retained in the ring buffer (diff mode, >= 2).
+        duration: Seconds to sample for in attach mode; 0 samples until the
+                  process exits (or the timeout).
+        frames:   Frames tracemalloc records per allocation (1..1000); items
+                  are grouped by call chain when above 1.  Ignored when
+                  tracemalloc was already tracing, which keeps its own limit.
+        scope:    "user" attributes allocations made in standard-library
+                  frames to the nearest recorded caller outside the stdlib,
+                  and hides them if there is none; "all" keeps them where
+                  they were made.  The profiler's own are always hidden.
+        progress: Optional `commands.progress` callback; in diff mode it gets
+                  the traced/peak memory after every periodic snapshot, in
+                  attach mode the current RSS/PSS/USS, in census mode the
+                  number of objects walked.
 
     Returns:
         ActionThreeResult populated with either data or an error message.
     """
-    # Simulate work so the spinner is visible during the demo.
-    # Remove or replace this line with real I/O / computation.
-    time.sleep(1.5)
-
-    # ── TODO: replace this block with real logic ──────────────────────────────
-    # Example shape of real logic (tracemalloc / memory profiling):
-    #
-    #   import tracemalloc
-    #   try:
-    #       tracemalloc.start()
-    #       your_function(target)
-    #       snapshot = tracemalloc.take_snapshot()
-    #       current, peak = tracemalloc.get_traced_memory()
-    #       tracemalloc.stop()
-    #   except YourError as exc:
-    #       return ActionThreeResult(error=str(exc))
-    #
-    #   stats = snapshot.statistics("lineno")[:option]
-    #   items = [
-    #       ActionThreeItem(
-    #           source=str(stat.traceback[0].filename),
-    #           position=stat.traceback[0].lineno,
-    #           size_kb=round(stat.size / 1024, 2),
-    #           count=stat.count,
-    #       )
-    #       for stat in stats
-    #   ]
-    #   items.sort(key=lambda i: i.size_kb, reverse=True)
-    #   return ActionThreeResult(
-    #       peak_value=round(peak / 1024, 2),
-    #       current_value=round(current / 1024, 2),
-    #       items=items,
-    #       error=None,
-    #   )
-    #
-    # Until then, random values keep the visual demo functional:
-
-    peak_value = round(random.uniform(1_024, 8_192), 2)
-    current_value = round(peak_value * random.uniform(0.6, 0.95), 2)
-
-    sources = random.sample(_PLACEHOLDER_SOURCES, k=min(option, len(_PLACEHOLDER_SOURCES)))
-    items = [
-        ActionThreeItem(
-            source=src,
-            position=random.randint(10, 300),
-            size_kb=round(random.uniform(8, 512), 2),
-            count=random.randint(50, 5_000),
+    if option <= 0:
+        return ActionThreeResult(error=f"option must be a positive integer, got {option}")
+    if mode not in MODES:
+        return ActionThreeResult(error=f"mode must be one of {', '.join(MODES)}, got '{mode}'")
+    if mode == "diff" and (interval <= 0 or keep < 2):
+        return ActionThreeResult(error="diff mode needs interval > 0 and keep >= 2")
+    if not 1 <= frames <= 1000:
+        return ActionThreeResult(error=f"frames must be between 1 and 1000, got {frames}")
+    if scope not in SCOPES:
+        return ActionThreeResult(error=f"scope must be one of {', '.join(SCOPES)}, got '{scope}'")
+    if mode == "attach":
+        if interval <= 0 or duration < 0:
+            return ActionThreeResult(error="attach mode needs interval > 0 and duration >= 0")
+        return _attach(target, option, interval, duration, progress)
+
+    try:
+        func = load_target(target)
+    except CommandTimeoutError as exc:
+        return ActionThreeResult(error=exc.message)
+    except Exception as exc_raw:
+        e = CommandExecutionError(
+            f"Cannot load target '{target}': {exc_raw}",
+            command_name="action-three",
+            original=exc_raw,
         )
-        for src in sources
-    ]
-    # Sort descending by size so the table reads naturally (largest first)
-    items.sort(key=lambda i: i.size_kb, reverse=True)
+        return ActionThreeResult(error=e.message)
+
+    if mode == "census":
+        return _census(target, func, option, progress)
+
+    ring: deque = deque(maxlen=keep if mode == "diff" else 1)
+    taken = 0
+    stop = threading.Event()
+
+    def take() -> None:
+        nonlocal taken
+        ring.append((time.perf_counter(), tracemalloc.take_snapshot()))
+        taken += 1
+        current, peak = tracemalloc.get_traced_memory()
+        report(progress, "tracing", taken, None, {
+            "snapshots": str(taken),
+            "traced": f"{current / 1024:,.1f} KB",
+            "peak": f"{peak / 1024:,.1f} KB",
+        })
+
+    def poll() -> None:
+        while not stop.wait(interval):
+            take()
+
+    was_tracing = tracemalloc.is_tracing()
+    if was_tracing:
+        frames = tracemalloc.get_traceback_limit()
+    else:
+        tracemalloc.start(frames)
+    tracemalloc.reset_peak()
+    poller = threading.Thread(target=poll, name="clisoft-snapshots", daemon=True)
+    try:
+        report(progress, "tracing")
+        if mode == "diff":
+            take()
+            poller.start()
+        try:
+            timed_out = call_until_timeout(func)
+        finally:
+            stop.set()
+            if poller.is_alive():
+                poller.join()
+        take()
+        current, peak = tracemalloc.get_traced_memory()
+    except CommandTimeoutError as exc:  # struck outside the target call
+        return ActionThreeResult(error=exc.message)
+    except Exception as exc_raw:
+        e = CommandExecutionError(
+            f"Target '{target}' raised {type(exc_raw).__name__}: {exc_raw}",
+            command_name="action-three",
+            original=exc_raw,
+        )
+        return ActionThreeResult(error=e.message)
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    report(progress, "ranking")
+    grouper = _SiteGrouper(_self_patterns(), _stdlib_patterns() if scope == "user" else (), frames)
+    sites, unattributed = grouper.group(ring[-1][1])
+    if mode == "diff":
+        items, window = _diff_items(ring[0], ring[-1], sites, option, grouper)
+    else:
+        items, window = _snapshot_items(sites, option), 0.0
+
+    return ActionThreeResult(
+        peak_value=round(peak / 1024, 2),
+        current_value=round(current / 1024, 2),
+        items=items,
+        mode=mode,
+        snapshots=taken,
+        window_s=round(window, 3),
+        frames=frames,
+        scope=scope,
+        unattributed_kb=round(unattributed / 1024, 2),
+        timed_out=timed_out,
+        exit_code=EXIT_TIMEOUT if timed_out else 0,
+        error=None,
+    )
 
-    # ── end TODO ──────────────────────────────────────────────────────────────
 
+def table_view(result: ActionThreeResult) -> TableView:
+    """Table-mode presentation of an `ActionThreeResult` (see `commands/registry.py`).
+
+    Diff-mode results get three extra growth columns, and results grouped by
+    call chain a "Called from" column listing the callers, innermost first.
+    """
+    if result.mode == "attach":
+        return _attach_view(result)
+    if result.mode == "census":
+        return _census_view(result)
+    diff = result.mode == "diff"
+    chains = result.frames > 1
+    columns = None
+    done = "Timed out, partial trace" if result.timed_out else "Done"
+    message = f"{done} — peak {result.peak_value:.2f} KB, current {result.current_value:.2f} KB"
+    if diff or chains:
+        columns = [
+            ("Source",    "bold cyan"),
+            ("Line",      "white"),
+            ("Size (KB)", "white"),
+            ("Count",     "dim"),
+        ]
+    if diff:
+        columns += [
+            ("Δ KB",      "yellow"),
+            ("Δ Count",   "dim"),
+            ("KB/s",      "bold yellow"),
+        ]
+        message += f", {result.snapshots} snapshots over {result.window_s:.1f}s"
+    if chains:
+        columns.append(("Called from", "dim"))
+        message += f", grouped by up to {result.frames} frames"
+    if result.unattributed_kb:
+        message += f"\n{result.unattributed_kb:.2f} KB unattributed (stdlib, raise --frames)"
+    return TableView(
+        rows=(
+            [item.source, str(item.position), f"{item.size_kb:.2f}", str(item.count)]
+            + (
+                [f"{item.size_diff_kb:+.2f}", f"{item.count_diff:+d}", f"{item.growth_kb_s:+.2f}"]
+                if diff else []
+            )
+            + ([_callers(item.chain)] if chains else [])
+            for item in result.items
+        ),
+        message=message,
+        columns=columns,
+    )
+
+
+def _callers(chain: list[str]) -> str:
+    """The frames after the allocating one, as "file.py:12 ← main.py:40"."""
+    return " ← ".join(os.path.basename(frame) for frame in chain[1:]) or "—"
+
+
+def _census_view(result: ActionThreeResult) -> TableView:
+    """Table-mode presentation of a census-mode result: one row per type."""
+    done = "Timed out, partial census" if result.timed_out else "Done"
+    message = (
+        f"{done} — {result.current_value:,.0f} KB in tracked objects (shallow), "
+        f"{result.cycle_objects:,} freed from reference cycles in {result.window_s:.1f}s"
+    )
+    return TableView(
+        rows=(
+            [item.source, f"{item.count:,}", f"{item.size_kb:,.1f}",
+             f"{item.count_diff:+,}", f"{item.size_diff_kb:+,.1f}", f"{item.cycles:,}"]
+            for item in result.items
+        ),
+        message=message,
+        columns=[
+            ("Type",      "bold cyan"),
+            ("Count",     "white"),
+            ("Size (KB)", "white"),
+            ("Δ Count",   "dim"),
+            ("Δ KB",      "bold yellow"),
+            ("In cycles", "magenta"),
+        ],
+    )
+
+
+def _attach_view(result: ActionThreeResult) -> TableView:
+    """Table-mode presentation of an attach-mode result: one row per metric."""
+    done = "Timed out, partial sampling" if result.timed_out else "Done"
+    message = (
+        f"{done} — pid {result.pid}: peak RSS {result.peak_value:,.0f} KB, "
+        f"current {result.current_value:,.0f} KB, "
+        f"{result.snapshots:,} samples over {result.window_s:.1f}s"
+    )
+    if result.exited:
+        message += " (process exited)"
+    return TableView(
+        rows=(
+            [item.source, f"{item.size_kb:,.0f}", f"{item.peak_kb:,.0f}",
+             f"{item.size_diff_kb:+,.0f}", f"{item.growth_kb_s:+,.2f}"]
+            for item in result.items
+        ),
+        message=message,
+        columns=[
+            ("Metric",    "bold cyan"),
+            ("Now (KB)",  "white"),
+            ("Peak (KB)", "white"),
+            ("Δ KB",      "yellow"),
+            ("KB/s",      "bold yellow"),
+        ],
+    )
+
+
+def _attach(target: str, limit: int, interval: float, duration: float,
+            progress: ProgressCallback | None) -> ActionThreeResult:
+    """Attach mode: sample process *target*'s memory from /proc (see module docstring)."""
+    pid_text = target[4:] if target.startswith("pid:") else target
+    if not pid_text.isdigit():
+        return ActionThreeResult(
+            mode="attach",
+            error=f"attach mode needs a process id as target (e.g. 1234 or pid:1234), got '{target}'",
+        )
+    pid = int(pid_text)
+    try:
+        reader = ProcMemReader(pid)
+    except FileNotFoundError:
+        return ActionThreeResult(mode="attach", pid=pid,
+                                 error=f"No process {pid} (attach mode needs Linux /proc)")
+    except OSError as exc:
+        return ActionThreeResult(mode="attach", pid=pid,
+                                 error=f"Cannot attach to process {pid}: {exc.strerror or exc}")
+
+    with reader:
+        first = reader.read()
+        if first is None:
+            return ActionThreeResult(mode="attach", pid=pid,
+                                     error=f"Process {pid} exited before the first sample")
+        last = first
+        peaks = list(first)
+        samples = 1
+        exited = False
+        started = time.perf_counter()
+        expected = int(duration / interval) + 1 if duration else None
+
+        def poll() -> None:
+            nonlocal last, samples, exited
+            due = started
+            while not duration or time.perf_counter() - started < duration:
+                due += interval
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    due = time.perf_counter()  # fell behind: skip, don't burst
+                sample = reader.read()
+                if sample is None:
+                    exited = True
+                    return
+                last = sample
+                samples += 1
+                for i, value in enumerate(sample):
+                    if value > peaks[i]:
+                        peaks[i] = value
+                report(progress, "sampling", samples, expected, {
+                    "rss": f"{sample.rss:,} KB",
+                    "pss": f"{sample.pss:,} KB",
+                    "uss": f"{sample.uss:,} KB",
+                })
+
+        report(progress, "sampling", samples, expected)
+        timed_out = call_until_timeout(poll)
+        window = time.perf_counter() - started
+        detailed = reader.detailed
+
+    report(progress, "ranking")
+    fields = last._fields
+    items = []
+    for name, label in _PROC_METRICS:
+        if name != "rss" and not detailed:
+            continue
+        i = fields.index(name)
+        change = last[i] - first[i]
+        items.append(ActionThreeItem(
+            source=label,
+            position=0,
+            size_kb=float(last[i]),
+            count=samples,
+            size_diff_kb=float(change),
+            growth_kb_s=round(change / window, 2) if window > 0 else 0.0,
+            peak_kb=float(peaks[i]),
+        ))
+    return ActionThreeResult(
+        peak_value=float(max(last.hwm, peaks[0])),
+        current_value=float(last.rss),
+        items=items[:limit],
+        mode="attach",
+        snapshots=samples,
+        window_s=round(window, 3),
+        pid=pid,
+        exited=exited,
+        timed_out=timed_out,
+        exit_code=EXIT_TIMEOUT if timed_out else 0,
+        error=None,
+    )
+
+
+def _census(target: str, func, limit: int, progress: ProgressCallback | None) -> ActionThreeResult:
+    """Census mode: object counts by type before and after *func* (see module docstring)."""
+    walked = 0
+
+    def counted(n: int) -> None:
+        nonlocal walked
+        walked += n
+        report(progress, "census", walked, None, {"objects": f"{walked:,}"})
+
+    try:
+        gc.collect()
+        before = take_census(counted)
+        report(progress, "running")
+        started = time.perf_counter()
+        with saving_cycles() as garbage:
+            timed_out = call_until_timeout(func)
+        window = time.perf_counter() - started
+        cycles = census_of(garbage)
+        cycle_objects = len(garbage)
+        garbage.clear()
+        gc.collect()  # DEBUG_SAVEALL is off again: the saved cycles go now
+        walked = 0
+        after = take_census(counted)
+    except CommandTimeoutError as exc:  # struck outside the target call
+        return ActionThreeResult(mode="census", error=exc.message)
+    except Exception as exc_raw:
+        e = CommandExecutionError(
+            f"Target '{target}' raised {type(exc_raw).__name__}: {exc_raw}",
+            command_name="action-three",
+            original=exc_raw,
+        )
+        return ActionThreeResult(mode="census", error=e.message)
+
+    report(progress, "ranking")
+    changes = diff_census(before, after)
+    names = heapq.nlargest(
+        limit, changes.keys() | cycles.keys(),
+        key=lambda name: (changes.get(name, (0, 0))[1], cycles.get(name, (0,))[0]),
+    )
+    items = []
+    for name in names:
+        count, size = after.get(name, (0, 0))
+        count_diff, size_diff = changes.get(name, (0, 0))
+        items.append(ActionThreeItem(
+            source=name,
+            position=0,
+            size_kb=round(size / 1024, 2),
+            count=count,
+            size_diff_kb=round(size_diff / 1024, 2),
+            count_diff=count_diff,
+            growth_kb_s=round(size_diff / 1024 / window, 2) if window > 0 else 0.0,
+            cycles=cycles.get(name, (0,))[0],
+        ))
+    total_before = sum(size for _count, size in before.values()) / 1024
+    total_after = sum(size for _count, size in after.values()) / 1024
     return ActionThreeResult(
-        peak_value=peak_value,
-        current_value=current_value,
+        peak_value=round(max(total_before, total_after), 2),
+        current_value=round(total_after, 2),
         items=items,
+        mode="census",
+        snapshots=2,
+        window_s=round(window, 3),
+        cycle_objects=cycle_objects,
+        timed_out=timed_out,
+        exit_code=EXIT_TIMEOUT if timed_out else 0,
         error=None,
     )
+
+
+def _snapshot_items(sites: dict[tuple, list[int]], limit: int) -> list[ActionThreeItem]:
+    """Top *limit* allocation sites (or call chains) of one snapshot, largest first."""
+    return [
+        ActionThreeItem(
+            source=site[0][0],
+            position=site[0][1],
+            size_kb=round(size / 1024, 2),
+            count=count,
+            chain=_chain(site),
+        )
+        for site, (size, count) in heapq.nlargest(limit, sites.items(), key=lambda s: s[1][0])
+    ]
+
+
+def _diff_items(oldest: tuple, newest: tuple, after: dict[tuple, list[int]], limit: int,
+                grouper: _SiteGrouper) -> tuple[list[ActionThreeItem], float]:
+    """Top *limit* sites (or call chains) by growth between two (timestamp, snapshot) ring entries.
+
+    *after* is *newest*'s snapshot already grouped.
+    """
+    window = newest[0] - oldest[0]
+    before = grouper.group(oldest[1])[0]
+    empty = (0, 0)
+    diffs = (
+        (site, size, count, size - before.get(site, empty)[0], count - before.get(site, empty)[1])
+        for site, (size, count) in after.items()
+    )
+    gone = ((site, 0, 0, -size, -count) for site, (size, count) in before.items() if site not in after)
+    top = heapq.nlargest(limit, itertools.chain(diffs, gone), key=lambda d: d[3])
+    items = [
+        ActionThreeItem(
+            source=site[0][0],
+            position=site[0][1],
+            size_kb=round(size / 1024, 2),
+            count=count,
+            size_diff_kb=round(size_diff / 1024, 2),
+            count_diff=count_diff,
+            growth_kb_s=round(size_diff / 1024 / window, 2) if window > 0 else 0.0,
+            chain=_chain(site),
+        )
+        for site, size, count, size_diff, count_diff in top
+    ]
+    return items, window
+
+
+def _chain(site: tuple) -> list[str]:
+    """"file:line" for each frame of a `_SiteGrouper` site, most recent first."""
+    return [f"{filename}:{lineno}" for filename, lineno in site]
@@ -1,13 +1,46 @@
-"""Template action two — simulated key/value metrics with statistical summary.
+"""Action two — statistical micro/macro benchmark harness.
 
-This module is intentionally generic. To adapt it to a real project:
+Runs *target* (a script path, a module name, or a `module:function` spec —
+see `commands/_target.py`) repeatedly and reports robust timing statistics.
 
-  1. Rename `ActionTwoResult` and `run_action_two` to something meaningful
-     (e.g. `BenchmarkResult` / `run_benchmark`, or `ImportResult` / `run_import`).
-  2. Replace the TODO block below with your actual logic.
-  3. Update the dataclass fields to match what your logic produces.
-  4. Remove the `time.sleep(1.5)` line once real I/O provides natural delay.
-  5. Mirror any field renames in `prompts/interactive.py` and `cli.py`.
+Each measurement goes through the same phases:
+
+  1. Warmup — `warmup` untimed rounds so imports, caches, and lazy
+     initialization do not pollute the first samples.
+  2. Calibration — when `loops` is 0, the inner loop count is doubled until
+     one round takes at least `CALIBRATION_TARGET_S`, so sub-microsecond
+     targets are not dominated by `perf_counter` resolution.
+  3. Timing — `option` rounds of `loops` calls each, with the cyclic GC
+     disabled so collections triggered by earlier rounds do not land in a
+     random sample.  Each round yields one per-call sample.
+  4. Statistics — Tukey outlier rejection, then median/stddev/IQR and
+     percentiles over the kept samples (see `commands/_stats.py`).
+
+With `workers > 1` the timed rounds are split across a `ProcessPoolExecutor`.
+Warmup and calibration still happen once in the parent so every worker uses
+the same loop count; each worker then pins itself to one CPU with
+`os.sched_setaffinity` (where the platform supports it), runs its own warmup,
+and returns its samples, which are merged into a single `values` buffer.
+
+Samples are kept in an `array('d')` — 8 bytes each, against ~32 for a list
+of floats — and summarized by `commands/_stats.py`, which views the buffer
+through NumPy without copying when NumPy is installed.  For very long
+runs, `recorder="hdr"` records into a fixed-size `HdrHistogram` instead
+(see `commands/hdr.py`): memory no longer grows with the number of rounds,
+workers send back compressed histograms that the parent merges, and every
+percentile is exact to `precision` significant digits.  The histogram has no
+raw samples to reject outliers from or to compare against a baseline, so
+its statistics cover every round and baselines require the list recorder.
+
+Baselines (see `commands/baseline.py`): `save_baseline` stores the raw
+samples under a name; `compare` runs a one-sided Mann–Whitney U test of the
+new samples against a stored baseline.  A significant slowdown (p below
+`REGRESSION_ALPHA`) sets `regression` and a non-zero `exit_code`, so a CI
+job running `clisoft action-two ... --compare main` fails the deploy.
+
+Under a timeout (see `commands/supervisor.py`) the rounds timed before the
+deadline are summarized as usual and `timed_out` is set; with `workers > 1`
+only the workers that had finished count, and the rest are terminated.
 
 Return contract (never break this):
   - Always return an `ActionTwoResult` instance.
@@ -15,23 +48,94 @@ Return contract (never break this):
   - Never print or raise inside this function — the caller handles UI.
 """
 
-import random
+import gc
+import os
 import time
+from array import array
 from dataclasses import dataclass, field
+from typing import Callable, Iterator
+
+from commands._stats import format_duration, mann_whitney_u, median, summarize
+from commands._target import load_target
+from commands.baseline import load_baseline, save_baseline
+from commands.hdr import HdrHistogram
+from commands.progress import ProgressCallback, report
+from commands.registry import TableView
+from commands.supervisor import EXIT_TIMEOUT
+from exceptions import CommandExecutionError, CommandTimeoutError
+
+
+# Minimum duration of one timed round when the loop count is auto-calibrated.
+# 10 ms is ~100 000x the resolution of perf_counter on Linux/macOS/Windows.
+CALIBRATION_TARGET_S = 0.01
+
+# Upper bound for auto-calibration so a no-op target cannot spin forever.
+MAX_LOOPS = 10_000_000
+
+# One-sided significance level for flagging a slowdown against a baseline.
+# Deliberately strict: a false alarm blocks a deploy.
+REGRESSION_ALPHA = 0.01
+
+# `exit_code` of a successful run that regressed against its baseline —
+# distinct from 1 (command error) and 2 (argparse usage error).
+EXIT_REGRESSION = 3
+
+# Sample stores: "list" keeps every raw sample, "hdr" a fixed-size histogram.
+RECORDERS = ("list", "hdr")
+
+# HDR histograms record integer picoseconds, so a 50 ns call still has
+# 5 significant digits of headroom; the top of the range is one hour per call.
+_HDR_UNIT = 1e12
+_HDR_HIGHEST = 3_600 * 10**12
 
 
 @dataclass
 class ActionTwoResult:
     """Result returned by `run_action_two`.
 
+    All timing values are seconds per call.  With the list recorder, summary
+    statistics are computed after outlier rejection and `values` holds every
+    raw sample; with the HDR recorder they cover every round, `values` is
+    empty, and `histogram` holds the recorded distribution instead;
+    `export_rows()` then turns its counters into the machine-format rows.
+
     Fields:
-        iterations:  How many iterations were performed (e.g. runs, retries, pages).
-        total_value: Sum of all measured values (e.g. total elapsed seconds).
-        avg_value:   Mean value per iteration.
-        min_value:   Minimum observed value.
-        max_value:   Maximum observed value.
-        values:      Raw list of per-iteration values (for charting or audit).
-        error:       Non-None string if the action failed; None on success.
+        iterations:   Number of timed rounds (samples) collected.
+        total_value:  Sum of the kept samples.
+        avg_value:    Mean of the kept samples.
+        min_value:    Minimum kept sample.
+        max_value:    Maximum kept sample.
+        median_value: Median of the kept samples.
+        stddev_value: Sample standard deviation of the kept samples.
+        iqr_value:    Interquartile range of the kept samples.
+        p50_value:    50th percentile.
+        p95_value:    95th percentile.
+        p99_value:    99th percentile.
+        p999_value:   99.9th percentile.
+        outliers:     Number of samples rejected by Tukey's fences.
+        loops:        Calls per timed round (calibrated or as requested).
+        warmup:       Untimed warmup rounds executed before timing.
+        workers:      Number of processes that collected samples.
+        cores:        CPU ids the workers were pinned to (empty when the
+                      run was sequential or the platform cannot pin).
+        values:       Raw per-call samples, one per round, as an `array('d')`.
+        recorder:     Sample store used: one of `RECORDERS`.
+        histogram:    The `HdrHistogram` (picoseconds) for the "hdr"
+                      recorder, else None.
+        relative_error: Bound on the relative error of every statistic read
+                      from `histogram` (0.0 for the list recorder).
+        baseline:     Name of the baseline compared against, or None.
+        baseline_median: Median of the baseline's raw samples.
+        change_pct:   Median change vs the baseline, in percent (+ = slower).
+        p_value:      One-sided Mann–Whitney p-value for "slower than baseline".
+        regression:   True if the slowdown is significant at `REGRESSION_ALPHA`.
+        saved_to:     Path the samples were saved to (`save_baseline`), or None.
+        timed_out:    True if a timeout stopped the run early; the statistics
+                      cover the rounds finished before it.
+        exit_code:    Process exit status the CLI should use after rendering:
+                      `EXIT_TIMEOUT` after a timeout, `EXIT_REGRESSION` on a
+                      regression, else 0.
+        error:        Non-None string if the action failed; None on success.
     """
 
     iterations: int = 0
@@ -39,74 +143,475 @@ class ActionTwoResult:
     avg_value: float = 0.0
     min_value: float = 0.0
     max_value: float = 0.0
-    values: list[float] = field(default_factory=list)
+    median_value: float = 0.0
+    stddev_value: float = 0.0
+    iqr_value: float = 0.0
+    p50_value: float = 0.0
+    p95_value: float = 0.0
+    p99_value: float = 0.0
+    p999_value: float = 0.0
+    outliers: int = 0
+    loops: int = 0
+    warmup: int = 0
+    workers: int = 1
+    cores: list[int] = field(default_factory=list)
+    values: array = field(default_factory=lambda: array("d"))
+    recorder: str = "list"
+    histogram: HdrHistogram | None = None
+    relative_error: float = 0.0
+    baseline: str | None = None
+    baseline_median: float = 0.0
+    change_pct: float = 0.0
+    p_value: float = 1.0
+    regression: bool = False
+    saved_to: str | None = None
+    timed_out: bool = False
+    exit_code: int = 0
     error: str | None = None
 
+    def export_rows(self) -> Iterator[dict]:
+        """Rows for the machine formats (see `ui/formats.py`).
+
+        One {"index", "value"} row per raw sample for the list recorder, or
+        one {"value", "count"} row per non-empty HDR counter, ascending, with
+        the value in seconds.
+        """
+        if self.histogram is None:
+            for idx, value in enumerate(self.values):
+                yield {"index": idx, "value": value}
+            return
+        for value, count in self.histogram.iter_counts():
+            yield {"value": value / _HDR_UNIT, "count": count}
 
-def run_action_two(target: str, option: int = 10) -> ActionTwoResult:
-    """Execute action two against *target* and return the result.
+
+def run_action_two(
+    target: str,
+    option: int = 10,
+    warmup: int = 2,
+    loops: int = 0,
+    workers: int = 1,
+    save_baseline_as: str | None = None,
+    compare: str | None = None,
+    recorder: str = "list",
+    precision: int = 3,
+    progress: ProgressCallback | None = None,
+) -> ActionTwoResult:
+    """Benchmark *target* and return timing statistics.
 
     Args:
-        target: Arbitrary string label that identifies what to act on.
-                In a real implementation this might be a file path, URL,
-                endpoint name, etc.
-        option: Integer tuning parameter (e.g. number of iterations to run).
+        target:   Script path, module name, or `module:function` to benchmark.
+        option:   Number of timed rounds (samples) to collect.
+        warmup:   Untimed rounds to run before calibration and timing.
+        loops:    Calls per timed round; 0 calibrates automatically.
+        workers:  Processes to spread the timed rounds over; 1 runs in-process.
+        save_baseline_as: Store the raw samples as the baseline of this name.
+        compare:  Name of a stored baseline to test the new samples against.
+        recorder: "list" to keep every sample, "hdr" for a fixed-memory
+                  histogram (see `RECORDERS`).
+        precision: Significant decimal digits kept by the "hdr" recorder (1–5).
+        progress: Optional `commands.progress` callback, told about every
+                  warmup and timed round (or finished worker) as it completes.
 
     Returns:
         ActionTwoResult populated with either data or an error message.
     """
     if option <= 0:
-        return ActionTwoResult(
-            iterations=0,
-            total_value=0.0,
-            avg_value=0.0,
-            min_value=0.0,
-            max_value=0.0,
-            values=[],
-            error=f"option must be a positive integer, got {option}",
+        return ActionTwoResult(error=f"option must be a positive integer, got {option}")
+    if warmup < 0 or loops < 0:
+        return ActionTwoResult(error="warmup and loops must not be negative")
+    if workers <= 0:
+        return ActionTwoResult(error=f"workers must be a positive integer, got {workers}")
+    if recorder not in RECORDERS:
+        return ActionTwoResult(error=f"recorder must be one of {', '.join(RECORDERS)}, got '{recorder}'")
+    if recorder == "hdr":
+        if not 1 <= precision <= 5:
+            return ActionTwoResult(error=f"precision must be between 1 and 5, got {precision}")
+        if save_baseline_as is not None or compare is not None:
+            return ActionTwoResult(error="baselines need the raw samples — use --recorder list")
+
+    # Load the reference first: a typo in --compare should fail in
+    # milliseconds, not after the whole benchmark has run.
+    reference = None
+    if compare is not None:
+        try:
+            reference = load_baseline(compare)
+        except FileNotFoundError:
+            return ActionTwoResult(error=f"No baseline named '{compare}' — save one with --save-baseline")
+        except (OSError, ValueError) as exc:
+            return ActionTwoResult(error=f"Cannot read baseline '{compare}': {exc}")
+
+    try:
+        func = load_target(target)
+    except CommandTimeoutError as exc:
+        return ActionTwoResult(error=exc.message)
+    except Exception as exc_raw:
+        e = CommandExecutionError(
+            f"Cannot load target '{target}': {exc_raw}",
+            command_name="action-two",
+            original=exc_raw,
+        )
+        return ActionTwoResult(error=e.message)
+
+    try:
+        for i in range(warmup):
+            report(progress, "warmup", i, warmup)
+            func()
+        if loops == 0:
+            report(progress, "calibrating")
+            loops = _calibrate(func)
+        digits = precision if recorder == "hdr" else None
+        if workers == 1:
+            values, timed_out = _run_sequential(func, option, loops, progress, digits)
+            cores: list[int] = []
+        else:
+            values, workers, cores, timed_out = _run_parallel(
+                target, option, warmup, loops, workers, progress, digits
+            )
+    except CommandTimeoutError as exc:  # still warming up or calibrating
+        return ActionTwoResult(error=exc.message)
+    except Exception as exc_raw:
+        e = CommandExecutionError(
+            f"Target '{target}' raised {type(exc_raw).__name__}: {exc_raw}",
+            command_name="action-two",
+            original=exc_raw,
         )
+        return ActionTwoResult(error=e.message)
+
+    if isinstance(values, HdrHistogram):
+        if not values.total_count:
+            return ActionTwoResult(error="Timed out before the first timed round finished")
+        result = _build_hdr_result(values, loops=loops, warmup=warmup)
+    else:
+        if not values:
+            return ActionTwoResult(error="Timed out before the first timed round finished")
+        result = _build_result(values, loops=loops, warmup=warmup)
+    result.workers = workers
+    result.cores = cores
+    if reference is not None:
+        _compare(result, compare, reference)
+    if timed_out:
+        # A truncated run reports what it measured, but never gates a deploy
+        # or replaces a baseline.
+        result.timed_out = True
+        result.exit_code = EXIT_TIMEOUT
+    elif save_baseline_as is not None:
+        try:
+            result.saved_to = save_baseline(save_baseline_as, values)
+        except (OSError, ValueError) as exc:
+            return ActionTwoResult(error=f"Cannot save baseline '{save_baseline_as}': {exc}")
+    return result
+
+
+def table_view(result: ActionTwoResult) -> TableView:
+    """Table-mode presentation of an `ActionTwoResult` (see `commands/registry.py`)."""
+    return TableView(
+        rows=[
+            ["Rounds",      str(result.iterations)],
+            ["Workers",     str(result.workers)],
+            ["Cores",       ", ".join(map(str, result.cores)) or "-"],
+            ["Loops/round", f"{result.loops:,}"],
+            ["Outliers",    str(result.outliers)],
+            ["Median",      format_duration(result.median_value)],
+            ["Average",     format_duration(result.avg_value)],
+            ["Stddev",      format_duration(result.stddev_value)],
+            ["IQR",         format_duration(result.iqr_value)],
+            ["Min",         format_duration(result.min_value)],
+            ["p50",         format_duration(result.p50_value)],
+            ["p95",         format_duration(result.p95_value)],
+            ["p99",         format_duration(result.p99_value)],
+            ["p99.9",       format_duration(result.p999_value)],
+            ["Max",         format_duration(result.max_value)],
+            *_recorder_rows(result),
+            *_baseline_rows(result),
+        ],
+        message=_message(result),
+        **_distribution(result),
+        distribution_title="Per-call latency",
+        distribution_label=format_duration,
+    )
+
+
+def _recorder_rows(result: ActionTwoResult) -> list[list[str]]:
+    """Extra table rows describing the HDR recorder, if one was used."""
+    if result.histogram is None:
+        return []
+    return [
+        ["Recorder",    f"hdr, {result.histogram.significant_digits} digits"],
+        ["Error bound", f"±{100.0 * result.relative_error:.3g}%"],
+        ["Memory",      f"{len(result.histogram.counts) * 8 / 1024:,.0f} KiB"],
+    ]
+
+
+def _distribution(result: ActionTwoResult) -> dict:
+    """Histogram input for the table view: raw samples, or weighted HDR counters."""
+    if result.histogram is None:
+        return {"distribution": result.values}
+    values = array("d")
+    weights: list[int] = []
+    for value, count in result.histogram.iter_counts():
+        values.append(value / _HDR_UNIT)
+        weights.append(count)
+    return {"distribution": values, "distribution_weights": weights}
+
+
+def _baseline_rows(result: ActionTwoResult) -> list[list[str]]:
+    """Extra table rows describing the baseline comparison, if one was made."""
+    if result.baseline is None:
+        return []
+    return [
+        ["Baseline",        result.baseline],
+        ["Baseline median", format_duration(result.baseline_median)],
+        ["Change",          f"{result.change_pct:+.2f}%"],
+        ["p-value",         f"{result.p_value:.4g}"],
+        ["Verdict",         "REGRESSION" if result.regression else "ok"],
+    ]
+
+
+def _message(result: ActionTwoResult) -> str:
+    """Success line for table mode, mentioning the comparison and the saved baseline."""
+    done = "Timed out, partial run" if result.timed_out else "Done"
+    message = f"{done} — {result.iterations} rounds x {result.loops:,} loops"
+    if result.baseline is not None:
+        verdict = "significantly slower than" if result.regression else "no significant slowdown vs"
+        message += f"; {verdict} '{result.baseline}' ({result.change_pct:+.2f}%)"
+    if result.saved_to:
+        message += f"; saved baseline to {result.saved_to}"
+    return message
+
+
+def _compare(result: ActionTwoResult, name: str, reference) -> None:
+    """Fill in the baseline fields of *result* by testing its samples against *reference*."""
+    base_median = median(reference)
+    new_median = median(result.values)
+    _, p_value = mann_whitney_u(result.values, reference)
+    result.baseline = name
+    result.baseline_median = base_median
+    result.change_pct = (new_median / base_median - 1.0) * 100.0 if base_median else 0.0
+    result.p_value = p_value
+    result.regression = p_value < REGRESSION_ALPHA and new_median > base_median
+    result.exit_code = EXIT_REGRESSION if result.regression else 0
 
-    # Simulate work so the spinner is visible during the demo.
-    # Remove or replace this line with real I/O / computation.
-    time.sleep(1.5)
-
-    # ── TODO: replace this block with real logic ──────────────────────────────
-    # Example shape of real logic:
-    #
-    #   try:
-    #       raw_values = []
-    #       for _ in range(option):
-    #           t0 = time.perf_counter()
-    #           your_function(target)
-    #           raw_values.append(time.perf_counter() - t0)
-    #   except YourError as exc:
-    #       return ActionTwoResult(error=str(exc))
-    #
-    #   total = sum(raw_values)
-    #   return ActionTwoResult(
-    #       iterations=option,
-    #       total_value=round(total, 4),
-    #       avg_value=round(total / option, 6),
-    #       min_value=min(raw_values),
-    #       max_value=max(raw_values),
-    #       values=raw_values,
-    #       error=None,
-    #   )
-    #
-    # Until then, random values keep the visual demo functional:
-
-    values = [round(random.uniform(0.03, 0.08), 4) for _ in range(option)]
-    total_value = round(sum(values), 4)
-    avg_value = round(total_value / option, 6)
-
-    # ── end TODO ──────────────────────────────────────────────────────────────
 
+def _build_result(values: array, loops: int, warmup: int) -> ActionTwoResult:
+    """Summarize raw per-call samples into an `ActionTwoResult`."""
+    s = summarize(values)
     return ActionTwoResult(
-        iterations=option,
-        total_value=total_value,
-        avg_value=avg_value,
-        min_value=min(values),
-        max_value=max(values),
+        iterations=len(values),
+        total_value=s.total,
+        avg_value=s.mean,
+        min_value=s.minimum,
+        max_value=s.maximum,
+        median_value=s.median,
+        stddev_value=s.stddev,
+        iqr_value=s.iqr,
+        p50_value=s.p50,
+        p95_value=s.p95,
+        p99_value=s.p99,
+        p999_value=s.p999,
+        outliers=s.outliers,
+        loops=loops,
+        warmup=warmup,
         values=values,
         error=None,
     )
+
+
+def _build_hdr_result(hist: HdrHistogram, loops: int, warmup: int) -> ActionTwoResult:
+    """Summarize an HDR histogram of picosecond samples into an `ActionTwoResult`."""
+    def at(pct: float) -> float:
+        return hist.value_at_percentile(pct) / _HDR_UNIT
+
+    mean = hist.mean() / _HDR_UNIT
+    return ActionTwoResult(
+        iterations=hist.total_count,
+        total_value=mean * hist.total_count,
+        avg_value=mean,
+        min_value=hist.min_value / _HDR_UNIT,
+        max_value=hist.max_value / _HDR_UNIT,
+        median_value=at(50.0),
+        stddev_value=hist.stddev() / _HDR_UNIT,
+        iqr_value=at(75.0) - at(25.0),
+        p50_value=at(50.0),
+        p95_value=at(95.0),
+        p99_value=at(99.0),
+        p999_value=at(99.9),
+        loops=loops,
+        warmup=warmup,
+        recorder="hdr",
+        histogram=hist,
+        relative_error=hist.relative_error(),
+        error=None,
+    )
+
+
+def _new_histogram(digits: int) -> HdrHistogram:
+    """Empty picosecond histogram keeping *digits* significant digits."""
+    return HdrHistogram(highest=_HDR_HIGHEST, significant_digits=digits)
+
+
+def _to_picoseconds(sample: float) -> int:
+    """Convert a per-call sample in seconds to HDR units, clamped to the trackable range."""
+    return min(int(sample * _HDR_UNIT), _HDR_HIGHEST)
+
+
+def _run_sequential(
+    func: Callable[[], object],
+    rounds: int,
+    loops: int,
+    progress: ProgressCallback | None,
+    digits: int | None = None,
+) -> tuple[array | HdrHistogram, bool]:
+    """Time *rounds* rounds in-process, reporting the last and best sample after each.
+
+    Samples go into an `array('d')`, or into an `HdrHistogram` with *digits*
+    significant digits when *digits* is given.  Returns the samples and
+    whether a timeout stopped the loop early (the interrupted round is lost).
+    """
+    if digits is None:
+        values = array("d")
+        record = values.append
+    else:
+        values = _new_histogram(digits)
+
+        def record(sample: float) -> None:
+            values.record(_to_picoseconds(sample))
+
+    best = float("inf")
+    try:
+        for i in range(rounds):
+            sample = _time_round(func, loops) / loops
+            record(sample)
+            best = min(best, sample)
+            report(progress, "timing", i + 1, rounds, {
+                "last": format_duration(sample),
+                "best": format_duration(best),
+            })
+    except CommandTimeoutError:
+        return values, True
+    return values, False
+
+
+def _run_parallel(
+    target: str,
+    rounds: int,
+    warmup: int,
+    loops: int,
+    workers: int,
+    progress: ProgressCallback | None = None,
+    digits: int | None = None,
+) -> tuple[array | HdrHistogram, int, list[int], bool]:
+    """Split *rounds* over *workers* processes and merge their samples.
+
+    With *digits* set, each worker records into its own `HdrHistogram` and
+    ships it back encoded with `to_bytes` (a few KiB, however many rounds it
+    ran); the parent merges them into one.
+
+    Returns the merged samples (in worker order), the number of workers that
+    actually ran (never more than *rounds*), the CPU ids they were pinned
+    to, and whether a timeout struck.  With more workers than CPUs, cores
+    are assigned round-robin.  On a timeout the workers still running are
+    terminated and only the finished ones are merged.
+    Workers are started with the "spawn" method so they never inherit the
+    parent's threads (e.g. a running spinner) or its profiler state.
+    """
+    # Imported here: multiprocessing costs ~10 ms and sequential runs never need it.
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    workers = min(workers, rounds)
+    available = _available_cores()
+    pins = [available[i % len(available)] for i in range(workers)] if available else [None] * workers
+    share, extra = divmod(rounds, workers)
+    ctx = multiprocessing.get_context("spawn")
+    report(progress, "timing", 0, rounds, {"workers": str(workers)})
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        futures = {
+            pool.submit(
+                _worker_rounds,
+                target,
+                share + (1 if i < extra else 0),
+                max(warmup, 1),  # each worker is a cold interpreter
+                loops,
+                pins[i],
+                digits,
+            ): share + (1 if i < extra else 0)
+            for i in range(workers)
+        }
+        done = 0
+        timed_out = False
+        try:
+            for future in as_completed(futures):
+                future.result()
+                done += futures[future]
+                report(progress, "timing", done, rounds, {"workers": str(workers)})
+        except CommandTimeoutError:
+            timed_out = True
+            finished = [f for f in futures if f.done() and not f.exception()]
+            for worker in multiprocessing.active_children():
+                worker.terminate()
+            futures = dict.fromkeys(finished)
+        if digits is None:
+            values = array("d")
+            for future in futures:
+                values.extend(future.result())
+        else:
+            values = _new_histogram(digits)
+            for future in futures:
+                values.merge(HdrHistogram.from_bytes(future.result()))
+    return values, workers, sorted({core for core in pins if core is not None}), timed_out
+
+
+def _available_cores() -> list[int]:
+    """Return the CPU ids this process may run on, or [] if pinning is unsupported."""
+    if not hasattr(os, "sched_getaffinity"):
+        return []
+    return sorted(os.sched_getaffinity(0))
+
+
+def _worker_rounds(
+    target: str, rounds: int, warmup: int, loops: int, core: int | None, digits: int | None
+) -> array | bytes:
+    """Process-pool entry point: pin to *core*, warm up, and time *rounds* rounds.
+
+    Returns the samples as an `array('d')`, or an encoded `HdrHistogram` when
+    *digits* is given.
+    """
+    if core is not None:
+        os.sched_setaffinity(0, {core})
+    func = load_target(target)
+    for _ in range(warmup):
+        func()
+    if digits is None:
+        return array("d", (_time_round(func, loops) / loops for _ in range(rounds)))
+    hist = _new_histogram(digits)
+    for _ in range(rounds):
+        hist.record(_to_picoseconds(_time_round(func, loops) / loops))
+    return hist.to_bytes()
+
+
+def _calibrate(func: Callable[[], object]) -> int:
+    """Return the smallest power-of-two loop count whose round lasts `CALIBRATION_TARGET_S`.
+
+    Capped at `MAX_LOOPS`, which is returned as is when even that is too fast.
+    """
+    loops = 1
+    while loops < MAX_LOOPS:
+        if _time_round(func, loops) >= CALIBRATION_TARGET_S:
+            break
+        loops = min(loops * 2, MAX_LOOPS)
+    return loops
+
+
+def _time_round(func: Callable[[], object], loops: int) -> float:
+    """Call *func* *loops* times with the GC disabled and return the elapsed seconds."""
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        it = range(loops)
+        start = time.perf_counter()
+        for _ in it:
+            func()
+        return time.perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
@@ -0,0 +1,83 @@
+"""Benchmark baselines — raw action-two samples saved for later comparison.
+
+A baseline is the complete list of per-call samples from one
+`run_action_two` run, stored as packed little-endian doubles
+(`array('d')`) behind an 8-byte magic header: 8 bytes per sample, no
+parsing, and `array.fromfile` loads it in a single read.  Files live in
+`<results dir>/baselines/<name>.f64` (see `commands/_paths.py`), so a
+baseline saved on one branch can gate a benchmark run on another.
+
+Usage:
+    from commands.baseline import load_baseline, save_baseline
+
+    save_baseline("main", result.values)
+    reference = load_baseline("main")
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+from array import array
+from typing import Iterable
+
+from commands._paths import results_dir
+
+_MAGIC = b"CLSBL\x00\x01\x00"  # "CLSBL", format version 1, reserved byte
+_SUFFIX = ".f64"
+_NAME_RE = re.compile(r"^[\w.-]+$")
+
+
+def baseline_path(name: str) -> str:
+    """Return the file holding baseline *name*.
+
+    Raises:
+        ValueError: *name* is empty or contains characters other than
+                    letters, digits, "_", "-" and ".".
+    """
+    if not _NAME_RE.match(name) or name in (".", ".."):
+        raise ValueError(f"invalid baseline name '{name}' (use letters, digits, '_', '-', '.')")
+    return os.path.join(results_dir("baselines"), name + _SUFFIX)
+
+
+def save_baseline(name: str, values: Iterable[float]) -> str:
+    """Write *values* as baseline *name*, replacing any previous one; return the path."""
+    path = baseline_path(name)
+    if isinstance(values, array) and values.typecode == "d" and sys.byteorder == "little":
+        data = values  # already in the on-disk layout; write it without a copy
+    else:
+        data = array("d", values)
+        if sys.byteorder == "big":
+            data.byteswap()
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as fh:
+            fh.write(_MAGIC)
+            data.tofile(fh)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+    return path
+
+
+def load_baseline(name: str) -> array:
+    """Read baseline *name* back as an `array('d')`.
+
+    Raises:
+        FileNotFoundError: No baseline with that name has been saved.
+        ValueError:        The file is not a baseline or is truncated.
+    """
+    path = baseline_path(name)
+    with open(path, "rb") as fh:
+        if fh.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"'{path}' is not a clisoft baseline file")
+        size = os.fstat(fh.fileno()).st_size - len(_MAGIC)
+        if size % 8:
+            raise ValueError(f"'{path}' is truncated")
+        data = array("d")
+        data.fromfile(fh, size // 8)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data
@@ -0,0 +1,243 @@
+"""Batch execution — run one command over many targets with a bounded pool.
+
+`run_batch` yields a `BatchItem` per target *as each one finishes*, so the
+caller can print or serialize results while the rest are still running.
+At most `2 * jobs` targets are in flight at any time, which keeps memory
+flat for target lists of any length (including unbounded stdin streams).
+
+A failure in one target — an error result, or an exception escaping the
+command — is recorded on its `BatchItem` and never stops the others.
+
+Executors:
+  process  (default) Each target runs in a worker process.  Required for
+           commands that use process-global state (tracemalloc, cProfile's
+           profiler hook), and the only way to use more than one core.
+  thread   Lower overhead; fine for I/O-bound commands.
+  async    Every target is a task on one asyncio event loop in this
+           thread, so `async def` commands overlap their I/O without a
+           thread or process each; `jobs` (default `ASYNC_DEFAULT_JOBS`)
+           caps the tasks in flight.  Synchronous commands fall back to the
+           loop's default thread pool.
+
+Usage:
+    from commands.batch import read_targets, run_batch
+
+    for item in run_batch(spec, read_targets("targets.txt"), kwargs, jobs=8):
+        ...
+"""
+
+from __future__ import annotations
+
+import contextlib
+import multiprocessing
+import os
+import sys
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator
+
+from commands.cache import run_cached, run_cached_async
+from exceptions import CLISoftError
+
+EXECUTORS = ("process", "thread", "async")
+
+# Default concurrency of the async executor: tasks waiting on I/O are cheap,
+# so it is not tied to the CPU count.
+ASYNC_DEFAULT_JOBS = 32
+
+
+@dataclass
+class BatchItem:
+    """Outcome of one target in a batch.
+
+    Fields:
+        target:    The target string as read from the targets file.
+        result:    The command's result dataclass, or None if the command
+                   raised before returning one.
+        cache_hit: True if the result came from the on-disk cache.
+        error:     Non-None string if this target failed (copied from
+                   `result.error`, or the escaped exception).
+    """
+
+    target: str
+    result: Any = None
+    cache_hit: bool = False
+    error: str | None = None
+
+
+def read_targets(path: str) -> Iterator[str]:
+    """Yield targets from *path* ("-" for stdin), one per line.
+
+    Blank lines and lines starting with "#" are skipped.  The file is read
+    lazily, so a producer piping targets into stdin is consumed as it writes.
+    """
+    fh = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in fh:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+
+
+def run_batch(
+    spec,
+    targets: Iterable[str],
+    kwargs: dict,
+    jobs: int | None = None,
+    executor: str = "process",
+    use_cache: bool = True,
+    quiet: bool = False,
+    timeout: float | None = None,
+    isolate: bool | None = None,
+) -> Iterator[BatchItem]:
+    """Run *spec*'s command on every target and yield results in completion order.
+
+    Args:
+        spec:      The `CommandSpec` to run.
+        targets:   Any iterable of target strings; consumed lazily.
+        kwargs:    Options passed to every invocation.
+        jobs:      Pool size; defaults to the number of usable CPUs
+                   (`ASYNC_DEFAULT_JOBS` for the async executor).
+        executor:  One of `EXECUTORS` (see module docstring).
+        use_cache: Passed through to `commands.cache.run_cached`.
+        quiet:     Redirect whatever the targets print to stderr inside
+                   worker processes, so the parent's stdout stays parseable.
+        timeout:   Per-target time limit, passed through to `run_cached`.
+        isolate:   Run each target in its own child interpreter, passed
+                   through to `run_cached`.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+    if executor not in EXECUTORS:
+        raise ValueError(f"executor must be one of {', '.join(EXECUTORS)}, got '{executor}'")
+    if executor == "async":
+        yield from _run_batch_async(
+            spec, targets, kwargs, jobs or ASYNC_DEFAULT_JOBS, use_cache, timeout, isolate
+        )
+        return
+    jobs = jobs or _usable_cpus()
+
+    if executor == "process":
+        pool = ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        pool = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="clisoft-batch")
+
+    with pool:
+        pending: dict = {}
+        it = iter(targets)
+        exhausted = False
+        while pending or not exhausted:
+            # Top the window up to 2 * jobs in-flight targets.
+            while not exhausted and len(pending) < 2 * jobs:
+                target = next(it, None)
+                if target is None:
+                    exhausted = True
+                    break
+                pending[pool.submit(
+                    _run_one, spec, target, kwargs, use_cache, quiet, timeout, isolate
+                )] = target
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                target = pending.pop(future)
+                try:
+                    yield future.result()
+                except Exception as exc:  # worker crashed or result failed to unpickle
+                    yield BatchItem(target=target, error=f"{type(exc).__name__}: {exc}")
+
+
+def _run_batch_async(
+    spec, targets: Iterable[str], kwargs: dict, jobs: int, use_cache: bool,
+    timeout: float | None, isolate: bool | None,
+) -> Iterator[BatchItem]:
+    """The async executor: same window and completion-order contract as `run_batch`.
+
+    The generator owns a private event loop and only runs it while waiting
+    for the next finished target, so the caller renders results outside the
+    loop exactly as with the pool executors.  Nothing is redirected: tasks
+    share this process's stdout, which the caller swaps out itself.
+    """
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    loop = asyncio.new_event_loop()
+    # An explicit pool for synchronous commands, so cleanup never has to
+    # start a thread (as `loop.shutdown_default_executor` does) — the
+    # generator may be finalized during interpreter shutdown.
+    threads = ThreadPoolExecutor(max_workers=min(jobs, _usable_cpus() + 4),
+                                 thread_name_prefix="clisoft-batch")
+    loop.set_default_executor(threads)
+    pending: dict = {}
+    try:
+        it = iter(targets)
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < 2 * jobs:
+                target = next(it, None)
+                if target is None:
+                    exhausted = True
+                    break
+                task = loop.create_task(_run_one_async(
+                    spec, target, kwargs, use_cache, timeout, isolate
+                ))
+                pending[task] = target
+            if not pending:
+                break
+            done, _ = loop.run_until_complete(
+                asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            )
+            for task in done:
+                pending.pop(task)
+                yield task.result()
+    finally:
+        # Pending tasks are left only when the caller stopped iterating early.
+        abandoned = bool(pending)
+        for task in pending:
+            task.cancel()
+        if abandoned:
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.close()
+        threads.shutdown(wait=not abandoned, cancel_futures=True)
+
+
+async def _run_one_async(
+    spec, target: str, kwargs: dict, use_cache: bool, timeout: float | None,
+    isolate: bool | None,
+) -> BatchItem:
+    """Async executor task: like `_run_one`, on the event loop."""
+    try:
+        result, hit = await run_cached_async(spec, target, kwargs, enabled=use_cache,
+                                             timeout=timeout, isolate=isolate)
+    except CLISoftError as exc:  # e.g. CommandTimeoutError: already user-facing
+        return BatchItem(target=target, error=exc.message)
+    except Exception as exc:
+        return BatchItem(target=target, error=f"{type(exc).__name__}: {exc}")
+    return BatchItem(target=target, result=result, cache_hit=hit, error=result.error)
+
+
+def _run_one(
+    spec, target: str, kwargs: dict, use_cache: bool, quiet: bool, timeout: float | None,
+    isolate: bool | None,
+) -> BatchItem:
+    """Pool entry point: run one target, converting escaped exceptions into an error item."""
+    # Only worker *processes* may swap sys.stdout; threads share it with the
+    # parent, which handles redirection itself.
+    redirect = quiet and multiprocessing.parent_process() is not None
+    try:
+        with contextlib.redirect_stdout(sys.stderr) if redirect else contextlib.nullcontext():
+            result, hit = run_cached(spec, target, kwargs, enabled=use_cache,
+                                     timeout=timeout, isolate=isolate)
+    except CLISoftError as exc:  # e.g. CommandTimeoutError: already user-facing
+        return BatchItem(target=target, error=exc.message)
+    except Exception as exc:
+        return BatchItem(target=target, error=f"{type(exc).__name__}: {exc}")
+    return BatchItem(target=target, result=result, cache_hit=hit, error=result.error)
+
+
+def _usable_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
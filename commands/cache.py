@@ -0,0 +1,216 @@
+"""Persistent on-disk cache for command results.
+
+Profiling the same unchanged target twice gives the same answer, so results
+of commands registered with `cacheable=True` are pickled under
+`~/.cache/clisoft/results/` (see `commands/_paths.py`).
+
+Keys are content-addressed: a SHA-256 over the command name, the target
+string, every keyword option, and the (path, size, mtime_ns) of each source
+file behind the target (`commands._target.target_files`): the script or the
+profiled package, plus every local module it imports, however indirectly.
+Editing any of them changes the key, so stale results are never served —
+they simply age out.  Installed code (stdlib, site-packages) is not
+fingerprinted; after upgrading a dependency, pass `--no-cache`.
+
+Eviction:
+  - TTL:  entries older than `DEFAULT_TTL_S` are ignored and deleted on read.
+  - LRU:  after every store, the least recently *used* entries are deleted
+          until the directory is under `DEFAULT_MAX_BYTES`.  A hit refreshes
+          the entry's mtime, so mtime order is recency order; the creation
+          time used for the TTL is stored inside the entry itself.
+
+The cache never raises: any I/O or unpickling problem is treated as a miss.
+
+`run_cached` runs any command through `commands.runner.run_command`,
+blocking until it returns: an `async def` command gets its own event loop,
+and an isolated command or one with a timeout runs in a supervised child
+process (see `commands/supervisor.py`).  `run_cached_async` is the
+coroutine form for callers that already run a loop.  Callers that will not
+use the cache (a non-cacheable spec, `--no-cache`) call `commands.runner`
+directly; this module's imports (hashlib, pickle, the import scanner in
+`commands/_target.py`) are deferred until a key is hashed or an entry read.
+
+Usage:
+    from commands.cache import run_cached, run_cached_async
+
+    result, hit = run_cached(spec, target, kwargs, enabled=not args.no_cache)
+    result, hit = await run_cached_async(spec, target, kwargs)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import Any
+
+from commands._paths import cache_dir
+from commands.runner import run_command, run_command_async
+
+DEFAULT_TTL_S = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_SUFFIX = ".pickle"
+
+
+def cache_key(command: str, target: str, kwargs: dict) -> str:
+    """Return the hex digest identifying one (command, target, options, sources) tuple."""
+    import hashlib
+
+    from commands._target import target_files
+
+    h = hashlib.sha256()
+    h.update(json.dumps([command, target, sorted(kwargs.items())], default=repr).encode())
+    for path in target_files(target):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        h.update(f"\0{path}\0{st.st_size}\0{st.st_mtime_ns}".encode())
+    return h.hexdigest()
+
+
+def load(key: str, ttl_s: float = DEFAULT_TTL_S) -> Any | None:
+    """Return the cached result for *key*, or None on a miss or an expired entry."""
+    import pickle
+
+    path = _path(key)
+    try:
+        with open(path, "rb") as fh:
+            created, result = pickle.load(fh)
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError,
+            AttributeError, ImportError):
+        return None
+    if time.time() - created > ttl_s:
+        _unlink(path)
+        return None
+    try:
+        os.utime(path)  # mark as recently used for LRU eviction
+    except OSError:
+        pass
+    return result
+
+
+def store(key: str, result: Any, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+    """Persist *result* under *key*, then evict LRU entries above *max_bytes*."""
+    import pickle
+
+    path = _path(key)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as fh:
+            pickle.dump((time.time(), result), fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError):
+        _unlink(tmp)
+        return
+    _evict(max_bytes)
+
+
+def run_cached(
+    spec, target: str, kwargs: dict, enabled: bool = True, progress=None,
+    timeout: float | None = None, isolate: bool | None = None,
+) -> tuple[Any, bool]:
+    """Run *spec*'s command through the cache.
+
+    Returns (result, hit).  Non-cacheable specs, `enabled=False`, and failed
+    results (`result.error` set) bypass the cache entirely, as do results
+    that wrote a file (`result.output_file` set): a hit would skip writing
+    it.  *progress* is a `commands.progress` callback, passed on only to
+    specs that declare `reports_progress`; it is not part of the cache key.
+    An `async def` command is run to completion with `asyncio.run`.
+
+    *timeout* is in seconds; None uses the spec's `timeout_s`, and 0 (or a
+    spec without one) means no limit.  With a limit, the command runs under
+    `commands.supervisor.run_supervised`; results it cut short (`timed_out`
+    set) are returned but never cached.  *isolate* runs the command there
+    even without a limit, away from the CLI's own modules and allocations;
+    None uses the spec's `isolated`.
+
+    Raises:
+        CommandTimeoutError:   The command returned nothing before its timeout.
+        CommandExecutionError: The supervised child died without a result.
+    """
+    key, result = _lookup(spec, target, kwargs, enabled)
+    if result is not None:
+        return result, True
+    result = run_command(spec, target, kwargs, progress, timeout, isolate)
+    _store_result(key, result)
+    return result, False
+
+
+async def run_cached_async(
+    spec, target: str, kwargs: dict, enabled: bool = True, progress=None,
+    timeout: float | None = None, isolate: bool | None = None,
+) -> tuple[Any, bool]:
+    """Coroutine form of `run_cached` for callers already inside an event loop.
+
+    The command runs as described in `commands.runner.run_command_async`.
+    Cache reads and writes are small and stay on the loop.
+    """
+    key, result = _lookup(spec, target, kwargs, enabled)
+    if result is not None:
+        return result, True
+    result = await run_command_async(spec, target, kwargs, progress, timeout, isolate)
+    _store_result(key, result)
+    return result, False
+
+
+def _lookup(spec, target: str, kwargs: dict, enabled: bool) -> tuple[str | None, Any | None]:
+    """Return (cache key or None if caching is off for this call, cached result or None)."""
+    if not (enabled and getattr(spec, "cacheable", False)):
+        return None, None
+    key = cache_key(spec.name, target, kwargs)
+    return key, load(key)
+
+
+def _store_result(key: str | None, result: Any) -> None:
+    """Cache *result* under *key* unless caching is off or it failed, timed out, or wrote a file.
+
+    A result can also opt out with a false `cacheable` attribute, e.g. one
+    describing a live process rather than the target's source.
+    """
+    if key is None or result.error or getattr(result, "timed_out", False):
+        return
+    if not getattr(result, "cacheable", True):
+        return
+    if not getattr(result, "output_file", None):
+        store(key, result)
+
+
+def _path(key: str) -> str:
+    return os.path.join(cache_dir("results"), key + _SUFFIX)
+
+
+def _evict(max_bytes: int) -> None:
+    """Delete least-recently-used entries until the cache fits in *max_bytes*."""
+    entries = []
+    total = 0
+    try:
+        with os.scandir(cache_dir("results")) as it:
+            for entry in it:
+                if not entry.name.endswith(_SUFFIX):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+    except OSError:
+        return
+    if total <= max_bytes:
+        return
+    entries.sort()
+    for _mtime, size, path in entries:
+        if total <= max_bytes:
+            break
+        _unlink(path)
+        total -= size
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
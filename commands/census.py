@@ -0,0 +1,144 @@
+"""Object census — what the garbage collector is holding, counted by type.
+
+`take_census` walks every object the cycle collector tracks and folds it
+into per-type totals: how many instances, and their combined shallow size
+(`sys.getsizeof`).  Diffing two censuses shows which types grow; objects
+the collector freed from reference cycles (`gc.DEBUG_SAVEALL`, see
+`saving_cycles`) can be counted the same way with `census_of`.
+
+Memory stays flat however large the heap is:
+
+  - `iter_objects` is a generator that fetches one generation at a time
+    (`gc.get_objects(generation)`) and yields it in `CHUNK`-object slices,
+    so besides the generation's own pointer list (8 bytes per object, next
+    to the 50+ bytes of every tracked object) only one slice is live.
+  - Each slice is folded straight into a {type: [count, bytes]} dict, so
+    nothing per object outlives its slice — a 10M-object census holds a
+    few thousand dict entries, not 10M records.
+  - The collector is paused during the walk, so objects cannot move
+    between generations and be counted twice or missed.
+
+Sizes are shallow and only tracked objects are visited: strings, numbers,
+and other atomic objects are invisible except through the containers that
+hold them — and CPython stops tracking tuples and dicts that hold only
+atomic values, so those are missed too.  Treat the numbers as a census of
+container growth, not as an accounting of RSS.
+
+Usage:
+    from commands.census import diff_census, take_census
+
+    before = take_census()
+    ...
+    growth = diff_census(before, take_census())
+"""
+
+from __future__ import annotations
+
+import contextlib
+import gc
+import sys
+from itertools import repeat
+from typing import Callable, Iterator, Sequence
+
+CHUNK = 65_536
+
+# {type name: [count, shallow bytes]}
+Census = dict[str, list[int]]
+
+
+def iter_objects(chunk: int = CHUNK) -> Iterator[list]:
+    """Yield every gc-tracked object in lists of at most *chunk*, one generation at a time.
+
+    Pause the collector (`gc.disable`) while iterating, or objects promoted
+    between generations mid-walk are seen twice.
+    """
+    for generation in range(len(gc.get_count())):
+        objects = gc.get_objects(generation)
+        for start in range(0, len(objects), chunk):
+            yield objects[start:start + chunk]
+        del objects
+
+
+def take_census(on_chunk: Callable[[int], None] | None = None) -> Census:
+    """Count and size every gc-tracked object by type.
+
+    Args:
+        on_chunk: Called with the number of objects after each folded slice,
+                  e.g. to report progress on a large heap.
+    """
+    totals: dict[type, list[int]] = {}
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for objects in iter_objects():
+            _fold(objects, totals)
+            if on_chunk is not None:
+                on_chunk(len(objects))
+    finally:
+        if enabled:
+            gc.enable()
+    return _by_name(totals)
+
+
+def census_of(objects: Sequence, chunk: int = CHUNK) -> Census:
+    """Census of the objects in *objects* (e.g. `gc.garbage`), folded *chunk* at a time."""
+    totals: dict[type, list[int]] = {}
+    for start in range(0, len(objects), chunk):
+        _fold(objects[start:start + chunk], totals)
+    return _by_name(totals)
+
+
+def diff_census(before: Census, after: Census) -> dict[str, tuple[int, int]]:
+    """{type name: (count change, bytes change)} for every type whose totals changed."""
+    changes = {}
+    for name in before.keys() | after.keys():
+        count0, size0 = before.get(name, (0, 0))
+        count1, size1 = after.get(name, (0, 0))
+        if count1 != count0 or size1 != size0:
+            changes[name] = (count1 - count0, size1 - size0)
+    return changes
+
+
+@contextlib.contextmanager
+def saving_cycles() -> Iterator[list]:
+    """Keep every object the cycle collector frees while the block runs.
+
+    Sets `gc.DEBUG_SAVEALL`, so unreachable cycles land in `gc.garbage`
+    instead of being freed, and collects once more on exit so cycles still
+    pending are caught too.  Yields a list that, after the block, holds the
+    saved objects; `gc.garbage` is restored, and the objects are freed once
+    the caller drops that list.
+    """
+    flags = gc.get_debug()
+    known = len(gc.garbage)
+    saved: list = []
+    gc.set_debug(flags | gc.DEBUG_SAVEALL)
+    try:
+        yield saved
+        gc.collect()
+    finally:
+        gc.set_debug(flags)
+        saved.extend(gc.garbage[known:])
+        del gc.garbage[known:]
+
+
+def _fold(objects: list, totals: dict[type, list[int]]) -> None:
+    getsizeof = sys.getsizeof
+    for kind, size in zip(map(type, objects), map(getsizeof, objects, repeat(0))):
+        entry = totals.get(kind)
+        if entry is None:
+            totals[kind] = [1, size]
+        else:
+            entry[0] += 1
+            entry[1] += size
+
+
+def _by_name(totals: dict[type, list[int]]) -> Census:
+    census: Census = {}
+    for kind, (count, size) in totals.items():
+        module = getattr(kind, "__module__", None)
+        name = kind.__qualname__ if module in (None, "builtins") else f"{module}.{kind.__qualname__}"
+        entry = census.setdefault(name, [0, 0])
+        entry[0] += count
+        entry[1] += size
+    return census
@@ -0,0 +1,158 @@
+"""Call-tree export — collapsed stacks, speedscope JSON, and flame graph SVG.
+
+Every exporter consumes the same input: an iterable of `(frames, weight)`
+pairs, where *frames* is a root-first tuple of frame names and *weight* is a
+positive integer (samples, or microseconds for cProfile data).  This is the
+"collapsed stack" model used by Brendan Gregg's flamegraph.pl, speedscope,
+and most other flame graph tools.
+
+  collapsed   One "root;child;leaf weight" line per pair, written as the
+              pairs arrive — linear time, and memory does not grow with
+              the input.
+  speedscope  A speedscope "sampled" profile (https://www.speedscope.app).
+              Stacks stream into the samples array; only one int weight per
+              pair and the frame table (one entry per distinct function) are
+              held in memory and written at the end.
+  svg         A self-contained flame graph; hovering a frame shows its
+              weight and share in a tooltip.  The layout needs the merged
+              call tree, so memory is proportional to the number of distinct
+              call paths (not to the number of samples).
+
+Producers live with the profilers: `commands/action_one.py` turns sampled
+stacks or a cProfile caller graph into `(frames, weight)` pairs.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from html import escape
+from typing import IO, Iterable
+
+EXPORT_FORMATS = ("collapsed", "speedscope", "svg")
+
+# Default file suffix per format, used when no output path is given.
+SUFFIXES = {
+    "collapsed":  ".collapsed.txt",
+    "speedscope": ".speedscope.json",
+    "svg":        ".svg",
+}
+
+# ── SVG layout ────────────────────────────────────────────────────────────────
+_SVG_WIDTH = 1200
+_FRAME_HEIGHT = 16
+_FONT_SIZE = 11
+_CHAR_WIDTH = 6.6     # average glyph width at _FONT_SIZE in a monospace font
+_MIN_WIDTH_PX = 0.3   # frames narrower than this are not drawn
+
+
+def write_export(
+    fmt: str, stacks: Iterable[tuple[tuple[str, ...], int]], fh: IO[str], title: str, unit: str
+) -> None:
+    """Write *stacks* to the text stream *fh* in format *fmt*.
+
+    Args:
+        fmt:    One of `EXPORT_FORMATS`.
+        stacks: Iterable of (root-first frame names, weight) pairs.
+        fh:     Destination text stream.
+        title:  Profile name shown by speedscope and in the SVG header.
+        unit:   What a weight counts: "samples" or "microseconds".
+    """
+    if fmt == "collapsed":
+        write_collapsed(stacks, fh)
+    elif fmt == "speedscope":
+        write_speedscope(stacks, fh, title, unit)
+    elif fmt == "svg":
+        write_svg(stacks, fh, title, unit)
+    else:
+        raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}, got '{fmt}'")
+
+
+def write_collapsed(stacks: Iterable[tuple[tuple[str, ...], int]], fh: IO[str]) -> None:
+    """Write one "frame;frame;frame weight" line per pair."""
+    for frames, weight in stacks:
+        fh.write(";".join(name.replace(";", ":") for name in frames))
+        fh.write(f" {weight}\n")
+
+
+def write_speedscope(
+    stacks: Iterable[tuple[tuple[str, ...], int]], fh: IO[str], title: str, unit: str
+) -> None:
+    """Write a speedscope file-format document with one "sampled" profile."""
+    index: dict[str, int] = {}
+    weights: list[int] = []
+    fh.write('{"$schema": "https://www.speedscope.app/file-format-schema.json", ')
+    fh.write(f'"name": {json.dumps(title)}, "exporter": "clisoft", "activeProfileIndex": 0, ')
+    fh.write(f'"profiles": [{{"type": "sampled", "name": {json.dumps(title)}, ')
+    fh.write(f'"unit": {json.dumps("microseconds" if unit == "microseconds" else "none")}, ')
+    fh.write('"samples": [')
+    total = 0
+    for i, (frames, weight) in enumerate(stacks):
+        ids = [index.setdefault(name, len(index)) for name in frames]
+        fh.write(("," if i else "") + json.dumps(ids))
+        weights.append(weight)
+        total += weight
+    # Weights are plain ints (28 bytes each in a list); streaming them would
+    # need a second pass over *stacks*, which may be a one-shot generator.
+    fh.write(f'], "weights": {json.dumps(weights)}, "startValue": 0, "endValue": {total}}}], ')
+    fh.write('"shared": {"frames": [')
+    for i, name in enumerate(index):
+        fh.write(("," if i else "") + json.dumps({"name": name}))
+    fh.write("]}}\n")
+
+
+def write_svg(
+    stacks: Iterable[tuple[tuple[str, ...], int]], fh: IO[str], title: str, unit: str
+) -> None:
+    """Merge *stacks* into a call tree and write it as a flame graph SVG."""
+    # Node: [weight, {child name: node}]
+    root: list = [0, {}]
+    depth = 0
+    for frames, weight in stacks:
+        node = root
+        node[0] += weight
+        for name in frames:
+            node = node[1].setdefault(name, [0, {}])
+            node[0] += weight
+        depth = max(depth, len(frames))
+
+    total = root[0]
+    height = (depth + 3) * _FRAME_HEIGHT
+    fh.write(
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_SVG_WIDTH}" height="{height}" '
+        f'font-family="monospace" font-size="{_FONT_SIZE}">\n'
+        f'<rect width="100%" height="100%" fill="#fdfdf6"/>\n'
+        f'<text x="{_SVG_WIDTH / 2}" y="{_FRAME_HEIGHT}" text-anchor="middle" font-size="14">'
+        f'{escape(title)} — {total:,} {unit}</text>\n'
+    )
+    if total:
+        scale = _SVG_WIDTH / total
+        # (node name, node, x offset in px, depth); children drawn above parents.
+        todo = [("all", root, 0.0, 0)]
+        while todo:
+            name, node, x, level = todo.pop()
+            width = node[0] * scale
+            y = height - (level + 1) * _FRAME_HEIGHT
+            _svg_frame(fh, name, node[0], total, unit, x, y, width)
+            for child_name, child in node[1].items():
+                if child[0] * scale >= _MIN_WIDTH_PX:
+                    todo.append((child_name, child, x, level + 1))
+                x += child[0] * scale
+    fh.write("</svg>\n")
+
+
+def _svg_frame(
+    fh: IO[str], name: str, weight: int, total: int, unit: str, x: float, y: float, width: float
+) -> None:
+    """Write one flame graph rectangle with a tooltip and a label that fits it."""
+    hue = zlib.crc32(name.encode()) % 55  # stable warm colour per function
+    fits = int((width - 4) / _CHAR_WIDTH)
+    label = name if len(name) <= fits else name[: max(fits - 2, 0)] + ".."
+    fh.write(
+        f'<g><title>{escape(name)} ({weight:,} {unit}, {100.0 * weight / total:.2f}%)</title>'
+        f'<rect x="{x:.2f}" y="{y}" width="{width:.2f}" height="{_FRAME_HEIGHT - 1}" '
+        f'fill="hsl({hue},80%,60%)" rx="2"/>'
+    )
+    if len(label) > 2:
+        fh.write(f'<text x="{x + 3:.2f}" y="{y + _FRAME_HEIGHT - 4}">{escape(label)}</text>')
+    fh.write("</g>\n")
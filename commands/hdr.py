@@ -0,0 +1,223 @@
+"""HDR histogram — fixed-memory recorder for very long benchmark runs.
+
+A High Dynamic Range histogram (after Gil Tene's HdrHistogram) records
+integer values between `lowest` and `highest` with a guaranteed number of
+significant decimal digits.  Values are grouped into power-of-two buckets,
+each split into `2 * 10 ** significant_digits` (rounded up to a power of
+two) linear sub-buckets, so every recorded value is represented by a
+counter whose range is at most `10 ** -significant_digits` of the value:
+with 3 digits, a percentile read back as 1.000 ms is within ±1 µs of the
+true sample.
+
+Memory depends only on the configuration, never on the number of samples:
+the counts live in one `array('Q')` — about 350 KB for 3 digits over
+1 ps .. 1 hour.  Histograms with the same configuration `merge` by adding
+counts, so parallel workers each record into their own and the parent
+combines them.  `to_bytes` / `from_bytes` give a compact zlib-compressed
+encoding (and the object pickles, for process pools).
+
+Usage:
+    from commands.hdr import HdrHistogram
+
+    hist = HdrHistogram(highest=3_600 * 10**12, significant_digits=3)
+    hist.record(1_250_000)                 # one 1.25 µs sample, in ps
+    hist.value_at_percentile(99.9)
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+import sys
+import zlib
+from array import array
+from typing import Iterator
+
+_MAGIC = b"CLSHDR\x01\x00"
+_HEADER = struct.Struct("<8sBQQQQQ")  # magic, digits, lowest, highest, total, min, max
+
+
+class HdrHistogram:
+    """Fixed-memory histogram of non-negative integers with bounded relative error.
+
+    Args:
+        lowest:             Smallest value that must be distinguishable from
+                            0 (>= 1); values below it share the first bucket.
+        highest:            Largest value that can be recorded; larger ones
+                            raise ValueError.
+        significant_digits: Decimal digits of precision, 1..5.
+    """
+
+    def __init__(self, lowest: int = 1, highest: int = 3_600 * 10**12, significant_digits: int = 3):
+        if lowest < 1:
+            raise ValueError(f"lowest must be >= 1, got {lowest}")
+        if highest < 2 * lowest:
+            raise ValueError(f"highest must be >= 2 * lowest, got {highest}")
+        if not 1 <= significant_digits <= 5:
+            raise ValueError(f"significant_digits must be between 1 and 5, got {significant_digits}")
+        self.lowest = lowest
+        self.highest = highest
+        self.significant_digits = significant_digits
+
+        self._unit_magnitude = lowest.bit_length() - 1
+        largest_single_unit = 2 * 10 ** significant_digits
+        sub_bucket_count_magnitude = (largest_single_unit - 1).bit_length()
+        self._sub_half_magnitude = sub_bucket_count_magnitude - 1
+        self._sub_count = 1 << sub_bucket_count_magnitude
+        self._sub_half = self._sub_count >> 1
+        self._sub_mask = (self._sub_count - 1) << self._unit_magnitude
+
+        buckets = 1
+        smallest_untrackable = self._sub_count << self._unit_magnitude
+        while smallest_untrackable <= highest:
+            smallest_untrackable <<= 1
+            buckets += 1
+        self.counts = array("Q", bytes(8 * (buckets + 1) * self._sub_half))
+
+        self.total_count = 0
+        self.min_value = 0
+        self.max_value = 0
+
+    # ── Recording ─────────────────────────────────────────────────────────────
+
+    def record(self, value: int, count: int = 1) -> None:
+        """Add *count* occurrences of *value*.
+
+        Raises:
+            ValueError: *value* is negative or above `highest`.
+        """
+        if value < 0 or value > self.highest:
+            raise ValueError(f"value {value} outside the trackable range 0..{self.highest}")
+        self.counts[self._index(value)] += count
+        if not self.total_count or value < self.min_value:
+            self.min_value = value
+        if value > self.max_value:
+            self.max_value = value
+        self.total_count += count
+
+    def merge(self, other: HdrHistogram) -> None:
+        """Add every count of *other* (which must have the same configuration) to this one."""
+        if self._config() != other._config():
+            raise ValueError("cannot merge histograms with different lowest/highest/digits")
+        if not other.total_count:
+            return
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        if not self.total_count or other.min_value < self.min_value:
+            self.min_value = other.min_value
+        self.max_value = max(self.max_value, other.max_value)
+        self.total_count += other.total_count
+
+    # ── Queries ───────────────────────────────────────────────────────────────
+
+    def value_at_percentile(self, percentile: float) -> int:
+        """Return the highest value equivalent to the *percentile*-th recorded value (0–100)."""
+        if not self.total_count:
+            return 0
+        target = max(1, math.ceil(percentile / 100.0 * self.total_count))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if c:
+                seen += c
+                if seen >= target:
+                    return min(self._highest_equivalent(self._value_at(i)), self.max_value)
+        return self.max_value
+
+    def mean(self) -> float:
+        """Mean of the recorded values, using each counter's midpoint."""
+        if not self.total_count:
+            return 0.0
+        return sum(self._median_equivalent(v) * c for v, c in self._nonzero()) / self.total_count
+
+    def stddev(self) -> float:
+        """Sample standard deviation (n - 1) of the recorded values (counter midpoints).
+
+        Same estimator as `commands._stats.summarize`, so both sampling paths agree.
+        """
+        if self.total_count < 2:
+            return 0.0
+        mean = self.mean()
+        sq = sum((self._median_equivalent(v) - mean) ** 2 * c for v, c in self._nonzero())
+        return (sq / (self.total_count - 1)) ** 0.5
+
+    def iter_counts(self) -> Iterator[tuple[int, int]]:
+        """Yield (representative value, count) for every non-empty counter, ascending."""
+        for value, count in self._nonzero():
+            yield self._median_equivalent(value), count
+
+    def relative_error(self) -> float:
+        """Upper bound on |reported - true| / true for values >= `lowest` * 10 ** digits."""
+        return 1.0 / self._sub_half
+
+    # ── Serialization ─────────────────────────────────────────────────────────
+
+    def to_bytes(self) -> bytes:
+        """Encode the configuration and counts as a compact byte string."""
+        counts = self.counts
+        if sys.byteorder == "big":
+            counts = array("Q", counts)
+            counts.byteswap()
+        header = _HEADER.pack(_MAGIC, self.significant_digits, self.lowest, self.highest,
+                              self.total_count, self.min_value, self.max_value)
+        return header + zlib.compress(counts.tobytes(), 6)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> HdrHistogram:
+        """Decode a histogram written by `to_bytes`.
+
+        Raises:
+            ValueError: *data* is not an encoded histogram or is corrupt.
+        """
+        try:
+            magic, digits, lowest, highest, total, lo, hi = _HEADER.unpack_from(data)
+            raw = zlib.decompress(data[_HEADER.size:])
+        except (struct.error, zlib.error) as exc:
+            raise ValueError(f"not an encoded HDR histogram: {exc}") from exc
+        if magic != _MAGIC:
+            raise ValueError("not an encoded HDR histogram")
+        hist = cls(lowest, highest, digits)
+        counts = array("Q")
+        counts.frombytes(raw)
+        if len(counts) != len(hist.counts):
+            raise ValueError("encoded histogram has the wrong number of counters")
+        if sys.byteorder == "big":
+            counts.byteswap()
+        hist.counts = counts
+        hist.total_count, hist.min_value, hist.max_value = total, lo, hi
+        return hist
+
+    # ── Bucket arithmetic ─────────────────────────────────────────────────────
+
+    def _config(self) -> tuple[int, int, int]:
+        return self.lowest, self.highest, self.significant_digits
+
+    def _index(self, value: int) -> int:
+        bucket = (value | self._sub_mask).bit_length() - self._unit_magnitude - self._sub_half_magnitude - 1
+        sub = value >> (bucket + self._unit_magnitude)
+        return ((bucket + 1) << self._sub_half_magnitude) + sub - self._sub_half
+
+    def _value_at(self, index: int) -> int:
+        bucket = (index >> self._sub_half_magnitude) - 1
+        sub = (index & (self._sub_half - 1)) + self._sub_half
+        if bucket < 0:
+            sub -= self._sub_half
+            bucket = 0
+        return sub << (bucket + self._unit_magnitude)
+
+    def _range(self, value: int) -> int:
+        """Width of the counter that *value* falls into."""
+        bucket = (value | self._sub_mask).bit_length() - self._unit_magnitude - self._sub_half_magnitude - 1
+        return 1 << (self._unit_magnitude + bucket)
+
+    def _highest_equivalent(self, value: int) -> int:
+        return value + self._range(value) - 1
+
+    def _median_equivalent(self, value: int) -> int:
+        return value + (self._range(value) >> 1)
+
+    def _nonzero(self) -> Iterator[tuple[int, int]]:
+        for i, c in enumerate(self.counts):
+            if c:
+                yield self._value_at(i), c
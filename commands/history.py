@@ -0,0 +1,478 @@
+"""Run history — every fresh command result, kept in a local SQLite database.
+
+Results are recorded in `<data dir>/history.db` (see `commands/_paths.py`),
+one per-user database whichever directory the CLI runs from, one row per
+run:
+
+    runs(id, started, command, target, options, summary, rows)
+
+  started  Unix time the result was recorded.
+  target   The target as given, made absolute when it names an existing
+           file or directory, so a script's runs from any directory match.
+  options  The command's keyword options, as JSON.
+  summary  Every scalar field of the result (and list of scalars), as JSON
+           — `commands.summary.result_summary`, the split the
+           machine-readable formats use.  The fields listed in the command's
+           `CommandSpec.metrics` (`p95_value`, `peak_value`, ...) are the
+           metrics `history` trends.
+  rows     The result's row field as JSON when it is a list (profile rows,
+           allocation sites); NULL for sample arrays, which stay in the
+           cache and in baselines.
+
+Cache hits, failed runs, and runs cut short by a timeout are not recorded:
+they would repeat an earlier run or skew its trend.
+
+The database is written for many cheap appends and read for "the last N
+runs of one target":
+
+  - WAL journal with `synchronous=NORMAL`: a commit appends to the log
+    without an fsync, and readers never block the writer.
+  - `HistoryWriter` buffers results and inserts them with one
+    `executemany` per transaction, every `BATCH_SIZE` results or
+    `FLUSH_INTERVAL_S` seconds, so a batch run over 10k targets costs a
+    few dozen commits instead of 10k.
+  - Indexes on (target, started) and (command, target, started) answer a
+    trend query by walking one index range newest first until *last* runs
+    with the newest run's options are found — milliseconds however many
+    runs are stored.
+
+Recording never raises: a locked or unwritable database loses the record,
+not the command's result (the same contract as `commands/cache.py`).
+
+Usage:
+    from commands.history import HistoryWriter, record_run
+
+    record_run(spec, target, kwargs, result)
+    with HistoryWriter() as history:          # batch mode
+        for item in items:
+            history.add(spec, item.target, kwargs, item.result)
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import sqlite3
+import statistics
+import time
+from dataclasses import dataclass, field, fields, is_dataclass
+from typing import Any
+
+from commands._paths import data_dir
+from commands._stats import format_duration
+from commands.registry import TableView, get_command
+from commands.summary import result_summary
+from exceptions import UnknownCommandError
+
+BATCH_SIZE = 500
+FLUSH_INTERVAL_S = 2.0
+
+_SCHEMA_VERSION = 1
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id       INTEGER PRIMARY KEY,
+    started  REAL NOT NULL,
+    command  TEXT NOT NULL,
+    target   TEXT NOT NULL,
+    options  TEXT NOT NULL,
+    summary  TEXT NOT NULL,
+    rows     TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_by_target ON runs (target, started);
+CREATE INDEX IF NOT EXISTS runs_by_command ON runs (command, target, started);
+"""
+_INSERT = ("INSERT INTO runs (started, command, target, options, summary, rows) "
+           "VALUES (?, ?, ?, ?, ?, ?)")
+
+
+def history_path() -> str:
+    """Return the path of the history database (the file may not exist yet)."""
+    return os.path.join(data_dir(), "history.db")
+
+
+def connect(path: str | None = None) -> sqlite3.Connection:
+    """Open (and create or migrate) the history database in WAL mode.
+
+    Raises:
+        sqlite3.Error: The file is not a database, or is locked for longer
+                       than the 5-second busy timeout.
+    """
+    conn = sqlite3.connect(path or history_path(), timeout=5.0, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
+
+
+class HistoryWriter:
+    """Buffers results and appends them to the history in batched transactions.
+
+    Args:
+        path:  Database file; defaults to `history_path()`.
+        batch: Results buffered before a flush.
+
+    The database is opened on the first flush, so a writer that records
+    nothing never touches the disk.  Use it as a context manager, or call
+    `close()`, to flush what is still buffered.
+    """
+
+    def __init__(self, path: str | None = None, batch: int = BATCH_SIZE):
+        self._path = path
+        self._batch = batch
+        self._pending: list[tuple] = []
+        self._since = 0.0
+        self._conn: sqlite3.Connection | None = None
+
+    def add(self, spec, target: str, options: dict, result: Any) -> bool:
+        """Buffer *result* of *spec* on *target*; return False if it is not recordable."""
+        if not recordable(spec, result):
+            return False
+        if not self._pending:
+            self._since = time.monotonic()
+        self._pending.append(_record(spec, target, options, result))
+        if len(self._pending) >= self._batch or time.monotonic() - self._since >= FLUSH_INTERVAL_S:
+            self.flush()
+        return True
+
+    def flush(self) -> None:
+        """Insert every buffered result in one transaction; drop them if that fails."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        try:
+            if self._conn is None:
+                self._conn = connect(self._path)
+            with self._conn:  # BEGIN ... COMMIT, or ROLLBACK on error
+                self._conn.execute("BEGIN")
+                self._conn.executemany(_INSERT, pending)
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> HistoryWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def record_run(spec, target: str, options: dict, result: Any) -> None:
+    """Record one result right away (see `HistoryWriter` for many)."""
+    with HistoryWriter() as history:
+        history.add(spec, target, options, result)
+
+
+def recordable(spec, result: Any) -> bool:
+    """True if *result* is a complete, successful run of a spec that keeps history."""
+    return (
+        getattr(spec, "recorded", True)
+        and result is not None
+        and not result.error
+        and not getattr(result, "timed_out", False)
+    )
+
+
+# ── The `history` command ──────────────────────────────────────────────────────
+
+@dataclass
+class HistoryResult:
+    """Return value of `run_history`.
+
+    Only runs made with the newest run's command and options are compared,
+    so a cProfile count is never trended against a sampling one.
+
+    Fields:
+        rows:    With a metric, one row per run, newest first: run id,
+                 started (Unix time), the metric's value, and its change
+                 from the run before in %.  Without one, one row per
+                 metric: its unit, runs it appears in, latest, median, min,
+                 max, and latest vs median in %.
+        metric:  The metric trended, or "" for the per-metric summary.
+        unit:    Unit of `metric` (see `CommandSpec.metrics`).
+        runs:    Runs the rows were computed from.
+        command: Command those runs were made with.
+        options: Their options that differ from the command's defaults, as
+                 "k=v" pairs; "" when all are defaults.
+        error:   Non-None string on failure (no history, unknown metric).
+    """
+
+    rows: list[dict] = field(default_factory=list)
+    metric: str = ""
+    unit: str = ""
+    runs: int = 0
+    command: str = ""
+    options: str = ""
+    error: str | None = None
+
+
+def run_history(target: str, last: int = 30, metric: str | None = None,
+                command_name: str | None = None) -> HistoryResult:
+    """Trend the last *last* recorded runs of *target* made like the newest one.
+
+    Args:
+        target:       The target as it was passed to the command; a file or
+                      directory path may be relative to another directory.
+        last:         Number of most recent runs to read.
+        metric:       A measured field, e.g. "p95_value"; a name
+                      without the "_value" suffix ("p95") also matches.
+                      None summarizes every metric instead.
+        command_name: Only runs of this command; None for any.
+    """
+    path = history_path()
+    if not os.path.exists(path):
+        return HistoryResult(error=f"No run history yet ({path} does not exist)")
+    if last < 1:
+        return HistoryResult(error="--last must be at least 1")
+    try:
+        conn = connect(path)
+        try:
+            runs = _last_runs(conn, _target_key(target), last, command_name)
+        finally:
+            conn.close()
+    except sqlite3.Error as exc:
+        return HistoryResult(error=f"Cannot read run history {path}: {exc}")
+    if not runs:
+        scope = f" of {command_name}" if command_name else ""
+        return HistoryResult(error=f"No recorded runs{scope} for '{target}'")
+
+    units = {name: unit for run in runs for name, unit in run["units"].items()}
+    command = runs[0]["command"]
+    options = _changed_options(command, runs[0]["options"])
+    if metric is None:
+        return HistoryResult(rows=_metric_summary(runs, units), runs=len(runs),
+                             command=command, options=options)
+    names = {name for run in runs for name in run["metrics"]}
+    name = metric if metric in names else f"{metric}_value"
+    if name not in names:
+        return HistoryResult(
+            error=f"No metric '{metric}' in the last {len(runs)} runs; "
+                  f"available: {', '.join(sorted(names))}"
+        )
+    return HistoryResult(rows=_series(runs, name), metric=name, unit=units.get(name, ""),
+                         runs=len(runs), command=command, options=options)
+
+
+def table_view(result: HistoryResult) -> TableView:
+    """Table-mode presentation of a `HistoryResult` (see `commands/registry.py`)."""
+    if not result.metric:
+        rows = (
+            [r["metric"], r["runs"], _value(r["latest"], r["unit"]),
+             _value(r["median"], r["unit"]), _value(r["min"], r["unit"]),
+             _value(r["max"], r["unit"]), _pct(r["change_pct"])]
+            for r in result.rows
+        )
+        return TableView(
+            rows=rows,
+            message=f"{len(result.rows)} metrics over the last {result.runs} runs of {_setup(result)}",
+            columns=[
+                ("Metric", "bold cyan"), ("Runs", "dim"), ("Latest", "white"),
+                ("Median", "white"), ("Min", "white"), ("Max", "white"),
+                ("vs median", "yellow"),
+            ],
+        )
+    values = [r["value"] for r in result.rows]
+    unit = result.unit
+    rows = (
+        [r["run"], time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(r["started"])),
+         _value(r["value"], unit), _pct(r["change_pct"])]
+        for r in result.rows
+    )
+    return TableView(
+        rows=rows,
+        message=(
+            f"{result.metric} over the last {result.runs} runs of {_setup(result)} — "
+            f"latest {_value(values[0], unit)}, "
+            f"median {_value(statistics.median(values), unit)}, "
+            f"min {_value(min(values), unit)}, max {_value(max(values), unit)}"
+        ),
+        columns=[
+            ("Run", "dim"), ("Started", "white"), (result.metric, "white"), ("Change", "yellow"),
+        ],
+    )
+
+
+def _setup(result: HistoryResult) -> str:
+    """The command and non-default options the runs share, e.g. "action-one (mode=sample)"."""
+    return f"{result.command} ({result.options or 'default options'})"
+
+
+def _last_runs(conn: sqlite3.Connection, target: str, last: int,
+               command_name: str | None) -> list[dict]:
+    """The newest *last* runs of *target* with the newest run's command and options.
+
+    Runs are newest first, with their metrics parsed.  Each run's "metrics"
+    are the fields its command declares in `CommandSpec.metrics`, and
+    "units" maps them to their units.  Options are compared as stored
+    (JSON with sorted keys); runs made with other ones are skipped, and the
+    index walk stops once *last* runs have matched.
+    """
+    if command_name is None:
+        cursor = conn.execute(
+            "SELECT id, started, command, options, summary FROM runs "
+            "WHERE target = ? ORDER BY started DESC",
+            (target,),
+        )
+    else:
+        cursor = conn.execute(
+            "SELECT id, started, command, options, summary FROM runs "
+            "WHERE command = ? AND target = ? ORDER BY started DESC",
+            (command_name, target),
+        )
+    runs = []
+    setup = None
+    measured: dict[str, dict[str, str] | None] = {}
+    for run_id, started, command, options, summary in cursor:
+        if setup is None:
+            setup = (command, options)
+        elif (command, options) != setup:
+            continue
+        if command not in measured:
+            measured[command] = _measured(command)
+        metrics = _metrics(json.loads(summary), measured[command])
+        units = measured[command] or {}
+        runs.append({
+            "id": run_id,
+            "started": started,
+            "command": command,
+            "options": json.loads(options),
+            "metrics": metrics,
+            "units": {name: units.get(name, "") for name in metrics},
+        })
+        if len(runs) == last:
+            break
+    cursor.close()
+    return runs
+
+
+def _measured(command: str) -> dict[str, str] | None:
+    """*command*'s `CommandSpec.metrics`, or None (every numeric field) if it declares none."""
+    try:
+        return get_command(command).metrics or None
+    except UnknownCommandError:
+        return None
+
+
+def _metrics(summary: dict, measured: dict[str, str] | None) -> dict[str, float]:
+    """The finite numeric (not boolean) fields of a stored summary that are in *measured*."""
+    return {
+        name: value for name, value in summary.items()
+        if (measured is None or name in measured)
+        and isinstance(value, (int, float)) and not isinstance(value, bool)
+        and math.isfinite(value)
+    }
+
+
+def _series(runs: list[dict], name: str) -> list[dict]:
+    """One row per run that has metric *name*, newest first, with the change from the run before."""
+    runs = [run for run in runs if name in run["metrics"]]
+    rows = []
+    for i, run in enumerate(runs):
+        value = run["metrics"][name]
+        previous = runs[i + 1]["metrics"][name] if i + 1 < len(runs) else None
+        rows.append({
+            "run": run["id"],
+            "started": run["started"],
+            "value": value,
+            "change_pct": _change(value, previous),
+        })
+    return rows
+
+
+def _metric_summary(runs: list[dict], units: dict[str, str]) -> list[dict]:
+    """One row per metric across *runs* (newest first): latest, median, min, max."""
+    series: dict[str, list[float]] = {}
+    for run in runs:
+        for name, value in run["metrics"].items():
+            series.setdefault(name, []).append(value)
+    rows = []
+    for name in sorted(series):
+        values = series[name]
+        median = statistics.median(values)
+        rows.append({
+            "metric": name,
+            "unit": units.get(name, ""),
+            "runs": len(values),
+            "latest": values[0],
+            "median": median,
+            "min": min(values),
+            "max": max(values),
+            "change_pct": _change(values[0], median),
+        })
+    return rows
+
+
+def _changed_options(command: str, options: dict) -> str:
+    """"k=v" for each option that differs from *command*'s current default."""
+    try:
+        defaults = {a.dest: a.default for a in get_command(command).arguments}
+    except UnknownCommandError:
+        defaults = {}
+    return " ".join(
+        f"{name}={value}" for name, value in options.items()
+        if name not in defaults or defaults[name] != value
+    )
+
+
+def _change(value: float, reference: float | None) -> float | None:
+    if reference is None or reference == 0:
+        return None
+    return (value - reference) / abs(reference) * 100.0
+
+
+def _value(value: float, unit: str) -> str:
+    """*value* in *unit*, formatted as the command's own table shows it."""
+    if unit == "s":
+        return format_duration(value)
+    if unit == "KB":
+        return f"{value:,.2f} KB"
+    return _num(value)
+
+
+def _num(value: float) -> str:
+    if float(value).is_integer() and abs(value) < 1e15:
+        return f"{value:,.0f}"  # counts, and medians of counts
+    return f"{value:.6g}"
+
+
+def _pct(value: float | None) -> str:
+    return "—" if value is None else f"{value:+.1f}%"
+
+
+def _record(spec, target: str, options: dict, result: Any) -> tuple:
+    """The `_INSERT` parameters for one result."""
+    rows = getattr(result, spec.rows_field, None)
+    if isinstance(rows, list):
+        rows = json.dumps([_row(row) for row in rows], default=repr)
+    else:
+        rows = None
+    return (
+        time.time(),
+        spec.name,
+        _target_key(target),
+        json.dumps(options, sort_keys=True, default=repr),
+        json.dumps(result_summary(result, spec.rows_field), default=repr),
+        rows,
+    )
+
+
+def _target_key(target: str) -> str:
+    """*target* as stored: absolute if it is an existing path, else unchanged ("pkg:func")."""
+    return os.path.abspath(target) if os.path.exists(target) else target
+
+
+def _row(row: Any) -> Any:
+    if is_dataclass(row):
+        return {f.name: getattr(row, f.name) for f in fields(row)}
+    return row
@@ -0,0 +1,110 @@
+"""Process memory from /proc — RSS, PSS, USS, and swap of a running process (Linux).
+
+`ProcMemReader` opens `/proc/<pid>/status` and `/proc/<pid>/smaps_rollup`
+once and re-reads both with `os.preadv` into one preallocated buffer: the
+kernel regenerates a /proc file on every read from offset 0, so a sample
+costs two syscalls and a regex pass — no open/close, no new buffer — and
+polling every 10 ms stays well under 5% of one core.
+
+  rss   VmRSS (status): resident pages, shared ones included.
+  hwm   VmHWM (status): the kernel's own peak RSS, which also catches
+        spikes that fall between two samples.
+  pss   Pss (smaps_rollup): shared pages split evenly among the processes
+        mapping them; sums to the real total across a worker pool.
+  uss   Private_Clean + Private_Dirty (smaps_rollup): what exiting the
+        process would give back.
+  swap  Swap (smaps_rollup).
+
+smaps_rollup needs Linux 4.14+ and ptrace-read access to the process (same
+user, or root).  Without it the reader still works and reports only
+rss/hwm; `detailed` is then False.
+
+Usage:
+    from commands.procmem import ProcMemReader
+
+    with ProcMemReader(pid) as reader:
+        sample = reader.read()        # MemSample in KB, or None once it exited
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from typing import NamedTuple
+
+_FIELD_RE = re.compile(rb"^(\w+):\s+(\d+) kB", re.MULTILINE)
+_BUFFER_SIZE = 8192
+
+
+class MemSample(NamedTuple):
+    """One reading of a process's memory, all in KB."""
+
+    rss: int
+    hwm: int
+    pss: int
+    uss: int
+    swap: int
+
+
+class ProcMemReader:
+    """Re-readable handles on one process's /proc memory files.
+
+    Args:
+        pid: Process to watch.
+
+    Raises:
+        FileNotFoundError: No process *pid*, or no /proc (not Linux).
+        PermissionError:   /proc/<pid>/status is not readable.
+    """
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self._buffer = bytearray(_BUFFER_SIZE)
+        self._status: int | None = os.open(f"/proc/{pid}/status", os.O_RDONLY)
+        try:
+            self._rollup: int | None = os.open(f"/proc/{pid}/smaps_rollup", os.O_RDONLY)
+        except OSError:
+            self._rollup = None
+
+    @property
+    def detailed(self) -> bool:
+        """True if pss/uss/swap are available (smaps_rollup could be opened)."""
+        return self._rollup is not None
+
+    def read(self) -> MemSample | None:
+        """Take one sample; None once the process has exited (or is a zombie)."""
+        try:
+            status = self._fields(self._status)
+            rollup = self._fields(self._rollup) if self._rollup is not None else {}
+        except ProcessLookupError:
+            return None
+        if b"VmRSS" not in status:  # zombie: exited, not yet reaped
+            return None
+        return MemSample(
+            rss=int(status[b"VmRSS"]),
+            hwm=int(status.get(b"VmHWM", 0)),
+            pss=int(rollup.get(b"Pss", 0)),
+            uss=int(rollup.get(b"Private_Clean", 0)) + int(rollup.get(b"Private_Dirty", 0)),
+            swap=int(rollup.get(b"Swap", 0)),
+        )
+
+    def close(self) -> None:
+        for fd in (self._status, self._rollup):
+            if fd is not None:
+                os.close(fd)
+        self._status = self._rollup = None
+
+    def __enter__(self) -> ProcMemReader:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _fields(self, fd: int) -> dict[bytes, bytes]:
+        """Re-read *fd* from offset 0 and return its "Name: N kB" fields."""
+        while True:
+            n = os.preadv(fd, [self._buffer], 0)
+            if n < len(self._buffer):
+                break
+            self._buffer = bytearray(2 * len(self._buffer))  # file outgrew the buffer
+        return dict(_FIELD_RE.findall(memoryview(self._buffer)[:n]))
@@ -0,0 +1,58 @@
+"""Progress protocol — how long-running commands report partial results.
+
+A command whose spec sets `reports_progress=True` accepts a `progress`
+keyword: a callable taking one `ProgressUpdate`.  The command calls it
+whenever it has something new to say (a round finished, a snapshot was
+taken), and the caller decides how — or whether — to show it.  Commands
+stay UI-free: they only build plain dataclasses and never import `ui/`.
+
+The callback is expected to be cheap.  `ui.output.live_progress` only
+stores the latest update and redraws from its own thread at a capped rate,
+so calling it once per benchmark round costs one attribute store, not a
+screen refresh.
+
+Usage (inside a command):
+    from commands.progress import report
+
+    for i in range(rounds):
+        ...
+        report(progress, "timing", i + 1, rounds, {"last": format_duration(v)})
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+@dataclass
+class ProgressUpdate:
+    """One partial-result report from a running command.
+
+    Fields:
+        phase:     Short name of the current phase, e.g. "warmup", "timing".
+        completed: Steps finished in this phase, or None if not countable.
+        total:     Steps expected in this phase, or None if unknown.
+        metrics:   Preformatted label -> value strings describing the partial
+                   result so far (e.g. {"median": "1.20 ms"}).
+    """
+
+    phase: str
+    completed: int | None = None
+    total: int | None = None
+    metrics: dict[str, str] = field(default_factory=dict)
+
+
+ProgressCallback = Callable[[ProgressUpdate], None]
+
+
+def report(
+    progress: ProgressCallback | None,
+    phase: str,
+    completed: int | None = None,
+    total: int | None = None,
+    metrics: dict[str, str] | None = None,
+) -> None:
+    """Send a `ProgressUpdate` to *progress*, or do nothing when it is None."""
+    if progress is not None:
+        progress(ProgressUpdate(phase, completed, total, metrics or {}))
@@ -0,0 +1,510 @@
+"""Command registry — metadata for every subcommand, without importing them.
+
+`cli.py` (argparse) and `prompts/interactive.py` (the menu) are both built
+from the `CommandSpec` list returned by `iter_commands()`.  A spec only holds
+plain data — names, help text, table columns, argument definitions, and the
+dotted paths of the functions to call — so listing commands never imports a
+command module.  `CommandSpec.load()` imports the module the first time the
+command is actually invoked.
+
+Two sources feed the registry:
+
+  BUILTIN_COMMANDS   Declared below as literals.  Adding a built-in command
+                     means adding one entry here — nothing else.
+  Entry points       Installed packages can contribute commands through the
+                     "clisoft.commands" entry-point group.  Each entry point
+                     must resolve to a `CommandSpec` (or a dict of its fields).
+
+Entry-point discovery is the slow part (`importlib.metadata` scans every
+installed distribution, then each plugin module is imported to read its
+spec), so the discovered specs are written to a JSON manifest in the cache
+directory.  The manifest is keyed on the mtimes of the `sys.path` directories,
+which change whenever a distribution is installed or removed; while the key
+matches, startup reads one small JSON file and imports nothing.
+
+Usage:
+    from commands.registry import get_command, iter_commands
+
+    spec = get_command("action-one")
+    run = spec.load()
+    result = run("script.py", option=20)
+    view = spec.build_view(result)
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import sys
+# typing costs ~3 ms to import and annotations are strings anyway, so the
+# names below exist for type checkers only (they treat TYPE_CHECKING as True).
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Iterable, Iterator, Sequence
+
+from commands._paths import cache_dir
+from exceptions import UnknownCommandError
+
+ENTRY_POINT_GROUP = "clisoft.commands"
+
+_MANIFEST_VERSION = 1
+
+# argparse `type=` values are stored by name so specs stay JSON-serializable.
+_TYPES: dict[str, Callable[[str], Any]] = {"int": int, "float": float, "str": str}
+
+
+class Argument:
+    """One argparse option of a command.
+
+    Fields:
+        flags:   Option strings, e.g. ["-n", "--top"].
+        dest:    Keyword argument name passed to the command function.
+        type:    "int", "float", or "str".
+        default: Default value.
+        help:    Help text shown by --help.
+        choices: Allowed values, or None for any.
+        metavar: Placeholder shown by --help; defaults to the last flag
+                 upper-cased (e.g. "--top" -> "TOP").
+    """
+
+    __slots__ = ("flags", "dest", "type", "default", "help", "choices", "metavar")
+
+    def __init__(
+        self,
+        flags: list[str],
+        dest: str,
+        type: str = "str",
+        default: Any = None,
+        help: str = "",
+        choices: list | None = None,
+        metavar: str | None = None,
+    ) -> None:
+        self.flags = flags
+        self.dest = dest
+        self.type = type
+        self.default = default
+        self.help = help
+        self.choices = choices
+        self.metavar = metavar
+
+    def __repr__(self) -> str:
+        return f"Argument({self.flags!r}, {self.dest!r})"
+
+    def to_dict(self) -> dict:
+        """Return the fields as a JSON-serializable dict (the manifest form)."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def add_to(self, parser) -> None:
+        """Register this option on an argparse (sub)parser."""
+        kwargs: dict[str, Any] = {
+            "dest": self.dest,
+            "metavar": self.metavar or self.flags[-1].lstrip("-").upper(),
+            "type": _TYPES[self.type],
+            "default": self.default,
+            "help": self.help,
+        }
+        if self.choices is not None:
+            kwargs["choices"] = self.choices
+            del kwargs["metavar"]  # let argparse show {a,b,c}
+        parser.add_argument(*self.flags, **kwargs)
+
+
+class TableView:
+    """What a command wants shown for one result in table mode.
+
+    Fields:
+        rows:         Iterable of row value lists, one value per column.
+        message:      The line printed with `print_success` under the table.
+        columns:      (header, style) tuples; None means the spec's `columns`.
+        distribution: Raw samples to draw as a log-bucketed histogram under
+                      the table, or None for no histogram.
+        distribution_weights: Per-value counts parallel to `distribution`
+                      (e.g. HDR histogram counters), or None when every
+                      value is one sample.
+        distribution_title: Heading of the histogram.
+        distribution_label: Formats a bucket edge (e.g. a duration
+                      formatter); None means `str`.
+    """
+
+    __slots__ = (
+        "rows", "message", "columns", "distribution", "distribution_weights",
+        "distribution_title", "distribution_label",
+    )
+
+    def __init__(
+        self,
+        rows: Iterable[list],
+        message: str,
+        columns: list[tuple[str, str]] | None = None,
+        distribution: Sequence[float] | None = None,
+        distribution_weights: Sequence[int] | None = None,
+        distribution_title: str = "",
+        distribution_label: Callable[[float], str] | None = None,
+    ) -> None:
+        self.rows = rows
+        self.message = message
+        self.columns = columns
+        self.distribution = distribution
+        self.distribution_weights = distribution_weights
+        self.distribution_title = distribution_title
+        self.distribution_label = distribution_label
+
+
+class CommandSpec:
+    """Static metadata describing one subcommand.
+
+    Fields:
+        name:        Subcommand name on the command line (e.g. "action-one").
+        title:       Human label used in the menu and in table titles.
+        help:        One-line help shown by `clisoft --help`.
+        entry:       "module:function" of the command, called as
+                     `function(target, **arguments)`.  May be an `async def`;
+                     the CLI then runs it on an asyncio event loop.
+        view:        "module:function" turning a result into a `TableView`.
+        rows_field:  Name of the result field holding per-row data, used by
+                     the machine-readable formats.
+        columns:     Default table columns as (header, style) pairs.
+        target_help: Help text for the positional `target` argument.
+        arguments:   Extra options, see `Argument`.
+        cacheable:   True if results depend only on the target's source and
+                     the options, so `commands/cache.py` may reuse them.
+        reports_progress: True if the command function accepts a `progress`
+                     callback (see `commands/progress.py`).
+        timeout_s:   Default time limit in seconds, overridden by --timeout;
+                     None runs the command in-process with no limit (see
+                     `commands/supervisor.py`).
+        isolated:    True to run the command in a child interpreter by
+                     default, overridden by --isolate / --no-isolate, so the
+                     CLI's own imports and allocations stay out of its
+                     measurements.
+        recorded:    True to append each fresh, successful result to the run
+                     history (see `commands/history.py`), unless --no-history.
+        metrics:     Measured numeric result fields the `history` command
+                     trends, mapped to their unit: "s" (shown like the
+                     action tables' durations), "KB", or "" for counts.
+                     Settings echoed in the result (warmup, loops, ...) are
+                     left out.  Empty means every numeric field.
+    """
+
+    __slots__ = (
+        "name", "title", "help", "entry", "view", "rows_field", "columns",
+        "target_help", "arguments", "cacheable", "reports_progress",
+        "timeout_s", "isolated", "recorded", "metrics",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        title: str,
+        help: str,
+        entry: str,
+        view: str,
+        rows_field: str,
+        columns: list[tuple[str, str]] | None = None,
+        target_help: str = "What to run the command against",
+        arguments: list[Argument] | None = None,
+        cacheable: bool = False,
+        reports_progress: bool = False,
+        timeout_s: float | None = None,
+        isolated: bool = False,
+        recorded: bool = True,
+        metrics: dict[str, str] | None = None,
+    ) -> None:
+        self.name = name
+        self.title = title
+        self.help = help
+        self.entry = entry
+        self.view = view
+        self.rows_field = rows_field
+        self.columns = columns if columns is not None else []
+        self.target_help = target_help
+        self.arguments = arguments if arguments is not None else []
+        self.cacheable = cacheable
+        self.reports_progress = reports_progress
+        self.timeout_s = timeout_s
+        self.isolated = isolated
+        self.recorded = recorded
+        self.metrics = metrics if metrics is not None else {}
+
+    def __repr__(self) -> str:
+        return f"CommandSpec(name={self.name!r}, entry={self.entry!r})"
+
+    def to_dict(self) -> dict:
+        """Return the fields as a JSON-serializable dict (the manifest form)."""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["arguments"] = [a.to_dict() for a in self.arguments]
+        return data
+
+    def load(self) -> Callable:
+        """Import and return the command function."""
+        return _resolve(self.entry)
+
+    def is_async(self) -> bool:
+        """True if the command function is an `async def` (imports it to find out)."""
+        import inspect
+        return inspect.iscoroutinefunction(self.load())
+
+    def build_view(self, result: Any) -> TableView:
+        """Import the view function, apply it to *result*, and fill in default columns."""
+        view = _resolve(self.view)(result)
+        if view.columns is None:
+            view.columns = self.columns
+        return view
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CommandSpec:
+        """Rebuild a spec from its `to_dict()` form (as stored in the manifest)."""
+        data = dict(data)
+        data["columns"] = [tuple(c) for c in data.get("columns", [])]
+        data["arguments"] = [Argument(**a) for a in data.get("arguments", [])]
+        return cls(**data)
+
+
+# ── Built-in commands ──────────────────────────────────────────────────────────
+# Rename / extend these to match your project.  Nothing here is imported until
+# the command runs, so adding entries does not slow down startup.
+BUILTIN_COMMANDS: list[CommandSpec] = [
+    CommandSpec(
+        name="action-one",
+        title="Action One",
+        help="Profile a script or module with cProfile and show the top functions",
+        entry="commands.action_one:run_action_one",
+        view="commands.action_one:table_view",
+        rows_field="rows",
+        columns=[
+            ("Calls",    "bold cyan"),
+            ("TotTime",  "white"),
+            ("CumTime",  "white"),
+            ("PerCall",  "dim"),
+            ("Filename", "dim"),
+        ],
+        target_help="Script path, module name, or module:function to profile",
+        arguments=[
+            Argument(["-n", "--top"], "option", "int", 10,
+                     "Number of functions to show (default: 10)"),
+            Argument(["--sort"], "sort", "str", "cumulative",
+                     "Ranking key, as in pstats (default: cumulative)",
+                     ["cumulative", "tottime", "calls"]),
+            Argument(["--mode"], "mode", "str", "cprofile",
+                     "cprofile: trace every call; sample: low-overhead stack sampling",
+                     ["cprofile", "sample"]),
+            Argument(["--rate"], "rate", "float", 100.0,
+                     "Samples per second in sample mode (default: 100)"),
+            Argument(["--export"], "export", "str", None,
+                     "Also write the full call tree as collapsed stacks, "
+                     "speedscope JSON, or a flame graph SVG",
+                     ["collapsed", "speedscope", "svg"]),
+            Argument(["-o", "--output"], "output", "str", None,
+                     "Export file path (default: <target><format suffix>)"),
+        ],
+        cacheable=True,
+        reports_progress=True,
+        metrics={"total_time": "s", "total_count": ""},
+    ),
+    CommandSpec(
+        name="action-two",
+        title="Action Two",
+        help="Benchmark a callable, module, or script and report timing statistics",
+        entry="commands.action_two:run_action_two",
+        view="commands.action_two:table_view",
+        rows_field="values",
+        columns=[
+            ("Metric", "bold cyan"),
+            ("Value",  "white"),
+        ],
+        target_help="module:function, module name, or script path to benchmark",
+        arguments=[
+            Argument(["-n", "--rounds"], "option", "int", 10,
+                     "Number of timed rounds / samples (default: 10)"),
+            Argument(["--warmup"], "warmup", "int", 2,
+                     "Untimed warmup rounds before timing (default: 2)"),
+            Argument(["--loops"], "loops", "int", 0,
+                     "Calls per timed round; 0 calibrates automatically (default: 0)"),
+            Argument(["-j", "--workers"], "workers", "int", 1,
+                     "Spread rounds over N pinned worker processes (default: 1)"),
+            Argument(["--save-baseline"], "save_baseline_as", "str", None,
+                     "Store the raw samples as baseline NAME under .clisoft/baselines",
+                     metavar="NAME"),
+            Argument(["--compare"], "compare", "str", None,
+                     "Test against baseline NAME; exit 3 on a significant slowdown",
+                     metavar="NAME"),
+            Argument(["--recorder"], "recorder", "str", "list",
+                     "list: keep every sample; hdr: fixed-memory histogram for long runs",
+                     ["list", "hdr"]),
+            Argument(["--precision"], "precision", "int", 3,
+                     "Significant digits kept by --recorder hdr, 1-5 (default: 3)",
+                     metavar="DIGITS"),
+        ],
+        reports_progress=True,
+        metrics={
+            "median_value": "s", "avg_value": "s", "stddev_value": "s",
+            "iqr_value": "s", "min_value": "s", "max_value": "s",
+            "p50_value": "s", "p95_value": "s", "p99_value": "s",
+            "p999_value": "s", "total_value": "s", "outliers": "",
+        },
+    ),
+    CommandSpec(
+        name="action-three",
+        title="Action Three",
+        help="Trace memory allocations of a script or module with tracemalloc",
+        entry="commands.action_three:run_action_three",
+        view="commands.action_three:table_view",
+        rows_field="items",
+        columns=[
+            ("Source",    "bold cyan"),
+            ("Line",      "white"),
+            ("Size (KB)", "white"),
+            ("Count",     "dim"),
+        ],
+        target_help="Script path, module name, or module:function to trace "
+                    "(a process id with --mode attach)",
+        arguments=[
+            Argument(["-n", "--top"], "option", "int", 10,
+                     "Number of allocation sites to show (default: 10)"),
+            Argument(["--mode"], "mode", "str", "snapshot",
+                     "snapshot: one final snapshot; diff: periodic snapshots, report growth; "
+                     "attach: sample RSS/PSS/USS of the running process id TARGET; "
+                     "census: count objects by type and find reference cycles",
+                     ["snapshot", "diff", "attach", "census"]),
+            Argument(["--interval"], "interval", "float", 1.0,
+                     "Seconds between snapshots in diff mode, or between /proc "
+                     "samples in attach mode (default: 1.0)"),
+            Argument(["--keep"], "keep", "int", 5,
+                     "Snapshots kept in the ring buffer in diff mode (default: 5)"),
+            Argument(["--frames"], "frames", "int", 1,
+                     "Frames recorded per allocation; above 1, sites are grouped "
+                     "by call chain (default: 1)", metavar="N"),
+            Argument(["--scope"], "scope", "str", "user",
+                     "user: charge standard-library allocations to the nearest "
+                     "recorded caller outside it (see --frames); all: keep them as is",
+                     ["user", "all"]),
+            Argument(["--duration"], "duration", "float", 10.0,
+                     "Seconds to sample in attach mode; 0 runs until the process "
+                     "exits (default: 10)", metavar="SECONDS"),
+        ],
+        cacheable=True,
+        reports_progress=True,
+        isolated=True,
+        metrics={"peak_value": "KB", "current_value": "KB", "cycle_objects": ""},
+    ),
+    CommandSpec(
+        name="history",
+        title="History",
+        help="Show how a target's results changed over its recorded runs",
+        entry="commands.history:run_history",
+        view="commands.history:table_view",
+        rows_field="rows",
+        target_help="Target as it was passed to the command (a path may be "
+                    "relative to this directory)",
+        arguments=[
+            Argument(["-n", "--last"], "last", "int", 30,
+                     "Number of most recent runs to read (default: 30)", metavar="N"),
+            Argument(["--metric"], "metric", "str", None,
+                     "Numeric result field to trend run by run, e.g. p95 or "
+                     "peak_value (default: summarize every metric)", metavar="NAME"),
+            Argument(["--command"], "command_name", "str", None,
+                     "Only runs of this command (default: any)", metavar="NAME"),
+        ],
+        recorded=False,
+    ),
+]
+
+
+def iter_commands() -> Iterator[CommandSpec]:
+    """Yield every registered command: built-ins first, then plugins by name."""
+    yield from BUILTIN_COMMANDS
+    builtin_names = {spec.name for spec in BUILTIN_COMMANDS}
+    for spec in _plugin_specs():
+        if spec.name not in builtin_names:
+            yield spec
+
+
+def get_command(name: str) -> CommandSpec:
+    """Return the spec registered under *name*.
+
+    Raises:
+        UnknownCommandError: No built-in or plugin command has that name.
+    """
+    for spec in iter_commands():
+        if spec.name == name:
+            return spec
+    raise UnknownCommandError(command=name)
+
+
+def _resolve(dotted: str) -> Any:
+    """Import "package.module:attr" and return the attribute."""
+    module_name, _, attr = dotted.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+# ── Plugin discovery + manifest cache ─────────────────────────────────────────
+
+_plugin_cache: list[CommandSpec] | None = None
+
+
+def _plugin_specs() -> list[CommandSpec]:
+    """Return plugin specs from the manifest, rediscovering them when it is stale."""
+    global _plugin_cache
+    if _plugin_cache is not None:
+        return _plugin_cache
+
+    key = _environment_key()
+    path = os.path.join(cache_dir(), "manifest.json")
+    try:
+        with open(path, encoding="utf-8") as fh:
+            manifest = json.load(fh)
+        if manifest.get("version") == _MANIFEST_VERSION and manifest.get("key") == key:
+            _plugin_cache = [CommandSpec.from_dict(d) for d in manifest["commands"]]
+            return _plugin_cache
+    except (OSError, ValueError, KeyError, TypeError):
+        pass  # missing or corrupt manifest — rebuild it below
+
+    _plugin_cache = _discover_plugins()
+    manifest = {
+        "version": _MANIFEST_VERSION,
+        "key": key,
+        "commands": [spec.to_dict() for spec in _plugin_cache],
+    }
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(manifest, fh)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # a read-only cache only costs a rediscovery next time
+    return _plugin_cache
+
+
+def _environment_key() -> list:
+    """Fingerprint the import path: (entry, mtime_ns) for every sys.path directory.
+
+    `sys.path[0]` (the script directory, or "" for `-c` / `-m`) is skipped:
+    it depends on how the CLI was launched, not on what is installed.
+    """
+    key = []
+    for entry in sys.path[1:]:
+        try:
+            key.append([entry, os.stat(entry or ".").st_mtime_ns])
+        except OSError:
+            key.append([entry, None])
+    return key
+
+
+def _discover_plugins() -> list[CommandSpec]:
+    """Load every "clisoft.commands" entry point and return the specs, sorted by name.
+
+    Broken plugins are skipped rather than taking the whole CLI down.
+    """
+    from importlib.metadata import entry_points
+
+    specs = []
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            obj = ep.load()
+            spec = obj if isinstance(obj, CommandSpec) else CommandSpec.from_dict(obj)
+        except Exception:  # noqa: BLE001 — a bad plugin must not break the CLI
+            continue
+        specs.append(spec)
+    specs.sort(key=lambda s: s.name)
+    return specs
@@ -0,0 +1,107 @@
+"""Run one registered command, honouring its time limit, isolation, and `async def`.
+
+This is the uncached core of `commands.cache.run_cached`: callers that are
+not going to use the cache (a non-cacheable spec, `--no-cache`) call it
+directly and skip importing the cache's hashing and pickling.
+
+  - A time limit (`--timeout`, `CommandSpec.timeout_s`) or isolation
+    (`--isolate`, `CommandSpec.isolated`) runs the command under
+    `commands.supervisor.run_supervised` in a child process.
+  - Otherwise the command runs in this process; an `async def` command gets
+    its own event loop (`run_command`) or is awaited on the caller's
+    (`run_command_async`).
+
+Usage:
+    from commands.runner import run_command, run_command_async
+
+    result = run_command(spec, target, kwargs, progress=progress)
+    result = await run_command_async(spec, target, kwargs)
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def run_command(
+    spec, target: str, kwargs: dict, progress=None,
+    timeout: float | None = None, isolate: bool | None = None,
+) -> Any:
+    """Run *spec*'s command on *target*, blocking until it returns.
+
+    *progress* is a `commands.progress` callback, passed on only to specs
+    that declare `reports_progress`.  *timeout* is in seconds; None uses the
+    spec's `timeout_s`, and 0 (or a spec without one) means no limit.
+    *isolate* runs the command in a child process even without a limit;
+    None uses the spec's `isolated`.
+
+    Raises:
+        CommandTimeoutError:   The command returned nothing before its timeout.
+        CommandExecutionError: The supervised child died without a result.
+    """
+    limit = _timeout(spec, timeout)
+    if limit or _isolated(spec, isolate):
+        from commands.supervisor import run_supervised
+        return run_supervised(spec, target, kwargs, limit or None, progress)
+    func = spec.load()
+    call_kwargs = _call_kwargs(spec, kwargs, progress)
+    if _is_coroutine_function(func):
+        import asyncio
+        return asyncio.run(func(target, **call_kwargs))
+    return func(target, **call_kwargs)
+
+
+async def run_command_async(
+    spec, target: str, kwargs: dict, progress=None,
+    timeout: float | None = None, isolate: bool | None = None,
+) -> Any:
+    """Coroutine form of `run_command` for callers already inside an event loop.
+
+    An `async def` command is awaited directly, so many of them can overlap
+    their I/O on one loop; a timeout cancels it (no partial result).  A
+    synchronous command runs in the loop's default thread pool — supervised
+    in a child process when it has a timeout.  An isolated command of either
+    kind is supervised from a pool thread.
+    """
+    import asyncio
+
+    limit = _timeout(spec, timeout)
+    func = spec.load()
+    call_kwargs = _call_kwargs(spec, kwargs, progress)
+    is_async = _is_coroutine_function(func)
+    if _isolated(spec, isolate) or (limit and not is_async):
+        from commands.supervisor import run_supervised
+        return await asyncio.to_thread(run_supervised, spec, target, kwargs, limit or None, progress)
+    if is_async:
+        try:
+            return await asyncio.wait_for(func(target, **call_kwargs), limit or None)
+        except asyncio.TimeoutError:
+            from exceptions import CommandTimeoutError
+            raise CommandTimeoutError(command_name=spec.name, timeout_s=limit) from None
+    return await asyncio.to_thread(func, target, **call_kwargs)
+
+
+def _call_kwargs(spec, kwargs: dict, progress) -> dict:
+    """Add *progress* to *kwargs* for specs that declare `reports_progress`."""
+    if progress is not None and getattr(spec, "reports_progress", False):
+        return {**kwargs, "progress": progress}
+    return kwargs
+
+
+def _timeout(spec, timeout: float | None) -> float:
+    """Effective time limit in seconds: *timeout*, else the spec's default; 0 is none."""
+    if timeout is None:
+        timeout = getattr(spec, "timeout_s", None)
+    return timeout or 0.0
+
+
+def _isolated(spec, isolate: bool | None) -> bool:
+    """Whether to run in a child process: *isolate*, else the spec's default."""
+    if isolate is None:
+        return getattr(spec, "isolated", False)
+    return isolate
+
+
+def _is_coroutine_function(func) -> bool:
+    import inspect
+    return inspect.iscoroutinefunction(func)
@@ -0,0 +1,34 @@
+"""The summary of a command result: its scalar fields, keyed by name.
+
+Every result dataclass splits into a summary — each str / int / float /
+bool / None field, plus any list of scalars (e.g. `ActionTwoResult.cores`),
+minus `error` — and the rows held in its `CommandSpec.rows_field`.  The
+machine-readable formats (`ui/formats.py`) write the summary ahead of the
+rows, and `commands/history.py` stores it as each run's record.
+
+Usage:
+    from commands.summary import result_summary
+
+    summary = result_summary(result, spec.rows_field)
+"""
+
+from __future__ import annotations
+
+from dataclasses import fields
+from typing import Any
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def result_summary(result: Any, rows_field: str) -> dict:
+    """Collect the scalar (and list-of-scalar) fields of *result*, minus *rows_field* and `error`."""
+    summary = {}
+    for f in fields(result):
+        if f.name in (rows_field, "error"):
+            continue
+        value = getattr(result, f.name)
+        if isinstance(value, _SCALARS):
+            summary[f.name] = value
+        elif isinstance(value, (list, tuple)) and all(isinstance(v, _SCALARS) for v in value):
+            summary[f.name] = list(value)
+    return summary
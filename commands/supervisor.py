@@ -0,0 +1,264 @@
+"""Supervised execution — run a command in a child process, optionally under a deadline.
+
+`run_supervised` starts the command in a fresh interpreter ("spawn"),
+relays its progress updates, and waits for its result.  Commands run this
+way for two reasons:
+
+  - Isolation (`--isolate`, `CommandSpec.isolated`): the target's imports,
+    allocations, and timings are measured in an interpreter that has not
+    loaded Rich, InquirerPy, or the CLI itself.
+  - A time limit (`--timeout`, `CommandSpec.timeout_s`), see below.
+
+The result comes back as a binary frame (`commands/wire.py`) rather than a
+pickle, so a large profile or sample array costs one buffer copy to move.
+
+When the timeout runs out:
+
+  1. The child gets SIGTERM, which its handler turns into a
+     `CommandTimeoutError` raised wherever the target is executing.
+     Commands catch it around the target call (see `call_until_timeout`)
+     and return what they gathered so far, with `timed_out` set and
+     `exit_code` set to `EXIT_TIMEOUT`.
+  2. If no result arrives within `GRACE_S` — the target swallowed the
+     exception, or is stuck in C code that never returns to the
+     interpreter — the child is killed and `CommandTimeoutError` is raised.
+
+A child process is what makes step 2 possible: a thread cannot be killed,
+and an in-process alarm cannot interrupt C code.  It also means a timed-out
+target leaves no threads, profiler hooks, or tracemalloc state behind in
+the CLI.  Without POSIX signals (Windows) step 1 is skipped: the child is
+terminated at the deadline and no partial result is returned.
+
+Usage:
+    from commands.supervisor import run_supervised
+
+    result = run_supervised(spec, "app:main", {"option": 10}, timeout_s=30.0)
+    result = run_supervised(spec, "app:main", {"option": 10}, timeout_s=None)  # isolation only
+"""
+
+from __future__ import annotations
+
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Any, Callable
+
+from commands.progress import ProgressCallback, ProgressUpdate
+from exceptions import CommandExecutionError, CommandTimeoutError
+
+# `exit_code` of a partial result cut short by the timeout, as timeout(1).
+EXIT_TIMEOUT = 124
+
+# How long the child gets to return a partial result after SIGTERM.
+GRACE_S = 5.0
+
+# Progress updates are relayed at most this often; the dashboard redraws at
+# 8 Hz anyway, and every relayed update costs the child a pickle and a write.
+_RELAY_INTERVAL_S = 0.05
+
+_HAS_SIGTERM = os.name == "posix"
+
+
+def run_supervised(
+    spec,
+    target: str,
+    kwargs: dict,
+    timeout_s: float | None,
+    progress: ProgressCallback | None = None,
+) -> Any:
+    """Run *spec*'s command on *target* in a child process, for at most *timeout_s*.
+
+    Args:
+        spec:      The `CommandSpec` to run; must be importable by the child.
+        target:    Passed to the command unchanged.
+        kwargs:    Command options (without `progress`).
+        timeout_s: Seconds before the child is asked to stop; None waits
+                   for as long as the command takes.
+        progress:  Optional callback receiving the child's progress updates.
+
+    Returns:
+        The command's result — partial, with `timed_out` set, if the command
+        stopped at the deadline.
+
+    Raises:
+        CommandTimeoutError:   No result arrived within *timeout_s* plus `GRACE_S`.
+        CommandExecutionError: The child failed without returning a result.
+    """
+    import multiprocessing
+
+    ctx = multiprocessing.get_context("spawn")
+    recv, send = ctx.Pipe(duplex=False)
+    # Machine formats redirect our stdout to stderr; the child must follow.
+    quiet = sys.stdout is not sys.__stdout__
+    child = ctx.Process(
+        target=_child_main,
+        args=(send, spec, target, kwargs, timeout_s, progress is not None, quiet),
+        name=f"clisoft-{spec.name}",
+    )
+    child.start()
+    send.close()
+
+    deadline = time.monotonic() + timeout_s if timeout_s else None
+    interrupted = False
+    try:
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                if interrupted:
+                    raise CommandTimeoutError(command_name=spec.name, timeout_s=timeout_s)
+                interrupted = True
+                _interrupt(child)
+                deadline = time.monotonic() + GRACE_S
+                continue
+            if not recv.poll(remaining):
+                continue
+            try:
+                kind, payload = recv.recv()
+            except EOFError:
+                child.join()
+                if interrupted:
+                    raise CommandTimeoutError(command_name=spec.name, timeout_s=timeout_s)
+                raise CommandExecutionError(
+                    f"Command '{spec.name}' exited with code {child.exitcode} without a result",
+                    command_name=spec.name,
+                )
+            if kind == "progress":
+                progress(payload)
+            elif kind == "result":
+                result = _recv_frame(recv, spec)
+                child.join(GRACE_S)
+                return result
+            elif kind == "timeout":
+                raise CommandTimeoutError(command_name=spec.name, timeout_s=timeout_s)
+            else:
+                raise CommandExecutionError(payload, command_name=spec.name)
+    finally:
+        recv.close()
+        if child.is_alive():
+            child.kill()
+            child.join()
+
+
+def _recv_frame(conn, spec) -> Any:
+    """Read the result frame following a ("result", None) message."""
+    from commands.wire import recv_result
+
+    try:
+        return recv_result(conn)
+    except (EOFError, ValueError, TypeError, ImportError, AttributeError) as exc:
+        raise CommandExecutionError(
+            f"Command '{spec.name}' sent an unreadable result: {exc}",
+            command_name=spec.name,
+        ) from exc
+
+
+def call_until_timeout(func: Callable[[], object]) -> bool:
+    """Call *func*; return True if the supervisor's timeout interrupted it.
+
+    Commands wrap the target call in this so that a timeout ends the call
+    but not the command, which goes on to build a partial result.
+    """
+    try:
+        func()
+    except CommandTimeoutError:
+        return True
+    return False
+
+
+def _interrupt(child) -> None:
+    """Ask *child* to stop: SIGTERM where it becomes an exception, else terminate."""
+    if _HAS_SIGTERM:
+        os.kill(child.pid, signal.SIGTERM)
+    else:
+        child.terminate()
+
+
+def _child_main(conn, spec, target: str, kwargs: dict, timeout_s: float | None,
+                relay: bool, quiet: bool) -> None:
+    """Child-process entry point: run the command and send back one final message.
+
+    Messages are (kind, payload) tuples: any number of ("progress", update),
+    then exactly one of ("result", None) followed by the result's
+    `commands.wire` frame, ("timeout", None) when the timeout struck outside
+    a timeout-aware section, or ("error", message).
+    """
+    from commands.wire import encode, send_frame
+
+    if quiet:
+        os.dup2(2, 1)
+    lock = threading.Lock()  # progress may come from a sampler thread
+    # A timeout striking while the main thread is halfway through writing a
+    # message would corrupt the pipe, so it is deferred until the write ends.
+    state = {"sending": False, "deferred": False}
+
+    def timeout() -> CommandTimeoutError:
+        return CommandTimeoutError(command_name=spec.name, timeout_s=timeout_s)
+
+    if _HAS_SIGTERM and timeout_s:
+        def on_term(signum, frame):
+            signal.signal(signal.SIGTERM, signal.SIG_IGN)  # interrupt only once
+            if state["sending"]:
+                state["deferred"] = True
+                return
+            raise timeout()
+
+        signal.signal(signal.SIGTERM, on_term)
+
+    call_kwargs = dict(kwargs)
+    if relay and getattr(spec, "reports_progress", False):
+        call_kwargs["progress"] = _relay(conn, lock, state, timeout)
+    try:
+        import inspect
+
+        func = spec.load()
+        if inspect.iscoroutinefunction(func):
+            import asyncio
+            result = asyncio.run(func(target, **call_kwargs))
+        else:
+            result = func(target, **call_kwargs)
+        state["sending"] = True  # a late SIGTERM must not cut the result short
+        frame = encode(result)
+        message = ("result", None)
+    except CommandTimeoutError:
+        frame, message = None, ("timeout", None)
+    except Exception as exc:
+        frame, message = None, ("error", f"{type(exc).__name__}: {exc}")
+    state["sending"] = True
+    with lock:
+        conn.send(message)
+        if frame is not None:
+            send_frame(conn, frame)
+    conn.close()
+
+
+def _relay(conn, lock: threading.Lock, state: dict,
+           timeout: Callable[[], CommandTimeoutError]) -> ProgressCallback:
+    """Progress callback forwarding updates to the parent, at most every `_RELAY_INTERVAL_S`.
+
+    On the main thread the write is marked in *state*, so the SIGTERM
+    handler defers its exception to the end of the write, raised here.
+    """
+    last = [0.0]
+    main = threading.main_thread()
+
+    def send(update: ProgressUpdate) -> None:
+        now = time.monotonic()
+        if now - last[0] < _RELAY_INTERVAL_S:
+            return
+        last[0] = now
+        on_main = threading.current_thread() is main
+        with lock:
+            if on_main:
+                state["sending"] = True
+            try:
+                conn.send(("progress", update))
+            finally:
+                if on_main:
+                    state["sending"] = False
+        if on_main and state["deferred"]:
+            state["deferred"] = False
+            raise timeout()
+
+    return send
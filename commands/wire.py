@@ -0,0 +1,170 @@
+"""Result framing — move a command's result dataclass between processes without pickle.
+
+Pickling a result re-encodes every sample and every row object; for a
+multi-million-sample benchmark that is most of the cost of running it in a
+child.  A frame instead is one JSON header followed by raw binary blocks:
+
+  header   {"v": 1, "type": "module:QualName", "fields": {...},
+            "tables": {...}, "blocks": [...]}
+  fields   Scalars and JSON-shaped values (lists, str-keyed dicts), as-is.
+  tables   Lists of one dataclass type (e.g. `ActionThreeItem`), column-wise:
+           the field names once, then one list of values per row.
+  blocks   Values that are binary already, each sent as its own message:
+             array     the array's buffer, unconverted (8 bytes per 'd' sample)
+             object    anything with `to_bytes()` / `from_bytes()`, e.g.
+                       `HdrHistogram`
+             pickle    the fallback for a value none of the above cover — it
+                       costs only that field, not the whole result
+
+The receiver reads each array block with `Connection.recv_bytes_into`
+straight into a preallocated array of the final size, so samples cross the
+pipe with no intermediate bytes object and no per-element decoding.
+Shared memory would not save a copy: the parent must own the samples after
+the child exits, so they would be copied out of the segment anyway, and a
+crashed child would leave the segment behind in /dev/shm.
+
+Both ends are the same interpreter on the same machine, so arrays keep their
+native byte order and JSON keeps `nan`/`inf`; tuples arrive as lists.
+
+Usage:
+    from commands.wire import recv_result, send_result
+
+    send_result(conn, result)      # child
+    result = recv_result(conn)     # parent
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import importlib
+import json
+import pickle
+from array import array
+from typing import Any
+
+_VERSION = 1
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def send_result(conn, result: Any) -> None:
+    """Write *result*, a dataclass instance, to the `multiprocessing` connection *conn*."""
+    send_frame(conn, encode(result))
+
+
+def send_frame(conn, frame: tuple[bytes, list]) -> None:
+    """Write a frame from `encode` — for senders that encode before taking a lock."""
+    header, payloads = frame
+    conn.send_bytes(header)
+    for payload in payloads:
+        conn.send_bytes(payload)
+
+
+def recv_result(conn) -> Any:
+    """Read one result written by `send_result` from *conn*.
+
+    Raises:
+        ValueError: The frame is malformed or from another format version.
+        EOFError:   The sender closed the connection mid-frame.
+    """
+    try:
+        header = json.loads(conn.recv_bytes())
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError(f"malformed result header: {exc}") from exc
+    if not isinstance(header, dict) or header.get("v") != _VERSION:
+        raise ValueError("unsupported result frame version")
+    values = dict(header["fields"])
+    for name, table in header["tables"].items():
+        row_type = _resolve(table["type"])
+        columns = table["columns"]
+        values[name] = [row_type(**dict(zip(columns, row))) for row in table["rows"]]
+    for block in header["blocks"]:
+        values[block["field"]] = _recv_block(conn, block)
+    return _resolve(header["type"])(**values)
+
+
+def encode(result: Any) -> tuple[bytes, list]:
+    """Split *result* into a JSON header and the binary payloads that follow it.
+
+    Raises:
+        TypeError: *result* is not a dataclass instance.
+    """
+    if not dataclasses.is_dataclass(result) or isinstance(result, type):
+        raise TypeError(f"can only frame dataclass instances, not {type(result).__name__}")
+    fields: dict[str, Any] = {}
+    tables: dict[str, dict] = {}
+    blocks: list[dict] = []
+    payloads: list = []
+    for f in dataclasses.fields(result):
+        value = getattr(result, f.name)
+        if isinstance(value, array):
+            blocks.append({"field": f.name, "kind": "array", "typecode": value.typecode,
+                           "count": len(value)})
+            payloads.append(value)
+        elif _is_json(value):
+            fields[f.name] = value
+        elif (table := _table(value)) is not None:
+            tables[f.name] = table
+        elif callable(getattr(value, "to_bytes", None)) and hasattr(type(value), "from_bytes"):
+            blocks.append({"field": f.name, "kind": "object", "type": _type_name(type(value))})
+            payloads.append(value.to_bytes())
+        else:
+            blocks.append({"field": f.name, "kind": "pickle"})
+            payloads.append(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    header = {"v": _VERSION, "type": _type_name(type(result)),
+              "fields": fields, "tables": tables, "blocks": blocks}
+    return json.dumps(header, separators=(",", ":")).encode(), payloads
+
+
+def _recv_block(conn, block: dict) -> Any:
+    kind = block["kind"]
+    if kind == "array":
+        data = array(block["typecode"])
+        if block["count"]:
+            data.frombytes(bytes(data.itemsize))
+            data *= block["count"]
+            conn.recv_bytes_into(data)
+        else:
+            conn.recv_bytes()
+        return data
+    if kind == "object":
+        return _resolve(block["type"]).from_bytes(conn.recv_bytes())
+    if kind == "pickle":
+        return pickle.loads(conn.recv_bytes())
+    raise ValueError(f"unknown result block kind '{kind}'")
+
+
+def _is_json(value: Any) -> bool:
+    """True if *value* survives a JSON round trip (tuples aside)."""
+    if isinstance(value, _SCALARS):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_is_json(v) for v in value)
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _is_json(v) for k, v in value.items())
+    return False
+
+
+def _table(value: Any) -> dict | None:
+    """Column-wise form of a non-empty list of one dataclass type, or None."""
+    if not isinstance(value, list) or not value:
+        return None
+    row_type = type(value[0])
+    if not dataclasses.is_dataclass(row_type) or any(type(v) is not row_type for v in value):
+        return None
+    columns = [f.name for f in dataclasses.fields(row_type)]
+    rows = [[getattr(v, c) for c in columns] for v in value]
+    if not _is_json(rows):
+        return None
+    return {"type": _type_name(row_type), "columns": columns, "rows": rows}
+
+
+def _type_name(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _resolve(name: str) -> type:
+    module, _, qualname = name.partition(":")
+    obj: Any = importlib.import_module(module)
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    return obj
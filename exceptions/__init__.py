@@ -48,6 +48,7 @@ from exceptions.command import (   # noqa: E402
 from exceptions.prompt import (    # noqa: E402
     PromptError,
     PromptAbortedError,
+    PromptReplayError,
     PromptValidationError,
 )
 from exceptions.ui import (        # noqa: E402
@@ -70,6 +71,7 @@ __all__ = [
     # Prompt layer
     "PromptError",
     "PromptAbortedError",
+    "PromptReplayError",
     "PromptValidationError",
     # UI layer
     "UIError",
@@ -52,3 +52,22 @@ class PromptValidationError(PromptError):
         self.field = field
         self.reason = reason
         super().__init__(message=f"Validation failed for '{field}': {reason}")
+
+
+class PromptReplayError(PromptError):
+    """Raised when recorded answers cannot drive an interactive flow.
+
+    The answers file is unreadable, an answer is not one of the prompt's
+    choices or fails its validation, or the answers run out mid-flow.
+
+    Attributes:
+        position: 1-based index of the offending answer (0 when the file
+                  itself is the problem).
+        reason:   A human-readable explanation.
+    """
+
+    def __init__(self, position: int, reason: str) -> None:
+        self.position = position
+        self.reason = reason
+        where = f"answer {position}" if position else "answers"
+        super().__init__(message=f"Cannot replay {where}: {reason}")
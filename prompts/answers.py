@@ -0,0 +1,149 @@
+"""Answer sources for the interactive flows — a human at a TTY, or a recording.
+
+`prompts/interactive.py` never calls InquirerPy directly; it asks a
+prompter, which has two methods:
+
+    select(message, choices, fallback=None) -> str
+    text(message, validate, invalid_message) -> str
+
+  LivePrompter    Renders InquirerPy prompts.  InquirerPy and prompt_toolkit
+                  are imported on the first prompt, never before.
+  ReplayPrompter  Answers from a list of strings, in order, without
+                  importing InquirerPy at all — for cron jobs and CI.  A
+                  select with a single choice ("← Go back") answers itself
+                  and consumes nothing.  When the answers run out, a select
+                  that offers a *fallback* (the main menu offers "Exit")
+                  takes it; any other prompt raises `PromptReplayError`, as
+                  does an answer that is not one of the choices or fails
+                  the prompt's validation.
+  RecordingPrompter  Wraps another prompter and keeps every answer it would
+                  consume, so a session driven by hand can be saved with
+                  `save_answers` and replayed later.
+
+An answers file is a JSON array of strings, one per prompt:
+
+    ["Action One", "app.py", "Action Three", "worker:main", "Exit"]
+
+Usage:
+    from prompts.answers import ReplayPrompter, load_answers
+
+    prompter = ReplayPrompter(load_answers("nightly.json"))
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from typing import Callable
+
+from exceptions import PromptReplayError
+
+
+class LivePrompter:
+    """Prompts rendered by InquirerPy for a human at a TTY."""
+
+    replaying = False
+
+    def select(self, message: str, choices: list[str], fallback: str | None = None) -> str:
+        from InquirerPy import inquirer
+
+        return inquirer.select(
+            message=message,
+            choices=choices,
+            instruction="(use arrow keys, Enter to select)" if len(choices) > 1 else "",
+        ).execute()
+
+    def text(self, message: str, validate: Callable[[str], bool], invalid_message: str) -> str:
+        from InquirerPy import inquirer
+
+        return inquirer.text(
+            message=message,
+            validate=validate,
+            invalid_message=invalid_message,
+        ).execute()
+
+
+class ReplayPrompter:
+    """Prompts answered from *answers*, in order (see module docstring)."""
+
+    replaying = True
+
+    def __init__(self, answers: list[str]):
+        self._answers = answers
+        self._next = 0
+
+    def select(self, message: str, choices: list[str], fallback: str | None = None) -> str:
+        if len(choices) == 1:
+            return choices[0]
+        if self._next == len(self._answers) and fallback is not None:
+            return fallback
+        answer = self._take(message)
+        if answer not in choices:
+            raise PromptReplayError(
+                self._next, f"'{answer}' is not one of: {', '.join(choices)}"
+            )
+        return answer
+
+    def text(self, message: str, validate: Callable[[str], bool], invalid_message: str) -> str:
+        answer = self._take(message)
+        if not validate(answer):
+            raise PromptReplayError(self._next, f"'{answer}' rejected: {invalid_message}")
+        return answer
+
+    def _take(self, message: str) -> str:
+        if self._next == len(self._answers):
+            raise PromptReplayError(
+                self._next + 1, f"no answer left for the prompt '{message.rstrip(':')}'"
+            )
+        self._next += 1
+        return self._answers[self._next - 1]
+
+
+class RecordingPrompter:
+    """Passes prompts to *inner* and keeps the answers a replay would need."""
+
+    def __init__(self, inner):
+        self._inner = inner
+        self.answers: list[str] = []
+        self.replaying = inner.replaying
+
+    def select(self, message: str, choices: list[str], fallback: str | None = None) -> str:
+        answer = self._inner.select(message, choices, fallback)
+        if len(choices) > 1:
+            self.answers.append(answer)
+        return answer
+
+    def text(self, message: str, validate: Callable[[str], bool], invalid_message: str) -> str:
+        answer = self._inner.text(message, validate, invalid_message)
+        self.answers.append(answer)
+        return answer
+
+
+def load_answers(source: str) -> list[str]:
+    """Read answers from *source*: inline JSON (starting with "["), "-" for stdin, or a file path.
+
+    Raises:
+        PromptReplayError: The source cannot be read or is not a JSON array of strings.
+    """
+    try:
+        if source.lstrip().startswith("["):
+            text = source
+        elif source == "-":
+            text = sys.stdin.read()
+        else:
+            with open(source, encoding="utf-8") as fh:
+                text = fh.read()
+        answers = json.loads(text)
+    except OSError as exc:
+        raise PromptReplayError(0, f"cannot read '{source}': {exc.strerror or exc}") from exc
+    except json.JSONDecodeError as exc:
+        raise PromptReplayError(0, f"not valid JSON: {exc}") from exc
+    if not isinstance(answers, list) or not all(isinstance(a, str) for a in answers):
+        raise PromptReplayError(0, "expected a JSON array of strings")
+    return answers
+
+
+def save_answers(path: str, answers: list[str]) -> None:
+    """Write *answers* to *path* as a JSON array, one answer per line."""
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("[\n" + ",\n".join(f"  {json.dumps(a)}" for a in answers) + "\n]\n")
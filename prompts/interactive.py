@@ -1,134 +1,197 @@
-"""InquirerPy interactive flows — navigational screens, no data collection.
-
-Each `_flow_*` function follows this pattern:
-  1. Print a simple info message or panel for the action.
-  2. Show a single "Go back" select so the user can return to the main menu.
-
-To add a new action:
-  1. Write a new `_flow_action_N` function below following the pattern.
-  2. Add an entry to `_ACTIONS` mapping the display label to the function
-     reference defined below.
-  3. Create the matching module in `commands/action_N.py`.
-  4. Wire up the argparse subcommand in `cli.py`.
+"""InquirerPy interactive flows — one generic flow per registered command.
+
+The menu is built from `commands.registry.iter_commands()`, the same list
+that drives the argparse subcommands in `cli.py`, so a new command shows up
+here without touching this module.
+
+Every command runs through `_flow_command`:
+  1. Print the command's help line.
+  2. Ask for the target (options use their registered defaults).
+  3. Run the command under the live progress dashboard and render its
+     `TableView`.  An `async def` command runs on a fresh event loop that
+     also drives the dashboard.
+  4. Show a single "Go back" select so the user can return to the main menu.
+
+Answers come from a prompter (`prompts/answers.py`): InquirerPy for a human,
+or a list of recorded answers for headless runs (`clisoft --answers`).  A
+replayed session prints a timing report at the end — one row per flow step
+— and shows the dashboard only when the console is a terminal.
 """
 
 from __future__ import annotations
 
+import contextlib
+import time
+from functools import partial
 from typing import Callable
 
-from InquirerPy import inquirer
-
-from exceptions import PromptAbortedError
+from exceptions import CommandError, PromptAbortedError
+from prompts.answers import LivePrompter, RecordingPrompter, ReplayPrompter, save_answers
 from ui.output import (
-    console,
-    print_welcome,
+    get_console,
+    live_progress,
+    live_progress_async,
+    print_error,
     print_info,
+    print_table,
+    print_view,
+    print_welcome,
 )
 
-# ── Menu registry ──────────────────────────────────────────────────────────────
-# Maps the display label shown in the interactive select menu to the handler
-# function defined below, or None for the Exit entry.
-# Change the labels to match your project.
-#
-# NOTE: _ACTIONS is populated after the flow functions are defined (see bottom
-# of this module) so that the values are direct callable references rather than
-# string names resolved via globals().
-_ACTIONS: dict[str, Callable[[], None] | None]
+# InquirerPy (and the prompt_toolkit stack under it) is imported by
+# `LivePrompter` on the first prompt, never at module level: it is the single
+# heaviest import in the project and only a human at a TTY ever needs it.
+
+# Label of the menu entry that leaves the loop.
+_EXIT_LABEL = "Exit"
 
 
-def start_interactive() -> None:
-    """Show the welcome panel and run the main interactive selection loop."""
+def start_interactive(answers: list[str] | None = None, record: str | None = None) -> None:
+    """Show the welcome panel and run the main interactive selection loop.
+
+    Args:
+        answers: Replay these answers instead of prompting (see
+                 `prompts/answers.py`); the session then ends with a timing
+                 report.
+        record:  Save the answers given in this session to this path as an
+                 answers file, even if the session is cut short.
+    """
     # Customize the title and subtitle to match your project name.
     print_welcome(
         "CLI Visual Boilerplate",
         "Rich + InquirerPy template — replace actions with real logic",
     )
 
-    while True:
-        action = inquirer.select(
-            message="What do you want to do?",
-            choices=list(_ACTIONS.keys()),
-            instruction="(use arrow keys, Enter to select)",
-        ).execute()
-
-        handler = _ACTIONS[action]
-        if handler is None:
-            # Exit chosen — print a farewell and leave the loop.
-            console.print("\n[dim]See you! Keep building great CLIs.[/dim]\n")
-            break
-
-        # Call the handler directly — no string lookup needed.
-        # PromptAbortedError is allowed to propagate to cli.py, which
-        # catches it and exits cleanly with a warning message.
-        handler()
-        # Print a blank line between flows for visual breathing room.
-        console.print()
-
-
-# ── Individual flows ───────────────────────────────────────────────────────────
-
-def _flow_action_one() -> None:
-    """Display the Action One screen and wait for the user to go back.
-
-    Customize: replace the print_info message with your action's actual UI.
-    """
-    console.print()
-    # Customize: replace this message with a description of what Action One does.
-    print_info("Action One — add your logic here.")
-    # TODO: wrap inquirer calls with:
-    # try:
-    #     answer = inquirer.text(...).execute()
-    # except KeyboardInterrupt:
-    #     raise PromptAbortedError(flow_name="action-one")
-    inquirer.select(
-        message="",
-        choices=["← Go back"],
-    ).execute()
-
-
-def _flow_action_two() -> None:
-    """Display the Action Two screen and wait for the user to go back.
-
-    Customize: replace the print_info message with your action's actual UI.
-    """
-    console.print()
-    # Customize: replace this message with a description of what Action Two does.
-    print_info("Action Two — add your logic here.")
-    # TODO: wrap inquirer calls with:
-    # try:
-    #     answer = inquirer.text(...).execute()
-    # except KeyboardInterrupt:
-    #     raise PromptAbortedError(flow_name="action-two")
-    inquirer.select(
-        message="",
-        choices=["← Go back"],
-    ).execute()
-
-
-def _flow_action_three() -> None:
-    """Display the Action Three screen and wait for the user to go back.
-
-    Customize: replace the print_info message with your action's actual UI.
-    """
-    console.print()
-    # Customize: replace this message with a description of what Action Three does.
-    print_info("Action Three — add your logic here.")
-    # TODO: wrap inquirer calls with:
-    # try:
-    #     answer = inquirer.text(...).execute()
-    # except KeyboardInterrupt:
-    #     raise PromptAbortedError(flow_name="action-three")
-    inquirer.select(
-        message="",
-        choices=["← Go back"],
-    ).execute()
-
-
-# Populated here so all flow functions above are already defined when this dict
-# is constructed — values are direct callable references, not strings.
-_ACTIONS = {
-    "Action One":   _flow_action_one,
-    "Action Two":   _flow_action_two,
-    "Action Three": _flow_action_three,
-    "Exit":         None,
-}
+    prompter = ReplayPrompter(answers) if answers is not None else LivePrompter()
+    if record is not None:
+        prompter = RecordingPrompter(prompter)
+    timings = _Timings()
+    actions = _build_actions()
+    try:
+        while True:
+            with timings.step("Menu", "select"):
+                action = prompter.select(
+                    "What do you want to do?", list(actions.keys()), fallback=_EXIT_LABEL,
+                )
+
+            handler = actions[action]
+            if handler is None:
+                # Exit chosen — print a farewell and leave the loop.
+                get_console().print("\n[dim]See you! Keep building great CLIs.[/dim]\n")
+                break
+
+            # PromptAbortedError is allowed to propagate to cli.py, which
+            # catches it and exits cleanly with a warning message.
+            handler(prompter, timings)
+            # Print a blank line between flows for visual breathing room.
+            get_console().print()
+    finally:
+        if record is not None:
+            save_answers(record, prompter.answers)
+    if prompter.replaying:
+        timings.report()
+
+
+def _build_actions() -> dict[str, Callable | None]:
+    """Map each menu label to its flow, with the Exit entry (None) last."""
+    from commands.registry import iter_commands
+
+    actions: dict[str, Callable | None] = {
+        spec.title: partial(_flow_command, spec) for spec in iter_commands()
+    }
+    actions[_EXIT_LABEL] = None
+    return actions
+
+
+# ── Generic command flow ───────────────────────────────────────────────────────
+
+def _flow_command(spec, prompter, timings: _Timings) -> None:
+    """Ask for a target, run *spec*'s command, render the result, then go back."""
+    get_console().print()
+    print_info(f"{spec.title} — {spec.help}")
+    try:
+        with timings.step(spec.title, "target"):
+            target = prompter.text(
+                f"{spec.target_help}:",
+                validate=lambda text: bool(text.strip()),
+                invalid_message="Target cannot be empty",
+            )
+    except KeyboardInterrupt:
+        raise PromptAbortedError(flow_name=spec.name)
+    target = target.strip()
+
+    from commands.cache import run_cached
+
+    title = f"Running {spec.title} on '{target}'..."
+    defaults = {argument.dest: argument.default for argument in spec.arguments}
+    try:
+        with timings.step(spec.title, f"run '{target}'"):
+            if spec.is_async():
+                import asyncio
+                result, cache_hit = asyncio.run(_run_async(spec, target, defaults, title))
+            else:
+                with _dashboard(title) as progress:
+                    result, cache_hit = run_cached(spec, target, defaults, progress=progress)
+    except CommandError as exc:  # e.g. a timeout with nothing to show
+        print_error(exc.message)
+    else:
+        if not cache_hit:
+            from commands.history import record_run
+            record_run(spec, target, defaults, result)
+        with timings.step(spec.title, "render"):
+            if result.error:
+                print_error(result.error)
+            else:
+                view = spec.build_view(result)
+                print_view(f"{spec.title} — {target}", view, " (cached)" if cache_hit else "")
+
+    with timings.step(spec.title, "go back"):
+        prompter.select("", ["← Go back"])
+
+
+async def _run_async(spec, target: str, kwargs: dict, title: str):
+    """Run an `async def` command with the dashboard redrawn by the same loop."""
+    from commands.cache import run_cached_async
+
+    if not get_console().is_terminal:
+        return await run_cached_async(spec, target, kwargs)
+    async with live_progress_async(title) as progress:
+        return await run_cached_async(spec, target, kwargs, progress=progress)
+
+
+def _dashboard(title: str):
+    """`live_progress` on a terminal; elsewhere (a replay under cron) no dashboard at all."""
+    if not get_console().is_terminal:
+        return contextlib.nullcontext(None)
+    return live_progress(title)
+
+
+# ── Timing report ──────────────────────────────────────────────────────────────
+
+class _Timings:
+    """Wall-clock time of each flow step, printed as a table by `report`."""
+
+    def __init__(self) -> None:
+        self._steps: list[tuple[str, str, float]] = []
+
+    @contextlib.contextmanager
+    def step(self, flow: str, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._steps.append((flow, name, time.perf_counter() - started))
+
+    def report(self) -> None:
+        total = sum(seconds for _flow, _name, seconds in self._steps)
+        rows = [
+            [str(i), flow, name, f"{seconds * 1000:,.1f}", f"{100 * seconds / total:.1f}" if total else "—"]
+            for i, (flow, name, seconds) in enumerate(self._steps, 1)
+        ]
+        rows.append(["", "Total", "", f"{total * 1000:,.1f}", "100.0" if total else "—"])
+        print_table(
+            "Replay timings",
+            [("#", "dim"), ("Flow", "bold cyan"), ("Step", "white"),
+             ("ms", "bold yellow"), ("%", "dim")],
+            rows,
+        )
@@ -0,0 +1,142 @@
+"""Machine-readable result writers: JSON, NDJSON, and CSV.
+
+The counterpart to `ui/output.py` for piping results into other tools.
+Nothing here imports Rich: results are serialized straight to a text stream
+(stdout by default), one row at a time, so a 100k-row profile never builds a
+`Table`, never goes through Rich's layout engine, and is never held twice in
+memory as a serialized document.
+
+Every result dataclass is split into two parts:
+
+  - summary: every scalar field (str / int / float / bool / None) plus any
+             list of scalars (e.g. `ActionTwoResult.cores`), minus `error`
+             (`commands.summary.result_summary`).
+  - rows:    the one field named by *rows_field* (`rows`, `values`, `items`).
+             Dict rows are written as-is, dataclass rows field by field, and
+             bare scalars as {"index": i, "value": v}.  A result with an
+             `export_rows()` method supplies its rows from that instead
+             (e.g. `ActionTwoResult` writes HDR histogram buckets).
+
+Formats:
+  json    {"command": ..., "target": ..., "summary": {...}, "rows": [...]}
+          written incrementally — the rows array is streamed element by element.
+  ndjson  One {"type": "summary", ...} line, then one {"type": "row", ...}
+          line per row.
+  csv     Header + one line per row; the summary is omitted.  A list value
+          in a row (e.g. `ActionThreeItem.chain`) becomes one ";"-joined cell.
+
+Batch runs call `write_result` once per target on the same stream: JSON
+becomes a sequence of envelopes (one per line group), and `tag_rows` adds a
+"target" column to NDJSON/CSV rows.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from dataclasses import fields, is_dataclass
+from typing import Any, Iterator, TextIO
+
+from commands.summary import result_summary
+
+FORMATS = ("json", "ndjson", "csv")
+
+
+def write_result(
+    result: Any,
+    fmt: str,
+    rows_field: str,
+    command: str,
+    target: str,
+    stream: TextIO | None = None,
+    header: bool = True,
+    tag_rows: bool = False,
+) -> None:
+    """Serialize *result* to *stream* in *fmt* ("json", "ndjson", or "csv").
+
+    Args:
+        result:     Any command result dataclass.
+        fmt:        One of `FORMATS`.
+        rows_field: Name of the list field that holds the per-row data.
+        command:    Subcommand name, recorded in the JSON/NDJSON envelope.
+        target:     Target string, recorded in the JSON/NDJSON envelope.
+        stream:     Destination; defaults to `sys.stdout`.
+        header:     Write the CSV header line (batch mode writes it once).
+        tag_rows:   Add a "target" key to every NDJSON/CSV row, so rows from
+                    several targets written to one stream stay attributable.
+    """
+    out = stream if stream is not None else sys.stdout
+    export = getattr(result, "export_rows", None)
+    rows = export() if export is not None else _iter_rows(getattr(result, rows_field))
+    if tag_rows:
+        rows = ({"target": target, **row} for row in rows)
+    if fmt == "json":
+        _write_json(out, result_summary(result, rows_field), rows, command, target)
+    elif fmt == "ndjson":
+        _write_ndjson(out, result_summary(result, rows_field), rows, command, target)
+    elif fmt == "csv":
+        _write_csv(out, rows, header)
+    else:
+        raise ValueError(f"Unknown format '{fmt}'; expected one of {', '.join(FORMATS)}")
+    out.flush()
+
+
+def write_error(msg: str, stream: TextIO | None = None) -> None:
+    """Write a plain `clisoft: error: <msg>` line to stderr (argparse style)."""
+    out = stream if stream is not None else sys.stderr
+    out.write(f"clisoft: error: {msg}\n")
+    out.flush()
+
+
+def _iter_rows(rows) -> Iterator[dict]:
+    """Yield each element of *rows* as a flat dict, lazily."""
+    for idx, row in enumerate(rows):
+        if isinstance(row, dict):
+            yield row
+        elif is_dataclass(row):
+            yield {f.name: getattr(row, f.name) for f in fields(row)}
+        else:
+            yield {"index": idx, "value": row}
+
+
+def _write_json(out: TextIO, summary: dict, rows: Iterator[dict], command: str, target: str) -> None:
+    head = json.dumps({"command": command, "target": target, "summary": summary})
+    # Re-open the envelope object to append a streamed "rows" array.
+    out.write(head[:-1] + ', "rows": [')
+    dumps = json.dumps
+    sep = "\n  "
+    for row in rows:
+        out.write(sep)
+        out.write(dumps(row))
+        sep = ",\n  "
+    out.write("\n]}\n")
+
+
+def _write_ndjson(out: TextIO, summary: dict, rows: Iterator[dict], command: str, target: str) -> None:
+    dumps = json.dumps
+    out.write(dumps({"type": "summary", "command": command, "target": target, **summary}))
+    out.write("\n")
+    for row in rows:
+        out.write(dumps({"type": "row", **row}))
+        out.write("\n")
+
+
+def _write_csv(out: TextIO, rows: Iterator[dict], header: bool) -> None:
+    import csv  # only this format needs it; keeps json/ndjson startup lean
+
+    first = next(rows, None)
+    if first is None:
+        return
+    writer = csv.DictWriter(out, fieldnames=list(first), lineterminator="\n")
+    if header:
+        writer.writeheader()
+    writer.writerow(_flat(first))
+    for row in rows:
+        writer.writerow(_flat(row))
+
+
+def _flat(row: dict) -> dict:
+    """Join list values into one ";"-separated cell, as csv would otherwise write their repr."""
+    if not any(isinstance(v, (list, tuple)) for v in row.values()):
+        return row
+    return {k: ";".join(map(str, v)) if isinstance(v, (list, tuple)) else v for k, v in row.items()}